@@ -12,13 +12,18 @@ from __future__ import annotations
 
 import io
 import hashlib
-import ssl
+import sys
 from pathlib import Path
 from typing import Tuple, Optional
-from urllib.request import Request, urlopen
 
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 from puckcast_brand import (
     PuckcastColors,
     hex_to_rgb,
@@ -129,11 +134,9 @@ def download_logo(abbrev: str, force: bool = False) -> Optional[Path]:
     url = f"https://assets.nhle.com/logos/nhl/svg/{abbrev}_light.svg"
 
     try:
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        context = ssl._create_unverified_context()
-
-        with urlopen(req, timeout=10, context=context) as response:
-            svg_data = response.read()
+        response = get_http_client().get(url, timeout=10)
+        response.raise_for_status()
+        svg_data = response.content
 
         # Convert SVG to PNG using cairosvg if available, otherwise save raw
         # Use 400x400 for high-quality source logos (crisp when scaled down)
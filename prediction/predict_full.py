@@ -47,9 +47,11 @@ import numpy as np
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from nhl_prediction.nhl_api import fetch_future_games, fetch_todays_games, fetch_schedule
+from nhl_prediction.data_ingest import fetch_multi_season_logs
 from nhl_prediction.pipeline import build_dataset
 from nhl_prediction.model import calibrate_threshold, create_baseline_model, fit_model, tune_logreg_c
 from nhl_prediction.situational_features import add_situational_features
+from nhl_prediction.team_state import DEFAULT_STATE_PATH, TeamStateStore
 # from nhl_prediction.player_hub.context import refresh_player_hub_context  # Module not implemented yet
 
 # Suppress sklearn warnings
@@ -577,6 +579,102 @@ def build_matchup_features(
 
     return pd.Series(matchup).reindex(feature_columns, fill_value=0.0)
 
+
+def load_team_state(seasons: list[str], cutoff: pd.Timestamp, path: Path = DEFAULT_STATE_PATH) -> TeamStateStore:
+    """Return the per-team feature state with every game completed before cutoff.
+
+    The saved state is topped up with the games logged since its latest season
+    and saved again. A missing state, or one already past the cutoff (backfilling
+    an earlier date), is rebuilt from the cached logs and not saved.
+    """
+    store = TeamStateStore.load(path) if Path(path).exists() else None
+    backfill = store is not None and store.last_game_date is not None and store.last_game_date >= cutoff
+    if store is None or backfill:
+        store = TeamStateStore()
+        new_seasons = seasons
+    else:
+        new_seasons = [season for season in seasons if store.last_season_id is None or season >= store.last_season_id]
+
+    # build_dataset has already topped up the season caches, so this only reads them
+    logs = fetch_multi_season_logs(sorted(new_seasons))
+    if not logs.empty:
+        store.update(logs[pd.to_datetime(logs["gameDate"]) < cutoff])
+    if not backfill:
+        store.save(path)
+    return store
+
+
+def _latest_team_value(games: pd.DataFrame, team_id: int, season_id: str, base: str) -> float:
+    """The team's own `base` value from its most recent game of the season (0.0 when missing)."""
+    home_col, away_col = f"{base}_home", f"{base}_away"
+    if home_col not in games.columns or away_col not in games.columns:
+        return 0.0
+    played = games[
+        ((games['teamId_home'] == team_id) | (games['teamId_away'] == team_id)) &
+        (games['seasonId_str'] == season_id)
+    ]
+    if played.empty:
+        return 0.0
+    recent = played.sort_values('gameDate').iloc[-1]
+    value = recent[home_col] if recent['teamId_home'] == team_id else recent[away_col]
+    return 0.0 if pd.isna(value) else float(value)
+
+
+def build_state_matchup_features(
+    store: TeamStateStore,
+    home_team_id: int,
+    away_team_id: int,
+    season_id: str,
+    game_date: str,
+    eligible_games: pd.DataFrame,
+    feature_columns: list,
+) -> pd.Series | None:
+    """Construct matchup features for a new game from the per-team feature state.
+
+    Team-history features (rolling windows, season averages, momentum, rest and
+    congestion, Elo) come from TeamStateStore.features_for, i.e. the values the
+    training pipeline engineers for each team's next game. Inputs the state does
+    not keep (league home win rate, goalie trend) are read from the latest
+    completed games.
+    """
+    home = store.features_for(home_team_id, game_date, season_id)
+    away = store.features_for(away_team_id, game_date, season_id)
+    if home['games_played_prior'] == 0 or away['games_played_prior'] == 0:
+        return None
+
+    home_elo, away_elo = home['elo_pre'], away['elo_pre']
+    home_adv = store.elo.current_home_advantage()
+    computed = {
+        'elo_diff_pre': home_elo - away_elo,
+        'elo_expectation_home': 1.0 / (1.0 + 10 ** ((away_elo - (home_elo + home_adv)) / 400)),
+        'rest_diff': home['rest_days'] - away['rest_days'],
+    }
+
+    matchup = {}
+    for col in feature_columns:
+        base = col.rsplit('_', 1)[0]
+        if col in computed:
+            matchup[col] = computed[col]
+        elif col.endswith('_diff') and base in home and base in away:
+            matchup[col] = home[base] - away[base]
+        elif col.endswith('_home') and base in home:
+            matchup[col] = home[base]
+        elif col.endswith('_away') and base in away:
+            matchup[col] = away[base]
+        elif col == 'league_hw_100':
+            # Same window as add_league_hw_feature, now including the latest game
+            recent = eligible_games['home_win'].tail(100)
+            matchup[col] = recent.mean() if len(recent) >= 50 else HISTORICAL_HOME_WIN_RATE
+        elif col.endswith('_diff'):
+            matchup[col] = (
+                _latest_team_value(eligible_games, home_team_id, season_id, base)
+                - _latest_team_value(eligible_games, away_team_id, season_id, base)
+            )
+        else:
+            matchup[col] = 0.0
+
+    return pd.Series(matchup).reindex(feature_columns, fill_value=0.0)
+
 # V7.0 Curated Features (39 features + adaptive weights)
 # Production model with 60.9% accuracy on 4-season holdout (5,002 games)
 # Key features: 1) Adaptive Elo home advantage, 2) Dynamic threshold, 3) League home win rate
@@ -959,7 +1057,10 @@ def predict_games(date=None, num_games=20):
     print("\n2️⃣  Building dataset with native artifacts...")
     print(f"   (Loading {len(seasons)} season(s): {', '.join(seasons)})")
 
-    dataset = build_dataset(seasons)
+    # Training set only: upcoming games are scored from the per-team feature state.
+    # Top up the current season with games completed since the last run; only the
+    # feature families the curated V7.0 model reads are engineered
+    dataset = build_dataset(seasons, incremental=True, features=V70_FEATURES)
 
     print(f"   ✅ {len(dataset.games)} games loaded")
     print(f"   ✅ {dataset.features.shape[1]} baseline features engineered")
@@ -968,12 +1069,16 @@ def predict_games(date=None, num_games=20):
     games_with_hw = add_league_hw_feature(dataset.games)
     print("   ✅ Added league home win rate feature (adaptive)")
 
-    # Add situational features
-    games_with_situational = add_situational_features(games_with_hw)
+    # Add situational features (skipped entirely when the model uses none of them)
     situational_features = ['fatigue_index_diff', 'third_period_trailing_perf_diff',
                     'travel_distance_diff', 'divisional_matchup',
                     'post_break_game_home', 'post_break_game_away', 'post_break_game_diff']
-    available_situational = [f for f in situational_features if f in games_with_situational.columns]
+    requested_situational = [f for f in situational_features if f in V70_FEATURES]
+    if requested_situational:
+        games_with_situational = add_situational_features(games_with_hw, features=requested_situational)
+    else:
+        games_with_situational = games_with_hw
+    available_situational = [f for f in requested_situational if f in games_with_situational.columns]
 
     # Combine baseline + situational + league HW features
     features_full = pd.concat([
@@ -1038,6 +1143,7 @@ def predict_games(date=None, num_games=20):
     predictions = []
     eligible_games["seasonId_str"] = eligible_games["seasonId"].astype(str)
     feature_columns = eligible_features.columns
+    team_state = load_team_state(seasons, cutoff)
     
     for i, game in enumerate(games_for_model[:num_games], 1):
         home_id = game['homeTeamId']
@@ -1046,16 +1152,16 @@ def predict_games(date=None, num_games=20):
         away_abbrev = game['awayTeamAbbrev']
         season_id = str(game.get("season") or train_seasons[-1])
 
-        # Build proper matchup features by extracting each team's individual stats
-        # and computing correct differentials (home_team_stat - away_team_stat)
+        # Each team's pre-game features come straight from the incremental state
         game_date_str = game.get('gameDate', date_str)
-        matchup_features = build_matchup_features(
+        matchup_features = build_state_matchup_features(
+            team_state,
             home_team_id=home_id,
             away_team_id=away_id,
             season_id=season_id,
+            game_date=game_date_str,
             eligible_games=eligible_games,
             feature_columns=list(feature_columns),
-            game_date=game_date_str,
         )
 
         if matchup_features is None:
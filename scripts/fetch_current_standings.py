@@ -7,13 +7,17 @@ from __future__ import annotations
 
 import csv
 import json
-import ssl
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import quote_plus
-from urllib.request import Request, urlopen
 
 ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+  sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 OUTPUT_PATH = ROOT / "web" / "src" / "data" / "currentStandings.json"
 TEAM_MAP_PATH = ROOT / "data" / "nhl_teams.csv"
 SEASON_ID = "20252026"
@@ -34,12 +38,9 @@ def load_team_map() -> dict[int, dict[str, str]]:
 
 
 def fetch_summary(season_id: str) -> dict:
-  query = quote_plus(f"seasonId={season_id}")
-  url = f"{STATS_BASE}?cayenneExp={query}"
-  req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-  context = ssl._create_unverified_context()
-  with urlopen(req, timeout=30, context=context) as response:
-    return json.loads(response.read().decode("utf-8"))
+  response = get_http_client().get(STATS_BASE, params={"cayenneExp": f"seasonId={season_id}"}, timeout=30)
+  response.raise_for_status()
+  return response.json()
 
 
 def main() -> None:
@@ -13,7 +13,7 @@ from __future__ import annotations
 import argparse
 import json
 import re
-import time
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -21,6 +21,14 @@ from typing import Any
 import requests
 from bs4 import BeautifulSoup
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Shared pooled client; its per-host limit keeps the DailyFaceoff crawl polite
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 CBS_INJURIES_URL = "https://www.cbssports.com/nhl/injuries/"
 ROTOWIRE_INJURIES_URL = "https://www.rotowire.com/hockey/injury-report.php"
 ESPN_INJURIES_URL = "https://www.espn.com/nhl/injuries"
@@ -244,7 +252,7 @@ def scrape_dailyfaceoff_team(team_abbrev: str, slug: str, timeout: float) -> lis
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = get_http_client().get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"  ⚠️  Failed to fetch {team_abbrev}: {e}")
@@ -416,9 +424,6 @@ def scrape_dailyfaceoff_all(timeout: float) -> dict[str, Any]:
             "lastUpdated": now,
         }
 
-        # Be polite - don't hammer the server
-        time.sleep(0.5)
-
     return teams
 
 
@@ -431,7 +436,7 @@ def scrape_cbs_injuries(timeout: float) -> dict[str, Any]:
     }
 
     try:
-        response = requests.get(CBS_INJURIES_URL, headers=headers, timeout=timeout)
+        response = get_http_client().get(CBS_INJURIES_URL, headers=headers, timeout=timeout)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"❌ Failed to fetch CBS Sports injuries: {e}")
@@ -575,7 +580,7 @@ def scrape_rotowire_injuries(timeout: float) -> dict[str, Any]:
     }
 
     try:
-        response = requests.get(ROTOWIRE_INJURIES_URL, headers=headers, timeout=timeout)
+        response = get_http_client().get(ROTOWIRE_INJURIES_URL, headers=headers, timeout=timeout)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"❌ Failed to fetch Rotowire injuries: {e}")
@@ -713,7 +718,7 @@ def scrape_espn_injuries(timeout: float) -> dict[str, Any]:
     }
 
     try:
-        response = requests.get(ESPN_INJURIES_URL, headers=headers, timeout=timeout)
+        response = get_http_client().get(ESPN_INJURIES_URL, headers=headers, timeout=timeout)
         response.raise_for_status()
     except requests.RequestException as e:
         print(f"❌ Failed to fetch ESPN injuries: {e}")
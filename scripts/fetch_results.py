@@ -8,13 +8,18 @@ enabling automated backtesting and accuracy tracking.
 
 import argparse
 import json
-import ssl
+import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, List
-from urllib.request import Request, urlopen
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 ARCHIVE_DIR = REPO_ROOT / "data" / "archive" / "predictions"
 RESULTS_TRACKER = REPO_ROOT / "data" / "archive" / "results_tracker.csv"
 BACKTESTING_REPORT = REPO_ROOT / "web" / "src" / "data" / "backtestingReport.json"
@@ -42,11 +47,9 @@ def fetch_game_result(game_id: str) -> Dict[str, Any] | None:
     try:
         # Use NHL Stats API v1 for game results
         url = f"https://statsapi.web.nhl.com/api/v1/game/{game_id}/feed/live"
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        context = ssl._create_unverified_context()
-
-        with urlopen(req, timeout=10, context=context) as response:
-            data = json.loads(response.read().decode("utf-8"))
+        response = get_http_client().get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
 
         game_data = data.get("gameData", {})
         live_data = data.get("liveData", {})
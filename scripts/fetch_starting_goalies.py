@@ -13,12 +13,19 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import requests
 
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 # RotoWire JSON API endpoint (discovered via page analysis)
 ROTOWIRE_API = "https://www.rotowire.com/hockey/tables/projected-goalies.php"
 
@@ -97,7 +104,7 @@ def fetch_rotowire_goalies(date: str, timeout: float, debug: bool = False) -> di
     url = f"{ROTOWIRE_API}?date={date}"
 
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = get_http_client().get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         data = response.json()
 
@@ -123,7 +130,7 @@ def fetch_nhl_schedule(date: str, timeout: float) -> list[dict[str, Any]]:
     url = f"{NHL_SCHEDULE_API}/{date}"
 
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = get_http_client().get(url, headers=headers, timeout=timeout)
         response.raise_for_status()
         data = response.json()
 
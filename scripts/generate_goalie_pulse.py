@@ -10,12 +10,9 @@ from __future__ import annotations
 
 import argparse
 import json
-import ssl
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
-from urllib.parse import quote_plus
-from urllib.request import Request, urlopen
 
 import sys
 
@@ -24,6 +21,7 @@ SRC_DIR = REPO_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
 from nhl_prediction.nhl_api import fetch_schedule  # noqa: E402
 
 OUTPUT_PATH = REPO_ROOT / "web" / "src" / "data" / "goaliePulse.json"
@@ -42,15 +40,12 @@ def parse_args() -> argparse.Namespace:
 
 def fetch_goalie_stats(season_id: str) -> list[dict[str, Any]]:
     """Fetch goalie stats from NHL API for the given season."""
-    query = quote_plus(f"seasonId={season_id} and gameTypeId=2")
-    url = f"{GOALIE_STATS_URL}?cayenneExp={query}&limit=100"
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    context = ssl._create_unverified_context()
+    params = {"cayenneExp": f"seasonId={season_id} and gameTypeId=2", "limit": 100}
 
     try:
-        with urlopen(req, timeout=30, context=context) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-            return payload.get("data", [])
+        response = get_http_client().get(GOALIE_STATS_URL, params=params, timeout=30)
+        response.raise_for_status()
+        return response.json().get("data", [])
     except Exception as e:
         print(f"⚠️  Failed to fetch goalie stats: {e}")
         return []
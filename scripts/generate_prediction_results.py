@@ -15,13 +15,18 @@ from __future__ import annotations
 
 import argparse
 import json
-import ssl
+import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any
-from urllib.request import Request, urlopen
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 OUTPUT_PATH = REPO_ROOT / "web" / "src" / "data" / "predictionResults.json"
 ARCHIVE_DIR = REPO_ROOT / "data" / "archive" / "predictions"
 SCHEDULE_API = "https://api-web.nhle.com/v1/schedule"
@@ -47,17 +52,16 @@ def parse_args() -> argparse.Namespace:
 def fetch_schedule(date: str) -> list[dict]:
     """Fetch schedule/results from NHL API."""
     url = f"{SCHEDULE_API}/{date}"
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    context = ssl._create_unverified_context()
 
     try:
-        with urlopen(req, timeout=30, context=context) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            games = []
-            for week in data.get("gameWeek", []):
-                for game in week.get("games", []):
-                    games.append(game)
-            return games
+        response = get_http_client().get(url, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        games = []
+        for week in data.get("gameWeek", []):
+            for game in week.get("games", []):
+                games.append(game)
+        return games
     except Exception as e:
         print(f"  Failed to fetch schedule for {date}: {e}")
         return []
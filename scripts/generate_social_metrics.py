@@ -15,14 +15,18 @@ from __future__ import annotations
 
 import argparse
 import json
-import ssl
+import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any
-from urllib.parse import quote_plus
-from urllib.request import Request, urlopen
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 OUTPUT_PATH = REPO_ROOT / "web" / "src" / "data" / "socialMetrics.json"
 STANDINGS_PATH = REPO_ROOT / "web" / "src" / "data" / "currentStandings.json"
 POWER_INDEX_PATH = REPO_ROOT / "web" / "src" / "data" / "powerIndexSnapshot.json"
@@ -45,15 +49,10 @@ def parse_args() -> argparse.Namespace:
 
 def fetch_api_data(url: str, season_id: str) -> list[dict[str, Any]]:
     """Fetch data from NHL Stats API."""
-    query = quote_plus(f"seasonId={season_id}")
-    full_url = f"{url}?cayenneExp={query}"
-    req = Request(full_url, headers={"User-Agent": "Mozilla/5.0"})
-    context = ssl._create_unverified_context()
-
     try:
-        with urlopen(req, timeout=30, context=context) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-            return payload.get("data", [])
+        response = get_http_client().get(url, params={"cayenneExp": f"seasonId={season_id}"}, timeout=30)
+        response.raise_for_status()
+        return response.json().get("data", [])
     except Exception as e:
         print(f"  Failed to fetch from {url}: {e}")
         return []
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Pack existing per-file JSON caches under data/raw into the compact SQLite store.
+
+After migration the API clients pick up the packed store automatically
+(see nhl_prediction.data_sources.cache.open_cache).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RAW_DIR = REPO_ROOT / "data" / "raw"
+
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from nhl_prediction.data_sources.cache import migrate_json_tree  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Migrate data/raw JSON payload caches to the packed SQLite store."
+    )
+    parser.add_argument(
+        "roots",
+        nargs="*",
+        type=Path,
+        help="Cache roots to migrate (default: every directory under data/raw).",
+    )
+    parser.add_argument(
+        "--delete-json",
+        action="store_true",
+        help="Remove the original JSON files once they are packed.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    roots = args.roots
+    if not roots and RAW_DIR.exists():
+        roots = sorted(path for path in RAW_DIR.iterdir() if path.is_dir())
+
+    if not roots:
+        print(f"No cache roots found under {RAW_DIR}")
+        return
+
+    for root in roots:
+        count = migrate_json_tree(root, delete_json=args.delete_json)
+        print(f"✅ {root}: packed {count} payloads")
+
+
+if __name__ == "__main__":
+    main()
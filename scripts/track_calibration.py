@@ -10,12 +10,19 @@ to ensure the model's confidence estimates are well-calibrated.
 import argparse
 import csv
 import json
+import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 ARCHIVE_DIR = REPO_ROOT / "data" / "archive" / "predictions"
 CALIBRATION_TRACKER = REPO_ROOT / "data" / "archive" / "calibration_tracker.csv"
 CALIBRATION_REPORT = REPO_ROOT / "web" / "src" / "data" / "calibrationReport.json"
@@ -69,31 +76,27 @@ def fetch_game_results(game_id: str) -> Dict[str, Any] | None:
 
     Returns game outcome with home/away scores if game is complete.
     """
-    import ssl
-    from urllib.request import Request, urlopen
-
     url = f"https://api-web.nhle.com/v1/gamecenter/{game_id}/boxscore"
-    req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    context = ssl._create_unverified_context()
 
     try:
-        with urlopen(req, timeout=30, context=context) as response:
-            data = json.loads(response.read().decode("utf-8"))
-            game_state = data.get("gameState", "")
-
-            if game_state not in ["FINAL", "OFF"]:
-                return None  # Game not complete
-
-            home_score = data.get("homeTeam", {}).get("score", 0)
-            away_score = data.get("awayTeam", {}).get("score", 0)
-
-            return {
-                "gameId": game_id,
-                "homeScore": home_score,
-                "awayScore": away_score,
-                "actualWinner": "home" if home_score > away_score else "away",
-                "gameState": game_state,
-            }
+        response = get_http_client().get(url, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+        game_state = data.get("gameState", "")
+
+        if game_state not in ["FINAL", "OFF"]:
+            return None  # Game not complete
+
+        home_score = data.get("homeTeam", {}).get("score", 0)
+        away_score = data.get("awayTeam", {}).get("score", 0)
+
+        return {
+            "gameId": game_id,
+            "homeScore": home_score,
+            "awayScore": away_score,
+            "actualWinner": "home" if home_score > away_score else "away",
+            "gameState": game_state,
+        }
     except Exception as e:
         print(f"  Failed to fetch results for game {game_id}: {e}")
         return None
@@ -7,14 +7,19 @@ import argparse
 import csv
 import json
 import random
-import ssl
+import sys
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from pathlib import Path
 from typing import Any, Dict, List
-from urllib.request import Request, urlopen
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from nhl_prediction.data_sources.http_client import get_http_client  # noqa: E402
+
 PREDICTIONS_FILE = REPO_ROOT / "web" / "src" / "data" / "todaysPredictions.json"
 ARCHIVE_DIR = REPO_ROOT / "data" / "archive" / "predictions"
 AB_TRACKER = REPO_ROOT / "data" / "archive" / "twitter_ab_tests.csv"
@@ -167,10 +172,9 @@ def _winner_tag(abbrev: str) -> str:
 def _fetch_game_result(game_id: str):
     try:
         url = f"https://statsapi.web.nhl.com/api/v1/game/{game_id}/feed/live"
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        context = ssl._create_unverified_context()
-        with urlopen(req, timeout=10, context=context) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        response = get_http_client().get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
         line_score = data.get("liveData", {}).get("linescore", {})
         status = data.get("gameData", {}).get("status", {}).get("detailedState", "")
         if status not in ["Final", "Final/OT", "Final/SO"]:
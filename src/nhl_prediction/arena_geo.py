@@ -0,0 +1,128 @@
+"""
+Arena locations with precomputed team x team travel matrices.
+
+Every arena gets an integer code (its position in ARENA_CODES). Distances
+and timezone changes between all pairs of arenas are computed once at import,
+so travel features only need each team's previous and current venue codes
+and a matrix lookup instead of per-game haversine math.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_MILES = 3959.0
+
+# NHL arena locations (latitude, longitude, timezone offset from ET)
+# Timezone offset: ET=0, CT=-1, MT=-2, PT=-3
+ARENA_LOCATIONS: Dict[str, Tuple[float, float, int]] = {
+    # Atlantic Division
+    "BOS": (42.3662, -71.0621, 0),    # Boston, MA (ET)
+    "BUF": (42.8750, -78.8761, 0),    # Buffalo, NY (ET)
+    "DET": (42.3410, -83.0550, 0),    # Detroit, MI (ET)
+    "FLA": (26.1583, -80.3256, 0),    # Sunrise, FL (ET)
+    "MTL": (45.4961, -73.5694, 0),    # Montreal, QC (ET)
+    "OTT": (45.2968, -75.9270, 0),    # Ottawa, ON (ET)
+    "TBL": (27.9425, -82.4518, 0),    # Tampa, FL (ET)
+    "TOR": (43.6434, -79.3791, 0),    # Toronto, ON (ET)
+
+    # Metropolitan Division
+    "CAR": (35.8031, -78.7219, 0),    # Raleigh, NC (ET)
+    "CBJ": (39.9692, -82.9911, 0),    # Columbus, OH (ET)
+    "NJD": (40.7334, -74.1711, 0),    # Newark, NJ (ET)
+    "NYI": (40.7225, -73.5907, 0),    # Uniondale, NY (ET)
+    "NYR": (40.7505, -73.9934, 0),    # New York, NY (ET)
+    "PHI": (39.9012, -75.1720, 0),    # Philadelphia, PA (ET)
+    "PIT": (40.4394, -79.9890, 0),    # Pittsburgh, PA (ET)
+    "WSH": (38.8981, -77.0209, 0),    # Washington, DC (ET)
+
+    # Central Division
+    "CHI": (41.8807, -87.6742, -1),   # Chicago, IL (CT)
+    "COL": (39.7487, -105.0077, -2),  # Denver, CO (MT)
+    "DAL": (32.7905, -96.8103, -1),   # Dallas, TX (CT)
+    "MIN": (44.9449, -93.1011, -1),   # St. Paul, MN (CT)
+    "NSH": (36.1591, -86.7784, -1),   # Nashville, TN (CT)
+    "STL": (38.6265, -90.2026, -1),   # St. Louis, MO (CT)
+    "UTA": (40.7683, -111.9011, -2),  # Salt Lake City, UT (MT) - formerly ARI
+    "WPG": (49.8929, -97.1436, -1),   # Winnipeg, MB (CT)
+
+    # Pacific Division
+    "ANA": (33.8078, -117.8761, -3),  # Anaheim, CA (PT)
+    "CGY": (51.0373, -114.0519, -2),  # Calgary, AB (MT)
+    "EDM": (53.5467, -113.4978, -2),  # Edmonton, AB (MT)
+    "LAK": (34.0430, -118.2673, -3),  # Los Angeles, CA (PT)
+    "SEA": (47.6220, -122.3540, -3),  # Seattle, WA (PT)
+    "SJS": (37.3327, -121.9010, -3),  # San Jose, CA (PT)
+    "VAN": (49.2778, -123.1089, -3),  # Vancouver, BC (PT)
+    "VGK": (36.1027, -115.1783, -3),  # Las Vegas, NV (PT)
+
+    # Legacy teams (for historical data)
+    "ARI": (33.4484, -112.0740, -2),  # Phoenix, AZ (MT) - now UTA
+    "ATL": (33.7573, -84.3963, 0),    # Atlanta, GA (ET) - now WPG
+    "PHX": (33.4484, -112.0740, -2),  # Phoenix, AZ (MT) - same as ARI
+}
+
+ARENA_CODES: Tuple[str, ...] = tuple(ARENA_LOCATIONS)
+UNKNOWN_ARENA = -1
+
+_LATITUDES, _LONGITUDES, TIMEZONE_OFFSETS = (
+    np.array(values) for values in zip(*ARENA_LOCATIONS.values())
+)
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """Great circle distance in miles; works on scalars and (broadcastable) arrays."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlon = np.radians(np.subtract(lon2, lon1))
+    dlat = np.radians(np.subtract(lat2, lat1))
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * np.arcsin(np.sqrt(a))
+
+
+# DISTANCE_MILES[a, b]: miles from arena a to arena b
+DISTANCE_MILES = haversine_miles(
+    _LATITUDES[:, None], _LONGITUDES[:, None], _LATITUDES[None, :], _LONGITUDES[None, :]
+)
+# TIMEZONE_CHANGE[a, b]: hours gained moving from arena a to arena b (positive = traveling east)
+TIMEZONE_CHANGE = TIMEZONE_OFFSETS[None, :] - TIMEZONE_OFFSETS[:, None]
+
+
+def arena_codes(teams: Iterable[str]) -> np.ndarray:
+    """Arena code of each team abbreviation (UNKNOWN_ARENA for teams without a location)."""
+    teams = np.asarray(list(teams), dtype=object)
+    return pd.Categorical(teams, categories=ARENA_CODES).codes.astype(np.int64)
+
+
+def travel_legs(previous: np.ndarray, current: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Distance and timezone change for each (previous venue, current venue) pair.
+
+    Returns (miles, timezone change, known) where known marks legs with both
+    venues located; unknown legs have zero distance and timezone change.
+    """
+    previous = np.asarray(previous)
+    current = np.asarray(current)
+    known = (previous != UNKNOWN_ARENA) & (current != UNKNOWN_ARENA)
+    prev_idx = np.where(known, previous, 0)
+    curr_idx = np.where(known, current, 0)
+    distance = np.where(known, DISTANCE_MILES[prev_idx, curr_idx], 0.0)
+    tz_change = np.where(known, TIMEZONE_CHANGE[prev_idx, curr_idx], 0)
+    return distance, tz_change, known
+
+
+__all__ = [
+    "ARENA_CODES",
+    "ARENA_LOCATIONS",
+    "DISTANCE_MILES",
+    "TIMEZONE_CHANGE",
+    "TIMEZONE_OFFSETS",
+    "UNKNOWN_ARENA",
+    "arena_codes",
+    "haversine_miles",
+    "travel_legs",
+]
@@ -25,7 +25,7 @@ def read_team_metadata(path: Path = TEAM_CSV_PATH) -> pd.DataFrame:
     return pd.read_csv(path)
 
 
-def fetch_multi_season_logs(seasons: Iterable[str]) -> pd.DataFrame:
+def fetch_multi_season_logs(seasons: Iterable[str], incremental: bool = False) -> pd.DataFrame:
     """
     Fetch and concatenate game logs for multiple seasons from native NHL API.
 
@@ -39,6 +39,7 @@ def fetch_multi_season_logs(seasons: Iterable[str]) -> pd.DataFrame:
 
     Args:
         seasons: List of season IDs (e.g., ["20212022", "20222023", "20232024"])
+        incremental: Append newly completed games to cached seasons
 
     Returns:
         Combined DataFrame with all requested seasons
@@ -46,7 +47,7 @@ def fetch_multi_season_logs(seasons: Iterable[str]) -> pd.DataFrame:
     LOGGER.info(f"Fetching game logs for seasons: {seasons}")
 
     # Load from native NHL API with caching
-    native = load_native_game_logs(list(seasons))
+    native = load_native_game_logs(list(seasons), incremental=incremental)
 
     if native.empty:
         LOGGER.error("Failed to load any game logs from NHL API")
@@ -1,10 +1,32 @@
-"""Minimal JSON cache used by the API clients."""
+"""Payload caches used by the API clients.
+
+Two interchangeable backends share the read/write/exists/read_many interface:
+
+- JSONCache: one pretty-printed JSON file per payload (the original layout).
+- PackedCache: a single SQLite blob store per cache root holding compact,
+  zlib-compressed JSON with an in-memory key index.
+
+open_cache() picks PackedCache automatically once a root has been migrated
+(see scripts/migrate_raw_cache.py), so clients need no configuration.
+"""
 
 from __future__ import annotations
 
 import json
+import sqlite3
+import threading
+import zlib
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Iterable
+
+PACKED_DB_NAME = "payloads.sqlite"
+
+
+def _normalize_key(relative: Path | str) -> str:
+    path = Path(relative)
+    if path.suffix != ".json":
+        path = path.with_suffix(".json")
+    return path.as_posix()
 
 
 class JSONCache:
@@ -27,6 +49,15 @@ class JSONCache:
             return None
         return json.loads(path.read_text(encoding="utf-8"))
 
+    def read_many(self, keys: Iterable[Path | str]) -> Dict[str, Any]:
+        """Read several payloads; missing keys are omitted from the result."""
+        result = {}
+        for key in keys:
+            payload = self.read(key)
+            if payload is not None:
+                result[_normalize_key(key)] = payload
+        return result
+
     def write(self, relative: Path | str, payload: Any) -> None:
         path = self._resolve(relative)
         path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
@@ -34,3 +65,132 @@ class JSONCache:
     def exists(self, relative: Path | str) -> bool:
         path = self._resolve(relative)
         return path.exists()
+
+
+class PackedCache:
+    """SQLite blob store with compact, compressed payloads.
+
+    Keys are the same relative paths JSONCache uses (``2023/2023020001_pbp.json``),
+    so a migrated tree is a drop-in replacement. The key index is held in memory
+    to answer exists() without touching disk; the connection is shared across
+    threads behind a lock so concurrent fetchers can write safely.
+    """
+
+    def __init__(self, root: Path, db_name: str = PACKED_DB_NAME):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / db_name
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS payloads (key TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        self._conn.commit()
+        self._keys = {row[0] for row in self._conn.execute("SELECT key FROM payloads")}
+
+    @staticmethod
+    def _encode(payload: Any) -> bytes:
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob))
+
+    def read(self, relative: Path | str) -> Any | None:
+        key = _normalize_key(relative)
+        if key not in self._keys:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM payloads WHERE key = ?", (key,)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def read_many(self, keys: Iterable[Path | str]) -> Dict[str, Any]:
+        """Read several payloads in one query; missing keys are omitted."""
+        wanted = [key for key in (_normalize_key(k) for k in keys) if key in self._keys]
+        result: Dict[str, Any] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(wanted), 500):
+            chunk = wanted[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, data FROM payloads WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+            result.update((key, self._decode(blob)) for key, blob in rows)
+        return result
+
+    def write(self, relative: Path | str, payload: Any) -> None:
+        self.write_many({relative: payload})
+
+    def write_many(self, payloads: Dict[Path | str, Any]) -> None:
+        """Insert or replace several payloads in a single transaction."""
+        rows = [(_normalize_key(key), self._encode(payload)) for key, payload in payloads.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO payloads (key, data) VALUES (?, ?)", rows)
+            self._conn.commit()
+            self._keys.update(key for key, _ in rows)
+
+    def exists(self, relative: Path | str) -> bool:
+        return _normalize_key(relative) in self._keys
+
+    def keys(self) -> set[str]:
+        return set(self._keys)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_cache(root: Path, backend: str | None = None) -> JSONCache | PackedCache:
+    """
+    Open the payload cache for a root directory.
+
+    backend may be "json" or "packed"; by default the packed store is used when
+    the root already contains one (i.e. after migration) and JSON otherwise.
+    """
+    root = Path(root)
+    if backend is None:
+        backend = "packed" if (root / PACKED_DB_NAME).exists() else "json"
+    if backend == "packed":
+        return PackedCache(root)
+    if backend == "json":
+        return JSONCache(root)
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+def migrate_json_tree(root: Path, *, delete_json: bool = False, batch_size: int = 500) -> int:
+    """
+    Pack every JSON payload under `root` into the root's PackedCache.
+
+    Returns the number of payloads migrated. Original files are only removed
+    when delete_json is True, after their batch has been committed.
+    """
+    root = Path(root)
+    store = PackedCache(root)
+    migrated = 0
+    batch: Dict[str, Any] = {}
+    batch_files: list[Path] = []
+
+    def _flush() -> None:
+        store.write_many(batch)
+        if delete_json:
+            for path in batch_files:
+                path.unlink()
+        batch.clear()
+        batch_files.clear()
+
+    try:
+        for path in sorted(root.rglob("*.json")):
+            try:
+                batch[path.relative_to(root).as_posix()] = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            batch_files.append(path)
+            migrated += 1
+            if len(batch) >= batch_size:
+                _flush()
+        if batch:
+            _flush()
+    finally:
+        store.close()
+
+    return migrated
@@ -0,0 +1,198 @@
+"""Freshness policies and conditional revalidation for cached API payloads.
+
+Each endpoint has a policy mapping a payload to its time-to-live in seconds
+(None = immutable). A cached payload is served while it is fresh; once it
+expires it is revalidated with If-None-Match / If-Modified-Since when the
+previous response carried an ETag or Last-Modified header, so an unchanged
+resource costs a 304 instead of a full download. If revalidation fails
+(network error or HTTP error status) the stale cached copy is served.
+
+Fetch metadata (fetch time and validators) lives next to the payload under
+the cache's ``_meta/`` prefix, so it works with either cache backend.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Union
+
+import requests
+
+LOGGER = logging.getLogger(__name__)
+
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+
+FINAL_GAME_STATES = ("OFF", "FINAL")
+META_PREFIX = "_meta"
+
+Policy = Union[Optional[float], Callable[[Any], Optional[float]]]
+
+
+def _all_games_final(games) -> bool:
+    games = list(games)
+    return bool(games) and all(game.get("gameState") in FINAL_GAME_STATES for game in games)
+
+
+def play_by_play_ttl(payload: Dict[str, Any]) -> Optional[float]:
+    """Play-by-play and boxscores never change once the game is final."""
+    return None if payload.get("gameState") in FINAL_GAME_STATES else MINUTE
+
+
+def schedule_week_ttl(payload: Dict[str, Any]) -> Optional[float]:
+    """A schedule week is settled once every game in it is final."""
+    games = (game for day in payload.get("gameWeek", []) for game in day.get("games", []))
+    return None if _all_games_final(games) else 15 * MINUTE
+
+
+def team_schedule_ttl(payload: Dict[str, Any]) -> Optional[float]:
+    """A club's season schedule is settled once every game in it is final."""
+    return None if _all_games_final(payload.get("games", [])) else 6 * HOUR
+
+
+def _season_over(season_id: Any, now: Optional[float] = None) -> bool:
+    """A season (e.g. 20222023) is settled once its playoffs are over, by 1 July of its end year."""
+    try:
+        end_year = int(str(season_id)[4:8])
+    except ValueError:
+        return False
+    settled_at = datetime(end_year, 7, 1, tzinfo=timezone.utc).timestamp()
+    return (now if now is not None else time.time()) >= settled_at
+
+
+def _seasons_over(rows: Iterable[Dict[str, Any]]) -> bool:
+    seasons = {row.get("seasonId") for row in rows}
+    return bool(seasons) and all(_season_over(season) for season in seasons)
+
+
+def standings_ttl(payload: Dict[str, Any]) -> Optional[float]:
+    """Standings of a finished season never change."""
+    return None if _seasons_over(payload.get("standings", [])) else 3 * HOUR
+
+
+def stats_summary_ttl(payload: Dict[str, Any]) -> Optional[float]:
+    """Stats REST team/goalie summaries of a finished season never change."""
+    return None if _seasons_over(payload.get("data", [])) else 6 * HOUR
+
+
+DEFAULT_POLICIES: Dict[str, Policy] = {
+    "play_by_play": play_by_play_ttl,
+    "boxscore": play_by_play_ttl,
+    "schedule": schedule_week_ttl,
+    "team_schedule": team_schedule_ttl,
+    "standings": standings_ttl,
+    "roster": 12 * HOUR,
+    "team_summary": stats_summary_ttl,
+    "goalie_summary": stats_summary_ttl,
+}
+
+
+def resolve_policies(overrides: Optional[Mapping[str, Policy]] = None) -> Dict[str, Policy]:
+    """Merge client-specific overrides over the default policies."""
+    policies = dict(DEFAULT_POLICIES)
+    policies.update(overrides or {})
+    return policies
+
+
+def ttl_for(policy: Policy, payload: Any) -> Optional[float]:
+    """Evaluate a policy for a payload."""
+    return policy(payload) if callable(policy) else policy
+
+
+def _meta_key(cache_path: Path | str) -> Path:
+    return Path(META_PREFIX) / Path(cache_path)
+
+
+def read_meta(cache, cache_path: Path | str) -> Dict[str, Any]:
+    return cache.read(_meta_key(cache_path)) or {}
+
+
+def write_meta(cache, cache_path: Path | str, meta: Dict[str, Any]) -> None:
+    cache.write(_meta_key(cache_path), meta)
+
+
+def is_fresh(meta: Dict[str, Any], ttl: Optional[float], now: Optional[float] = None) -> bool:
+    """Immutable payloads are always fresh; mutable ones need a recent fetch time."""
+    if ttl is None:
+        return True
+    fetched_at = meta.get("fetched_at")
+    if fetched_at is None:
+        return False
+    return (now if now is not None else time.time()) - fetched_at < ttl
+
+
+def conditional_headers(meta: Dict[str, Any]) -> Dict[str, str]:
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def cached_fetch(
+    cache,
+    cache_path: Optional[Path | str],
+    fetch: Callable[[Dict[str, str]], Any],
+    *,
+    policy: Policy = None,
+    use_cache: bool = True,
+) -> Any:
+    """
+    Serve a payload from cache when fresh, otherwise fetch or revalidate it.
+
+    `fetch(headers)` performs the HTTP GET with the given extra headers and
+    returns the response object. With use_cache=False the cache is bypassed
+    on read (but still written), matching the clients' existing semantics.
+    When an expired cached payload cannot be revalidated (request error or
+    HTTP error status) it is served stale rather than failing the caller.
+    """
+    cached = None
+    meta: Dict[str, Any] = {}
+    headers: Dict[str, str] = {}
+
+    if cache_path is not None and use_cache:
+        cached = cache.read(cache_path)
+        if cached is not None:
+            meta = read_meta(cache, cache_path) if ttl_for(policy, cached) is not None else {}
+            if is_fresh(meta, ttl_for(policy, cached)):
+                return cached
+            headers = conditional_headers(meta)
+
+    try:
+        response = fetch(headers)
+    except requests.RequestException as exc:
+        if cached is None:
+            raise
+        LOGGER.warning("Revalidating %s failed (%s); serving stale cached copy", cache_path, exc)
+        return cached
+
+    if response.status_code == 304 and cached is not None:
+        # Unchanged upstream - extend freshness without rewriting the payload
+        write_meta(cache, cache_path, {**meta, "fetched_at": time.time()})
+        return cached
+
+    if response.status_code >= 400 and cached is not None:
+        LOGGER.warning("HTTP %s revalidating %s; serving stale cached copy", response.status_code, cache_path)
+        return cached
+
+    response.raise_for_status()
+    payload = response.json()
+
+    if cache_path is not None:
+        cache.write(cache_path, payload)
+        response_headers = getattr(response, "headers", None) or {}
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        # Immutable payloads without validators need no metadata
+        if ttl_for(policy, payload) is not None or etag or last_modified:
+            write_meta(cache, cache_path, {
+                "fetched_at": time.time(),
+                "etag": etag,
+                "last_modified": last_modified,
+            })
+
+    return payload
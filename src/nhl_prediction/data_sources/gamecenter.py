@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import logging
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple
 
 import requests
 
-from .cache import JSONCache
+from .cache import JSONCache, PackedCache, open_cache
+from .freshness import Policy, cached_fetch, resolve_policies
+from .http_client import get_http_client
+from .rate_limit import TokenBucket
 
 LOGGER = logging.getLogger(__name__)
 BASE_URL = "https://api-web.nhle.com/v1"
@@ -28,19 +33,26 @@ class GamecenterClient:
     def __init__(
         self,
         session: Optional[requests.Session] = None,
-        cache: Optional[JSONCache] = None,
+        cache: Optional[JSONCache | PackedCache] = None,
         rate_limit_seconds: float = 0.35,
+        burst: int = 1,
+        max_workers: int = 4,
+        rate_limiter: Optional[TokenBucket] = None,
+        freshness: Optional[Mapping[str, Policy]] = None,
     ):
-        self.session = session or requests.Session()
-        self.cache = cache or JSONCache(DEFAULT_CACHE_ROOT)
+        # Default to the shared pooled client (keep-alive, retry/backoff on 429/5xx)
+        self.session = session or get_http_client()
+        self.cache = cache or open_cache(DEFAULT_CACHE_ROOT)
         self.rate_limit_seconds = rate_limit_seconds
-        self._last_request = 0.0
+        self.max_workers = max_workers
+        # Per-endpoint TTLs for cached payloads (see freshness.DEFAULT_POLICIES)
+        self.policies = resolve_policies(freshness)
+        # One bucket is shared by every thread using this client; pass the same
+        # bucket to several clients to give them a single combined budget.
+        self.rate_limiter = rate_limiter or TokenBucket.from_interval(rate_limit_seconds, burst=burst)
 
     def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request
-        if elapsed < self.rate_limit_seconds:
-            time.sleep(self.rate_limit_seconds - elapsed)
-        self._last_request = time.time()
+        self.rate_limiter.acquire()
 
     def _request(
         self,
@@ -49,55 +61,125 @@ class GamecenterClient:
         params: Optional[Dict[str, Any]] = None,
         cache_path: Optional[Path | str] = None,
         use_cache: bool = True,
+        policy: Optional[str] = None,
     ) -> Dict[str, Any]:
         url = f"{BASE_URL}/{endpoint.lstrip('/')}"
 
-        if use_cache and cache_path is not None:
-            cached = self.cache.read(cache_path)
-            if cached is not None:
-                return cached
+        def fetch(headers: Dict[str, str]):
+            self._rate_limit()
+            return self.session.get(url, params=params, headers=headers, timeout=20)
 
-        self._rate_limit()
-        response = self.session.get(url, params=params, timeout=20)
-        response.raise_for_status()
-        payload = response.json()
-
-        if cache_path is not None:
-            self.cache.write(cache_path, payload)
-
-        return payload
+        return cached_fetch(
+            self.cache,
+            cache_path,
+            fetch,
+            policy=self.policies.get(policy) if policy else None,
+            use_cache=use_cache,
+        )
 
     def get_play_by_play(self, game_id: int | str, *, use_cache: bool = True) -> Dict[str, Any]:
         cache_path = Path(_season_bucket(game_id)) / f"{game_id}_pbp.json"
         endpoint = f"gamecenter/{game_id}/play-by-play"
-        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache)
+        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache, policy="play_by_play")
 
     def get_boxscore(self, game_id: int | str, *, use_cache: bool = True) -> Dict[str, Any]:
         cache_path = Path(_season_bucket(game_id)) / f"{game_id}_boxscore.json"
         endpoint = f"gamecenter/{game_id}/boxscore"
-        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache)
+        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache, policy="boxscore")
+
+    def iter_play_by_play(
+        self,
+        game_ids: Iterable[int | str],
+        *,
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[int | str, Optional[Dict[str, Any]]]]:
+        """
+        Yield (game_id, payload) in input order while fetching ahead concurrently.
+
+        Network requests run on a thread pool under the shared rate limiter
+        (cache hits never touch it), so callers can parse one game while the
+        next ones download. Failed fetches are logged and yield None.
+        """
+        fetch = partial(self.get_play_by_play, use_cache=use_cache)
+        return self._iter_concurrent(fetch, game_ids, max_workers)
+
+    def iter_boxscores(
+        self,
+        game_ids: Iterable[int | str],
+        *,
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[int | str, Optional[Dict[str, Any]]]]:
+        """Boxscore counterpart of iter_play_by_play."""
+        fetch = partial(self.get_boxscore, use_cache=use_cache)
+        return self._iter_concurrent(fetch, game_ids, max_workers)
+
+    def prefetch(
+        self,
+        game_ids: Iterable[int | str],
+        *,
+        include_boxscores: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> int:
+        """Warm the cache for the given games; returns how many payloads are available."""
+        game_ids = list(game_ids)
+        available = sum(
+            payload is not None for _, payload in self.iter_play_by_play(game_ids, max_workers=max_workers)
+        )
+        if include_boxscores:
+            available += sum(
+                payload is not None for _, payload in self.iter_boxscores(game_ids, max_workers=max_workers)
+            )
+        return available
+
+    def _iter_concurrent(
+        self,
+        fetch: Callable[[int | str], Dict[str, Any]],
+        game_ids: Iterable[int | str],
+        max_workers: Optional[int],
+    ) -> Iterator[Tuple[int | str, Optional[Dict[str, Any]]]]:
+        workers = max(1, max_workers or self.max_workers)
+        pending: deque = deque()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for game_id in game_ids:
+                pending.append((game_id, executor.submit(fetch, game_id)))
+                # Bound the look-ahead so large seasons don't pile up in memory
+                if len(pending) >= workers * 2:
+                    yield self._resolve(*pending.popleft())
+            while pending:
+                yield self._resolve(*pending.popleft())
+
+    @staticmethod
+    def _resolve(game_id, future) -> Tuple[int | str, Optional[Dict[str, Any]]]:
+        try:
+            return game_id, future.result()
+        except Exception as exc:
+            LOGGER.warning("Failed to fetch game %s: %s", game_id, str(exc)[:100])
+            return game_id, None
 
     def get_team_schedule(self, team_abbrev: str, season: str, *, use_cache: bool = True) -> Dict[str, Any]:
         team = team_abbrev.lower()
         cache_path = Path("schedules") / season / f"{team}.json"
         endpoint = f"club-schedule-season/{team}/{season}"
-        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache)
+        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache, policy="team_schedule")
 
     def get_schedule(self, date_str: str, *, use_cache: bool = True) -> Dict[str, Any]:
         cache_path = Path("schedule") / f"{date_str}.json"
         endpoint = f"schedule/{date_str}"
-        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache)
+        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache, policy="schedule")
 
     def get_roster(self, team_abbrev: str, season: str = "current", *, use_cache: bool = True) -> Dict[str, Any]:
         team = team_abbrev.upper()
         cache_path = Path("rosters") / season / f"{team}.json"
         endpoint = f"roster/{team}/{season}"
-        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache)
+        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache, policy="roster")
 
     def get_standings(self, season: str, *, use_cache: bool = True) -> Dict[str, Any]:
         cache_path = Path("standings") / f"{season}.json"
         endpoint = f"standings/{season}"
-        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache)
+        return self._request(endpoint, cache_path=cache_path, use_cache=use_cache, policy="standings")
 
     def get_edge(self, path: str, *, use_cache: bool = True) -> Dict[str, Any]:
         """Access miscellaneous /edge routes for supplemental data."""
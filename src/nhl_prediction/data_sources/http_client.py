@@ -0,0 +1,178 @@
+"""Shared HTTP client used by every fetcher in the project.
+
+One pooled keep-alive session (gzip on), per-host rate limits, and
+exponential backoff with jitter on transient failures (429/5xx, connection
+errors, timeouts). Responses can optionally be cached through a payload cache
+with the same freshness policies the data-source clients use.
+
+Most callers should use the process-wide instance:
+
+    from nhl_prediction.data_sources.http_client import get_http_client
+
+    response = get_http_client().get(url, timeout=10)
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .freshness import Policy, cached_fetch
+from .rate_limit import TokenBucket
+from .replay import ReplaySession, session_from_env
+
+LOGGER = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; PuckCast/1.0; +https://puckcast.ai)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Minimum seconds between requests per host; unlisted hosts use default_interval
+DEFAULT_HOST_INTERVALS: Dict[str, float] = {
+    "api-web.nhle.com": 0.2,
+    "api.nhle.com": 0.2,
+    "statsapi.web.nhl.com": 0.35,
+    "www.dailyfaceoff.com": 0.5,
+}
+
+
+class HttpClient:
+    """
+    Pooled, rate-limited, retrying HTTP client.
+
+    get() mirrors requests.Session.get, so an HttpClient can be passed anywhere
+    a session is expected (e.g. the data-source clients' session argument).
+    After the last retry the final response is returned unchanged, so callers'
+    raise_for_status() handling keeps working.
+    """
+
+    def __init__(
+        self,
+        *,
+        session: Optional[requests.Session] = None,
+        max_retries: int = 4,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 30.0,
+        host_intervals: Optional[Mapping[str, float]] = None,
+        default_interval: float = 0.0,
+        timeout: float = 20.0,
+        pool_size: int = 16,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.session = session or requests.Session()
+        if hasattr(self.session, "mount"):
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers.update(headers or {})
+
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.host_intervals = dict(DEFAULT_HOST_INTERVALS if host_intervals is None else host_intervals)
+        self.default_interval = default_interval
+        self.timeout = timeout
+
+        self._limiters: Dict[str, TokenBucket] = {}
+        self._limiters_lock = threading.Lock()
+
+    def _limiter(self, host: str) -> TokenBucket:
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                interval = self.host_intervals.get(host, self.default_interval)
+                limiter = TokenBucket.from_interval(interval)
+                self._limiters[host] = limiter
+            return limiter
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Exponential backoff with jitter; honours a numeric Retry-After."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff_seconds)
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def get(
+        self,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        limiter = self._limiter(urlsplit(url).netloc)
+
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            try:
+                response = self.session.get(
+                    url, params=params, headers=headers, timeout=timeout or self.timeout, **kwargs
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, None)
+                LOGGER.warning("Request to %s failed (%s); retrying in %.1fs", url, exc, delay)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                delay = self._backoff(attempt, response)
+                LOGGER.warning("HTTP %s from %s; retrying in %.1fs", response.status_code, url, delay)
+            time.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    def get_json(
+        self,
+        url: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        cache=None,
+        cache_path: Optional[Path | str] = None,
+        policy: Policy = None,
+        use_cache: bool = True,
+    ) -> Any:
+        """GET a JSON payload, optionally through a payload cache (see freshness.cached_fetch)."""
+
+        def fetch(conditional: Dict[str, str]):
+            return self.get(url, params=params, headers={**(headers or {}), **conditional}, timeout=timeout)
+
+        if cache is None:
+            cache_path = None
+        return cached_fetch(cache, cache_path, fetch, policy=policy, use_cache=use_cache)
+
+
+_DEFAULT_CLIENT: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """
+    Process-wide shared client (one connection pool per host).
+
+    Honours PUCKCAST_HTTP_MODE=record|replay (see replay.py); replayed runs
+    skip the per-host rate limits since no request leaves the machine.
+    """
+    global _DEFAULT_CLIENT
+    if _DEFAULT_CLIENT is None:
+        session = session_from_env()
+        if isinstance(session, ReplaySession):
+            _DEFAULT_CLIENT = HttpClient(session=session, host_intervals={})
+        else:
+            _DEFAULT_CLIENT = HttpClient(session=session)
+    return _DEFAULT_CLIENT
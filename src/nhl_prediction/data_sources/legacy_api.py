@@ -5,11 +5,13 @@ from __future__ import annotations
 import logging
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 import requests
 
-from .cache import JSONCache
+from .cache import JSONCache, PackedCache, open_cache
+from .freshness import Policy, cached_fetch, resolve_policies
+from .http_client import get_http_client
 
 LOGGER = logging.getLogger(__name__)
 BASE_URL = "https://statsapi.web.nhl.com/api/v1"
@@ -23,12 +25,16 @@ class LegacyStatsClient:
     def __init__(
         self,
         session: Optional[requests.Session] = None,
-        cache: Optional[JSONCache] = None,
+        cache: Optional[JSONCache | PackedCache] = None,
         rate_limit_seconds: float = 0.35,
+        freshness: Optional[Mapping[str, Policy]] = None,
     ):
-        self.session = session or requests.Session()
-        self.cache = cache or JSONCache(DEFAULT_CACHE_ROOT)
+        # Default to the shared pooled client (keep-alive, retry/backoff on 429/5xx)
+        self.session = session or get_http_client()
+        self.cache = cache or open_cache(DEFAULT_CACHE_ROOT)
         self.rate_limit_seconds = rate_limit_seconds
+        # Per-endpoint TTLs for cached payloads (see freshness.DEFAULT_POLICIES)
+        self.policies = resolve_policies(freshness)
         self._last_request = 0.0
 
     def _rate_limit(self) -> None:
@@ -44,23 +50,21 @@ class LegacyStatsClient:
         params: Optional[Dict[str, Any]] = None,
         cache_path: Optional[Path | str] = None,
         use_cache: bool = True,
+        policy: Optional[str] = None,
     ) -> Dict[str, Any]:
         url = f"{BASE_URL}/{endpoint.lstrip('/')}"
 
-        if use_cache and cache_path is not None:
-            cached = self.cache.read(cache_path)
-            if cached is not None:
-                return cached
-
-        self._rate_limit()
-        response = self.session.get(url, params=params, timeout=20)
-        response.raise_for_status()
-        payload = response.json()
-
-        if cache_path is not None:
-            self.cache.write(cache_path, payload)
-
-        return payload
+        def fetch(headers: Dict[str, str]):
+            self._rate_limit()
+            return self.session.get(url, params=params, headers=headers, timeout=20)
+
+        return cached_fetch(
+            self.cache,
+            cache_path,
+            fetch,
+            policy=self.policies.get(policy) if policy else None,
+            use_cache=use_cache,
+        )
 
     def get_schedule(
         self,
@@ -0,0 +1,41 @@
+"""Thread-safe token bucket shared by concurrent API fetchers."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow `rate` requests per second on average, with bursts up to `burst`.
+
+    A single bucket can be shared across threads (and clients) so that a
+    concurrent fetcher never exceeds the request budget of a serial one.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_interval(cls, seconds: float, burst: int = 1) -> "TokenBucket":
+        """Build a bucket from a minimum interval between requests."""
+        return cls(1.0 / seconds if seconds > 0 else 0.0, burst=burst)
+
+    def acquire(self) -> None:
+        """Block until a request token is available, then consume it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,167 @@
+"""Record/replay sessions so the pipeline can run without the live APIs.
+
+RecordingSession wraps a real session and appends every response to a
+fixture bundle; ReplaySession serves a bundle back, optionally with injected
+latency and transient errors. Both look like a requests.Session to the shared
+HttpClient, so every client that goes through get_http_client() (the
+data-source clients, nhl_api, and the scripts) is covered.
+
+Enable them for a whole run with environment variables:
+
+    PUCKCAST_HTTP_MODE=record|replay
+    PUCKCAST_HTTP_FIXTURES=path/to/bundle          (directory)
+    PUCKCAST_HTTP_LATENCY=0.05                     (replay, seconds per request)
+    PUCKCAST_HTTP_ERROR_RATE=0.02                  (replay, fraction of 503s)
+    PUCKCAST_HTTP_SEED=0                           (replay, error injection seed)
+
+A bundle is a directory holding responses.jsonl, one JSON object per
+response. Repeated requests for the same URL are replayed in recorded order,
+and the last response is repeated once they run out.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlencode
+
+import requests
+
+BUNDLE_FILE = "responses.jsonl"
+
+# Response headers worth keeping (validators for conditional revalidation)
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+
+def request_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Stable key for a GET request: URL plus sorted query parameters."""
+    if not params:
+        return url
+    query = urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+    return f"{url}?{query}"
+
+
+class ReplayResponse:
+    """Minimal stand-in for requests.Response built from a recorded entry."""
+
+    def __init__(self, url: str, status_code: int, text: str, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class RecordingSession:
+    """Pass requests through to a real session and append responses to a bundle."""
+
+    def __init__(self, bundle_dir: Path | str, session: Optional[requests.Session] = None):
+        self.session = session or requests.Session()
+        self.headers = getattr(self.session, "headers", {})
+        self.bundle_dir = Path(bundle_dir)
+        self.bundle_dir.mkdir(parents=True, exist_ok=True)
+        self._path = self.bundle_dir / BUNDLE_FILE
+        self._lock = threading.Lock()
+
+    def mount(self, prefix: str, adapter) -> None:
+        self.session.mount(prefix, adapter)
+
+    def get(self, url: str, params=None, headers=None, timeout=None, **kwargs):
+        response = self.session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+        entry = {
+            "key": request_key(url, params),
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "body": response.text,
+        }
+        with self._lock, self._path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        return response
+
+
+class ReplaySession:
+    """Serve responses from a recorded bundle; unrecorded requests get a 404."""
+
+    def __init__(
+        self,
+        bundle_dir: Path | str,
+        *,
+        latency_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.headers: Dict[str, str] = {}
+        self.latency_seconds = latency_seconds
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+
+        path = Path(bundle_dir) / BUNDLE_FILE
+        if path.exists():
+            with path.open(encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]].append(entry)
+
+    def mount(self, prefix: str, adapter) -> None:
+        """Accepted for interface compatibility; replay never opens connections."""
+
+    def get(self, url: str, params=None, headers=None, timeout=None, **kwargs) -> ReplayResponse:
+        if self.latency_seconds > 0:
+            time.sleep(self.latency_seconds)
+
+        key = request_key(url, params)
+        with self._lock:
+            if self.error_rate > 0 and self._rng.random() < self.error_rate:
+                return ReplayResponse(url, 503, "", {"Retry-After": "0"})
+            entries = self._entries.get(key)
+            if not entries:
+                return ReplayResponse(url, 404, json.dumps({"error": "not recorded", "key": key}))
+            index = min(self._served[key], len(entries) - 1)
+            self._served[key] += 1
+
+        entry = entries[index]
+        return ReplayResponse(url, entry["status"], entry["body"], entry.get("headers"))
+
+
+def session_from_env(environ: Optional[Mapping[str, str]] = None):
+    """Build a recording/replaying session from PUCKCAST_HTTP_* variables, if set."""
+    environ = os.environ if environ is None else environ
+    mode = environ.get("PUCKCAST_HTTP_MODE", "").lower()
+    if mode not in ("record", "replay"):
+        return None
+
+    bundle_dir = environ.get("PUCKCAST_HTTP_FIXTURES")
+    if not bundle_dir:
+        raise ValueError("PUCKCAST_HTTP_FIXTURES must be set when PUCKCAST_HTTP_MODE is used")
+
+    if mode == "record":
+        return RecordingSession(bundle_dir)
+
+    seed = environ.get("PUCKCAST_HTTP_SEED")
+    return ReplaySession(
+        bundle_dir,
+        latency_seconds=float(environ.get("PUCKCAST_HTTP_LATENCY", 0.0)),
+        error_rate=float(environ.get("PUCKCAST_HTTP_ERROR_RATE", 0.0)),
+        seed=int(seed) if seed is not None else None,
+    )
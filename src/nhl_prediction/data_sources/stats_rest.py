@@ -5,12 +5,14 @@ from __future__ import annotations
 import logging
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 import pandas as pd
 import requests
 
-from .cache import JSONCache
+from .cache import JSONCache, PackedCache, open_cache
+from .freshness import Policy, cached_fetch, resolve_policies
+from .http_client import get_http_client
 
 LOGGER = logging.getLogger(__name__)
 BASE_URL = "https://api.nhle.com/stats/rest"
@@ -37,12 +39,16 @@ class StatsRestClient:
     def __init__(
         self,
         session: Optional[requests.Session] = None,
-        cache: Optional[JSONCache] = None,
+        cache: Optional[JSONCache | PackedCache] = None,
         rate_limit_seconds: float = 0.35,
+        freshness: Optional[Mapping[str, Policy]] = None,
     ):
-        self.session = session or requests.Session()
-        self.cache = cache or JSONCache(DEFAULT_CACHE_ROOT)
+        # Default to the shared pooled client (keep-alive, retry/backoff on 429/5xx)
+        self.session = session or get_http_client()
+        self.cache = cache or open_cache(DEFAULT_CACHE_ROOT)
         self.rate_limit_seconds = rate_limit_seconds
+        # Per-endpoint TTLs for cached payloads (see freshness.DEFAULT_POLICIES)
+        self.policies = resolve_policies(freshness)
         self._last_request = 0.0
 
     def _rate_limit(self) -> None:
@@ -59,23 +65,21 @@ class StatsRestClient:
         params: Optional[Dict[str, Any]] = None,
         cache_path: Optional[Path | str] = None,
         use_cache: bool = True,
+        policy: Optional[str] = None,
     ) -> Dict[str, Any]:
         url = f"{BASE_URL}/{lang.strip('/')}/{path.lstrip('/')}"
 
-        if use_cache and cache_path is not None:
-            cached = self.cache.read(cache_path)
-            if cached is not None:
-                return cached
+        def fetch(headers: Dict[str, str]):
+            self._rate_limit()
+            return self.session.get(url, params=params, headers=headers, timeout=30)
 
-        self._rate_limit()
-        response = self.session.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        payload = response.json()
-
-        if cache_path is not None:
-            self.cache.write(cache_path, payload)
-
-        return payload
+        return cached_fetch(
+            self.cache,
+            cache_path,
+            fetch,
+            policy=self.policies.get(policy) if policy else None,
+            use_cache=use_cache,
+        )
 
     @staticmethod
     def to_dataframe(payload: Dict[str, Any]) -> pd.DataFrame:
@@ -96,8 +100,11 @@ class StatsRestClient:
         params: Optional[Dict[str, Any]] = None,
         cache_path: Optional[Path | str] = None,
         use_cache: bool = True,
+        policy: Optional[str] = None,
     ) -> Dict[str, Any]:
-        return self._request(report_path, lang=lang, params=params, cache_path=cache_path, use_cache=use_cache)
+        return self._request(
+            report_path, lang=lang, params=params, cache_path=cache_path, use_cache=use_cache, policy=policy
+        )
 
     def get_team_summary(
         self,
@@ -116,7 +123,9 @@ class StatsRestClient:
             "limit": limit,
         }
         cache_path = Path("team") / "summary" / f"{season_id}_gt{game_type_id}.json"
-        payload = self.fetch_report("team/summary", lang=lang, params=params, cache_path=cache_path, use_cache=use_cache)
+        payload = self.fetch_report(
+            "team/summary", lang=lang, params=params, cache_path=cache_path, use_cache=use_cache, policy="team_summary"
+        )
         return self.to_dataframe(payload)
 
     def get_goalie_summary(
@@ -135,7 +144,9 @@ class StatsRestClient:
             "limit": limit,
         }
         cache_path = Path("goalie") / "summary" / f"{season_id}_gt{game_type_id}.json"
-        payload = self.fetch_report("goalie/summary", lang=lang, params=params, cache_path=cache_path, use_cache=use_cache)
+        payload = self.fetch_report(
+            "goalie/summary", lang=lang, params=params, cache_path=cache_path, use_cache=use_cache, policy="goalie_summary"
+        )
         return self.to_dataframe(payload)
 
     def get_skater_report(
@@ -0,0 +1,301 @@
+"""
+Game-by-game Elo ratings with season carryover and dynamic home advantage.
+
+EloState plays games one at a time (for incremental updates); elo_ratings()
+runs a whole schedule from arrays, optionally for many parameter
+configurations at once (see elo_sweep()).
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+MIN_GAMES_FOR_DYNAMIC_HOME_ADV = 25
+
+
+class EloState:
+    """
+    Running Elo ratings, updated one game at a time in chronological order.
+
+    Games must be played through play() in date order (ties broken by gameId,
+    as _add_elo_features does). The state is small and picklable, so it can be
+    persisted and topped up as results land (see team_state.TeamStateStore).
+    """
+
+    def __init__(
+        self,
+        base_rating: float = 1500.0,
+        k_factor: float = 10.0,
+        home_advantage: float = 35.0,
+        season_carryover: float = 0.5,
+        dynamic_home_advantage: bool = True,
+        home_adv_window: int = 100,
+        home_adv_scale: float = 700.0,
+    ):
+        self.base_rating = base_rating
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.season_carryover = season_carryover
+        self.dynamic_home_advantage = dynamic_home_advantage
+        self.home_adv_window = home_adv_window
+        self.home_adv_scale = home_adv_scale
+
+        self.current_season: Optional[str] = None
+        self.ratings: Dict[int, float] = {}
+        self.games_played = 0
+        self._recent_home_wins: deque[int] = deque(maxlen=home_adv_window)
+        self._recent_home_win_sum = 0
+
+    def _season_ratings(self, season: str) -> Dict[int, float]:
+        """Ratings in effect for a game in `season` (regressed toward the mean on a new season)."""
+        if season == self.current_season:
+            return self.ratings
+        if self.current_season is not None and self.season_carryover > 0 and self.ratings:
+            return {
+                team: self.base_rating + self.season_carryover * (rating - self.base_rating)
+                for team, rating in self.ratings.items()
+            }
+        return {}
+
+    def rating(self, team_id: int, season: str) -> float:
+        """Pre-game rating of a team for its next game in `season`."""
+        return self._season_ratings(season).get(int(team_id), self.base_rating)
+
+    def current_home_advantage(self) -> float:
+        """Home advantage in Elo points, from the recent league home win rate once enough games are in."""
+        if self.dynamic_home_advantage and self.games_played >= MIN_GAMES_FOR_DYNAMIC_HOME_ADV:
+            recent_hw_rate = self._recent_home_win_sum / len(self._recent_home_wins)
+            # Convert home win rate to Elo points: 50% = 0 pts, 53.5% ≈ 24.5 pts (with scale=700)
+            current_home_adv = (recent_hw_rate - 0.5) * self.home_adv_scale
+            # Clamp to reasonable range (0-70 points)
+            return max(0.0, min(70.0, current_home_adv))
+        return self.home_advantage
+
+    def play(
+        self,
+        season: str,
+        home_id: int,
+        away_id: int,
+        home_score: float,
+        away_score: float,
+        home_win: int,
+    ) -> Tuple[float, float, float]:
+        """Record a game; returns (home pre-game rating, away pre-game rating, expected home win prob)."""
+        if season != self.current_season:
+            self.ratings = dict(self._season_ratings(season))
+            self.current_season = season
+
+        home_id, away_id = int(home_id), int(away_id)
+        home_rating = self.ratings.get(home_id, self.base_rating)
+        away_rating = self.ratings.get(away_id, self.base_rating)
+
+        current_home_adv = self.current_home_advantage()
+        expected_home = 1.0 / (1.0 + 10 ** ((away_rating - (home_rating + current_home_adv)) / 400))
+
+        outcome_home = 1.0 if home_win == 1 else 0.0
+        if len(self._recent_home_wins) == self._recent_home_wins.maxlen:
+            self._recent_home_win_sum -= self._recent_home_wins[0]
+        self._recent_home_wins.append(int(home_win))
+        self._recent_home_win_sum += int(home_win)
+        self.games_played += 1
+
+        goal_diff = home_score - away_score
+        margin = max(abs(goal_diff), 1)
+        multiplier = np.log(margin + 1) * (2.2 / ((abs(home_rating - away_rating) * 0.001) + 2.2))
+        delta = self.k_factor * multiplier * (outcome_home - expected_home)
+
+        self.ratings[home_id] = home_rating + delta
+        self.ratings[away_id] = away_rating - delta
+        return home_rating, away_rating, expected_home
+
+
+# Parameters elo_ratings() accepts as 1-D arrays to evaluate several configurations in one pass
+SWEEP_PARAMETERS = ("k_factor", "home_advantage", "season_carryover", "home_adv_scale")
+
+
+def prior_home_win_rate(home_win: Sequence[int], window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    League home win rate over the (up to) `window` games before each game,
+    and the number of games played before it (NaN rate for the first game).
+    """
+    home_win = np.asarray(home_win, dtype=np.int64)
+    played = np.arange(len(home_win))
+    cumulative = np.concatenate(([0], np.cumsum(home_win)))
+    start = played - np.minimum(played, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = (cumulative[played] - cumulative[start]) / (played - start)
+    return rate, played
+
+
+def elo_ratings(
+    seasons: Sequence,
+    home_ids: Sequence[int],
+    away_ids: Sequence[int],
+    home_scores: Sequence[float],
+    away_scores: Sequence[float],
+    home_wins: Sequence[int],
+    base_rating: float = 1500.0,
+    k_factor: Union[float, Sequence[float]] = 10.0,
+    home_advantage: Union[float, Sequence[float]] = 35.0,
+    season_carryover: Union[float, Sequence[float]] = 0.5,
+    dynamic_home_advantage: bool = True,
+    home_adv_window: int = 100,
+    home_adv_scale: Union[float, Sequence[float]] = 700.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pre-game Elo for games already in chronological order, from plain arrays.
+
+    Returns (home pre-game rating, away pre-game rating, expected home win
+    prob), identical to playing every game through EloState.play(). The
+    league home win rate behind the dynamic home advantage is a cumulative-sum
+    window computed once up front.
+
+    The SWEEP_PARAMETERS may be 1-D arrays (broadcast against each other) to
+    evaluate P configurations in the same pass; each output then has shape
+    (P, n_games) instead of (n_games,).
+    """
+    params = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in
+          (k_factor, home_advantage, season_carryover, home_adv_scale))
+    )
+    batched = any(np.ndim(value) > 0 for value in (k_factor, home_advantage, season_carryover, home_adv_scale))
+    k_factor, home_advantage, season_carryover, home_adv_scale = (np.array(param) for param in params)
+    # A non-positive carryover resets every rating to the base, as in EloState
+    season_carryover = np.where(season_carryover > 0, season_carryover, 0.0)
+
+    seasons = np.asarray(seasons)
+    n_games = len(seasons)
+    new_season = np.zeros(n_games, dtype=bool)
+    new_season[1:] = seasons[1:] != seasons[:-1]
+    team_codes, teams = pd.factorize(np.concatenate([np.asarray(home_ids), np.asarray(away_ids)]))
+    home_idx, away_idx = team_codes[:n_games], team_codes[n_games:]
+
+    home_wins = np.asarray(home_wins)
+    outcomes = (home_wins == 1).astype(float)
+    margins = np.maximum(np.abs(np.asarray(home_scores, dtype=float) - np.asarray(away_scores, dtype=float)), 1)
+    unique_margins, margin_idx = np.unique(margins, return_inverse=True)
+    log_margins = np.array([np.log(margin + 1) for margin in unique_margins.tolist()])[margin_idx]
+
+    rate, played = prior_home_win_rate(home_wins, home_adv_window)
+    dynamic = dynamic_home_advantage & (played >= MIN_GAMES_FOR_DYNAMIC_HOME_ADV)
+    with np.errstate(invalid="ignore"):
+        # Convert home win rate to Elo points, clamped to a reasonable range (0-70 points)
+        scaled = np.clip((rate[:, None] - 0.5) * home_adv_scale[None, :], 0.0, 70.0)
+    home_adv = np.where(dynamic[:, None], scaled, home_advantage[None, :])
+
+    if batched:
+        home_pre, away_pre, expected = _elo_pass_batched(
+            new_season, home_idx, away_idx, outcomes, log_margins, home_adv,
+            len(teams), base_rating, k_factor, season_carryover,
+        )
+        return home_pre.T, away_pre.T, expected.T
+    return _elo_pass(
+        new_season, home_idx, away_idx, outcomes, log_margins, home_adv[:, 0],
+        len(teams), base_rating, float(k_factor[0]), float(season_carryover[0]),
+    )
+
+
+def _elo_pass(new_season, home_idx, away_idx, outcomes, log_margins, home_adv, n_teams, base_rating, k_factor, carryover):
+    """Single configuration: plain Python floats beat NumPy's per-call overhead on scalars."""
+    ratings = [base_rating] * n_teams
+    home_pre, away_pre, expected = [], [], []
+    for is_new_season, home, away, outcome, log_margin, adv in zip(
+        new_season.tolist(), home_idx.tolist(), away_idx.tolist(),
+        outcomes.tolist(), log_margins.tolist(), home_adv.tolist(),
+    ):
+        if is_new_season:
+            ratings = [base_rating + carryover * (rating - base_rating) for rating in ratings]
+        home_rating, away_rating = ratings[home], ratings[away]
+        expected_home = 1.0 / (1.0 + 10 ** ((away_rating - (home_rating + adv)) / 400))
+        multiplier = log_margin * (2.2 / ((abs(home_rating - away_rating) * 0.001) + 2.2))
+        delta = k_factor * multiplier * (outcome - expected_home)
+        ratings[home] = home_rating + delta
+        ratings[away] = away_rating - delta
+        home_pre.append(home_rating)
+        away_pre.append(away_rating)
+        expected.append(expected_home)
+    return np.array(home_pre), np.array(away_pre), np.array(expected)
+
+
+def _elo_pass_batched(new_season, home_idx, away_idx, outcomes, log_margins, home_adv, n_teams, base_rating, k_factor, carryover):
+    """P configurations at once: ratings are a (team, config) matrix, outputs (game, config)."""
+    n_games, n_configs = home_adv.shape
+    ratings = np.full((n_teams, n_configs), base_rating)
+    home_pre = np.empty((n_games, n_configs))
+    away_pre = np.empty((n_games, n_configs))
+    expected = np.empty((n_games, n_configs))
+    for game in range(n_games):
+        if new_season[game]:
+            ratings = base_rating + carryover * (ratings - base_rating)
+        home, away = home_idx[game], away_idx[game]
+        home_rating, away_rating = ratings[home].copy(), ratings[away].copy()
+        expected_home = 1.0 / (1.0 + 10 ** ((away_rating - (home_rating + home_adv[game])) / 400))
+        multiplier = log_margins[game] * (2.2 / ((np.abs(home_rating - away_rating) * 0.001) + 2.2))
+        delta = k_factor * multiplier * (outcomes[game] - expected_home)
+        ratings[home] = home_rating + delta
+        ratings[away] = away_rating - delta
+        home_pre[game] = home_rating
+        away_pre[game] = away_rating
+        expected[game] = expected_home
+    return home_pre, away_pre, expected
+
+
+@dataclass(frozen=True)
+class EloSweep:
+    """Pre-game Elo for a grid of parameter configurations over the same games."""
+
+    configs: pd.DataFrame  # one row per configuration
+    games: pd.DataFrame  # gameId, gameDate, seasonId, home_win in the order the ratings were computed
+    home_pre: np.ndarray  # (n_configs, n_games)
+    away_pre: np.ndarray
+    expected_home: np.ndarray
+
+    def summary(self, mask: Optional[Sequence[bool]] = None) -> pd.DataFrame:
+        """Accuracy, log loss and Brier score of expected_home per configuration (optionally on a subset of games)."""
+        keep = np.ones(len(self.games), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+        outcome = self.games["home_win"].to_numpy()[keep].astype(float)
+        prob = np.clip(self.expected_home[:, keep], 1e-15, 1 - 1e-15)
+        summary = self.configs.copy()
+        summary["accuracy"] = ((prob >= 0.5) == (outcome == 1)).mean(axis=1)
+        summary["log_loss"] = -(outcome * np.log(prob) + (1 - outcome) * np.log(1 - prob)).mean(axis=1)
+        summary["brier"] = ((prob - outcome) ** 2).mean(axis=1)
+        return summary
+
+
+def elo_sweep(games: pd.DataFrame, grid: Mapping[str, Sequence[float]], **fixed) -> EloSweep:
+    """
+    Evaluate every combination of `grid` values in a single chronological pass.
+
+    `grid` maps SWEEP_PARAMETERS names to candidate values; `fixed` passes any
+    other elo_ratings() keyword (base_rating, home_adv_window, ...). `games` is
+    a game frame as built by build_game_dataframe().
+    """
+    unknown = set(grid) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Cannot sweep {sorted(unknown)}; sweepable parameters are {SWEEP_PARAMETERS}")
+    configs = pd.DataFrame(list(product(*grid.values())), columns=list(grid))
+
+    games = games.sort_values(["gameDate", "gameId"], kind="stable")
+    home_pre, away_pre, expected = elo_ratings(
+        games["seasonId"].to_numpy(),
+        games["teamId_home"].to_numpy(),
+        games["teamId_away"].to_numpy(),
+        games["home_score"].to_numpy(),
+        games["away_score"].to_numpy(),
+        games["home_win"].to_numpy(),
+        **fixed,
+        **{name: configs[name].to_numpy(dtype=float) for name in grid},
+    )
+    return EloSweep(
+        configs=configs,
+        games=games[["gameId", "gameDate", "seasonId", "home_win"]].reset_index(drop=True),
+        home_pre=np.atleast_2d(home_pre),
+        away_pre=np.atleast_2d(away_pre),
+        expected_home=np.atleast_2d(expected),
+    )
@@ -0,0 +1,181 @@
+"""
+Declarative registry of engineered features and their dependencies.
+
+Each stage of the pipeline (team logs, game matchups, situational context)
+keeps a FeatureRegistry of feature families: a family is one producing
+function, the feature columns it writes, the raw input columns it reads and
+the features each output depends on. resolve() turns a requested feature list
+into a FeaturePlan holding only the families needed for its transitive
+closure, so a caller asking for the ~40 curated model features skips every
+pass whose outputs nobody reads.
+
+Output names may contain placeholders: ``rolling_win_pct_{window}`` provides
+``rolling_win_pct_10`` (``{window}`` matches digits, any other placeholder
+matches a word token).
+"""
+
+from __future__ import annotations
+
+import re
+import string
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Mapping, Optional, Sequence, Union
+
+_PLACEHOLDER_PATTERNS = {"window": r"\d+"}
+_DEFAULT_PLACEHOLDER_PATTERN = r"\w+"
+
+
+def _output_pattern(template: str) -> re.Pattern[str]:
+    parts = []
+    for literal, placeholder, _, _ in string.Formatter().parse(template):
+        parts.append(re.escape(literal))
+        if placeholder is not None:
+            pattern = _PLACEHOLDER_PATTERNS.get(placeholder, _DEFAULT_PLACEHOLDER_PATTERN)
+            parts.append(f"(?:{pattern})")
+    return re.compile("".join(parts))
+
+
+@dataclass(frozen=True)
+class FeatureFamily:
+    """Features written together by one producing function (one pass over the data)."""
+
+    name: str
+    outputs: tuple[str, ...]
+    producer: Callable
+    inputs: tuple[str, ...] = ()
+    depends: Mapping[str, tuple[str, ...]] = field(default_factory=dict)
+    _patterns: tuple[re.Pattern[str], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_patterns", tuple(_output_pattern(output) for output in self.outputs))
+
+    def output_for(self, name: str) -> Optional[str]:
+        """The declared output (template) that produces `name`, if any."""
+        for output, pattern in zip(self.outputs, self._patterns):
+            if pattern.fullmatch(name):
+                return output
+        return None
+
+    def dependencies(self, name: str) -> tuple[str, ...]:
+        """Features that must exist before this family can produce `name`."""
+        return self.depends.get(self.output_for(name), ())
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    """
+    Families to run for a feature request, in registration order.
+
+    wanted maps family name -> the outputs requested from it (dependencies
+    included), or is None when every output of every family is requested.
+    external holds names the registry does not produce: dependencies on
+    earlier stages, or requested names another stage is responsible for.
+    """
+
+    families: tuple[FeatureFamily, ...]
+    wanted: Optional[Mapping[str, frozenset[str]]] = None
+    external: frozenset[str] = frozenset()
+
+    def outputs(self, family: FeatureFamily) -> Optional[frozenset[str]]:
+        """Requested outputs of `family`, or None when all of them are."""
+        return None if self.wanted is None else self.wanted[family.name]
+
+
+class FeatureRegistry:
+    """Feature families of one pipeline stage, kept in execution order."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._families: dict[str, FeatureFamily] = {}
+
+    def register(self, family: FeatureFamily) -> FeatureFamily:
+        if family.name in self._families:
+            raise ValueError(f"{self.stage} feature family {family.name!r} is already registered")
+        self._families[family.name] = family
+        return family
+
+    def family(
+        self,
+        name: str,
+        outputs: Iterable[str],
+        inputs: Iterable[str] = (),
+        depends: Union[Sequence[str], Mapping[str, Sequence[str]], None] = None,
+    ) -> Callable[[Callable], Callable]:
+        """
+        Decorator registering the decorated function as a family's producer.
+
+        `depends` is either a mapping output -> features it reads, or a plain
+        sequence applying to every output. Families run in registration order,
+        so a family must be registered after the families it depends on.
+        """
+        outputs = tuple(outputs)
+        if depends is None:
+            depends = {}
+        elif not isinstance(depends, Mapping):
+            depends = {output: tuple(depends) for output in outputs}
+
+        def decorator(producer: Callable) -> Callable:
+            self.register(
+                FeatureFamily(
+                    name=name,
+                    outputs=outputs,
+                    producer=producer,
+                    inputs=tuple(inputs),
+                    depends={output: tuple(deps) for output, deps in depends.items()},
+                )
+            )
+            return producer
+
+        return decorator
+
+    @property
+    def families(self) -> tuple[FeatureFamily, ...]:
+        return tuple(self._families.values())
+
+    def find(self, name: str) -> Optional[FeatureFamily]:
+        """The first registered family producing `name`."""
+        for family in self._families.values():
+            if family.output_for(name) is not None:
+                return family
+        return None
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.find(name) is not None
+
+    def resolve(self, names: Optional[Iterable[str]] = None) -> FeaturePlan:
+        """
+        Plan the families needed for `names` and everything they depend on.
+
+        With names=None every family runs and produces all of its outputs.
+        """
+        if names is None:
+            return FeaturePlan(self.families)
+
+        order = {family_name: index for index, family_name in enumerate(self._families)}
+        wanted: dict[str, set[str]] = {}
+        external: set[str] = set()
+        seen: set[str] = set()
+        pending = [(name, None) for name in names]
+        while pending:
+            name, requester = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            family = self.find(name)
+            if family is None:
+                external.add(name)
+                continue
+            if requester is not None and order[family.name] > order[requester.name]:
+                raise ValueError(
+                    f"{self.stage} feature family {requester.name!r} depends on {name!r}, "
+                    f"which is produced by {family.name!r} registered after it"
+                )
+            wanted.setdefault(family.name, set()).add(name)
+            pending.extend((dependency, family) for dependency in family.dependencies(name))
+
+        families = tuple(family for family in self._families.values() if family.name in wanted)
+        return FeaturePlan(
+            families,
+            {family_name: frozenset(outputs) for family_name, outputs in wanted.items()},
+            frozenset(external),
+        )
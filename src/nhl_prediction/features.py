@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, replace
 from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Mapping, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
+from .feature_registry import FeatureRegistry
+
 ROLL_WINDOWS: Sequence[int] = (3, 5, 10)
 GOALIE_PULSE_PATH = Path(__file__).resolve().parents[2] / "web" / "src" / "data" / "goaliePulse.json"
 STARTING_GOALIE_PATH = Path(__file__).resolve().parents[2] / "web" / "src" / "data" / "startingGoalies.json"
@@ -31,44 +34,166 @@ def _lagged_rolling(group: pd.Series, window: int, min_periods: int = 1) -> pd.S
     return group.shift(1).rolling(window, min_periods=min_periods).mean()
 
 
-def _momentum_weighted_rolling(group: pd.Series, weights: list[float]) -> pd.Series:
+def _group_layout(group) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Row order that makes each group contiguous (rows keep their order within a
+    group), plus each row's position within its group in that order.
+    """
+    order = np.argsort(group.ngroup().to_numpy(), kind="stable")
+    positions = group.cumcount().to_numpy()[order]
+    return order, positions
+
+
+def _lagged_rolling_block(
+    logs: pd.DataFrame,
+    group,
+    columns: Sequence[str],
+    windows: Iterable[int],
+    min_periods: int = 1,
+) -> pd.DataFrame:
+    """
+    Lagged rolling means for many columns and windows in one vectorized pass.
+
+    Equivalent to ``group[col].transform(lambda s: _lagged_rolling(s, w))`` for
+    every (col, w): the group layout and shift are computed once, and every
+    window is a difference of per-column cumulative sums (NaNs skipped, counted
+    separately for min_periods) bounded at the group start. Returns a wide
+    frame indexed like `logs` with (column, window) MultiIndex columns.
+    """
+    windows = list(windows)
+    order, positions = _group_layout(group)
+    n = len(order)
+
+    values = logs[list(columns)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)[order]
+
+    # CRITICAL: shift by one game within the group so the current game is EXCLUDED
+    shifted = np.full_like(values, np.nan)
+    has_prior = np.flatnonzero(positions > 0)
+    shifted[has_prior] = values[has_prior - 1]
+
+    observed = ~np.isnan(shifted)
+    sums = np.zeros((n + 1, len(columns)))
+    counts = np.zeros((n + 1, len(columns)), dtype=np.int64)
+    np.cumsum(np.where(observed, shifted, 0.0), axis=0, out=sums[1:])
+    np.cumsum(observed, axis=0, out=counts[1:])
+
+    rows = np.arange(n)
+    blocks = []
+    for window in windows:
+        start = rows - np.minimum(positions, window - 1)
+        window_counts = counts[rows + 1] - counts[start]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (sums[rows + 1] - sums[start]) / window_counts
+        means[window_counts < min_periods] = np.nan
+        unsorted = np.empty_like(means)
+        unsorted[order] = means
+        blocks.append(unsorted)
+
+    return pd.DataFrame(
+        np.hstack(blocks) if blocks else np.empty((n, 0)),
+        index=logs.index,
+        columns=pd.MultiIndex.from_product([windows, list(columns)]).swaplevel(),
+    )
+
+
+# V7.0 momentum weights for the last 4 games (most recent first)
+MOMENTUM_WEIGHTS: Sequence[float] = (0.4, 0.3, 0.2, 0.1)
+
+
+def exponential_momentum_weights(window: int, decay: float) -> np.ndarray:
+    """
+    Exponentially-decayed weight vector (most recent first), normalised to sum to 1.
+
+    decay is the per-game multiplier, e.g. decay=0.7 over window=8 gives the most
+    recent game ~31% of the weight and the eighth-most-recent ~2.6%.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if not 0 < decay <= 1:
+        raise ValueError("decay must be in (0, 1]")
+    weights = decay ** np.arange(window, dtype=float)
+    return weights / weights.sum()
+
+
+def _weighted_lag_sums(
+    values: np.ndarray,
+    positions: np.ndarray,
+    weight_sets: Mapping[str, Sequence[float]],
+) -> dict[str, np.ndarray]:
+    """
+    Weighted sums of the previous len(weights) values for several weight vectors at once.
+
+    Rows must be grouped contiguously in chronological order, with `positions`
+    giving each row's index within its group. Term k of a weight vector applies
+    to the value k+1 games back (current game EXCLUDED); before the start of
+    the group the window is zero-padded, while the slot for the group's first
+    game is the NaN introduced by the lag - so, exactly like the rolling-apply
+    formulation, a row only gets a value once it has a full window of prior
+    games, and any NaN in the window propagates.
+    """
+    n = len(values)
+    totals = {name: np.zeros(n) for name in weight_sets}
+    max_window = max((len(weights) for weights in weight_sets.values()), default=0)
+
+    for k in range(max_window):
+        lagged = np.zeros(n)
+        lagged[positions == k] = np.nan
+        has_value = np.flatnonzero(positions > k)
+        lagged[has_value] = values[has_value - (k + 1)]
+
+        for name, weights in weight_sets.items():
+            if k < len(weights):
+                totals[name] += lagged * weights[k]
+
+    return totals
+
+
+def _momentum_weighted_rolling(group: pd.Series, weights: Sequence[float]) -> pd.Series:
     """
     Compute momentum-weighted rolling average using ONLY prior games.
 
     Weights recent games more heavily to capture hot/cold streaks.
     Default weights: [0.4, 0.3, 0.2, 0.1] for last 4 games.
 
-    CRITICAL: .shift(1) ensures current game is EXCLUDED (pre-game only).
+    CRITICAL: the current game is EXCLUDED (pre-game only).
 
     Args:
-        group: Series of values to compute weighted average over
+        group: Series of values (one team-season, chronological)
         weights: Weight vector (most recent first), e.g., [0.4, 0.3, 0.2, 0.1]
 
     Returns:
         Series of momentum-weighted averages
     """
-    window = len(weights)
-    shifted = group.shift(1)  # CRITICAL: exclude current game
-
-    def weighted_avg(values):
-        """Apply weights to rolling window."""
-        if len(values) < 1:
-            return 0.0
-        # Pad if not enough history
-        if len(values) < window:
-            # Pad front with zeros
-            padded = [0.0] * (window - len(values)) + list(values)
-        else:
-            padded = list(values[-window:])
+    values = np.asarray(group, dtype=float)
+    sums = _weighted_lag_sums(values, np.arange(len(values)), {"momentum": weights})
+    return pd.Series(sums["momentum"], index=group.index)
 
-        # Reverse so most recent is first (matches weight order)
-        padded_reversed = list(reversed(padded))
 
-        # Compute weighted average
-        return sum(v * w for v, w in zip(padded_reversed, weights))
+def _momentum_features(
+    logs: pd.DataFrame,
+    group,
+    columns: Mapping[str, str],
+    weight_sets: Mapping[str, Sequence[float]],
+) -> dict[str, pd.Series]:
+    """
+    Momentum-weighted rolling features for every team-season in one vectorized pass.
 
-    return shifted.rolling(window, min_periods=1).apply(weighted_avg, raw=False)
+    Produces one feature per (column, weight set) named ``{prefix}_{suffix}``,
+    where `columns` maps prefix -> source column and `weight_sets` maps
+    suffix -> weight vector. Columns missing from `logs` are skipped.
+    """
+    order, positions = _group_layout(group)
 
+    features: dict[str, pd.Series] = {}
+    for prefix, column in columns.items():
+        if column not in logs.columns:
+            continue
+        values = pd.to_numeric(logs[column], errors="coerce").to_numpy(dtype=float)[order]
+        for suffix, sums in _weighted_lag_sums(values, positions, weight_sets).items():
+            result = np.empty(len(sums))
+            result[order] = sums
+            features[f"{prefix}_{suffix}"] = pd.Series(result, index=logs.index)
+    return features
 
 
 ALTITUDE_FEET_BY_TEAM: dict[int, float] = {
@@ -109,14 +234,57 @@ ALTITUDE_FEET_BY_TEAM: dict[int, float] = {
 HIGH_ALTITUDE_THRESHOLD = 2000.0
 
 
+def _as_flags(series: pd.Series) -> np.ndarray:
+    """Boolean array of a series' truthiness, with NaN counted as False."""
+    values = series.to_numpy()
+    return pd.notna(values) & values.astype(bool)
+
+
+def _lagged_run_lengths(flags: np.ndarray, positions: np.ndarray, cap: Optional[int] = None) -> np.ndarray:
+    """
+    Pre-game streak lengths for boolean columns of a group-contiguous 2-D array.
+
+    Row i gets the number of consecutive True values in the rows before it in
+    the same group (positions gives each row's index within its group). A run's
+    length is the cumulative count minus the count at the last reset - a False
+    value or the start of the group - and the result is shifted one row within
+    the group so the current game is excluded.
+    """
+    flags = flags.astype(bool)
+    counts = np.cumsum(flags, axis=0)
+    resets = np.where(flags, -1, counts)
+    group_start = positions == 0
+    resets[group_start] = counts[group_start] - flags[group_start]
+    runs = counts - np.maximum.accumulate(resets, axis=0)
+
+    lagged = np.zeros_like(runs)
+    has_prior = np.flatnonzero(positions > 0)
+    lagged[has_prior] = runs[has_prior - 1]
+    if cap is not None:
+        lagged = np.minimum(lagged, cap)
+    return lagged
+
+
+def _lagged_streaks(group, flags: Mapping[str, pd.Series], cap: Optional[int] = None) -> pd.DataFrame:
+    """
+    Pre-game streak counts for several boolean series in one vectorized pass.
+
+    `flags` maps output column -> boolean series aligned with the grouped frame
+    (NaN counts as False). With cap=N, streaks are capped at N games.
+    """
+    order, positions = _group_layout(group)
+    index = next(iter(flags.values())).index
+    matrix = np.column_stack([_as_flags(series) for series in flags.values()])
+    lagged = _lagged_run_lengths(matrix[order], positions, cap)
+    result = np.empty_like(lagged)
+    result[order] = lagged
+    return pd.DataFrame(result, index=index, columns=list(flags))
+
+
 def _lagged_streak(series: pd.Series) -> pd.Series:
     """Count consecutive True values observed before the current game."""
-    streaks: list[int] = []
-    current = 0
-    for value in series.fillna(False):
-        streaks.append(current)
-        current = current + 1 if value else 0
-    return pd.Series(streaks, index=series.index)
+    lagged = _lagged_run_lengths(_as_flags(series)[:, None], np.arange(len(series)))
+    return pd.Series(lagged[:, 0], index=series.index)
 
 
 @lru_cache(maxsize=1)
@@ -175,7 +343,7 @@ def _load_player_injuries() -> dict[str, int]:
 
 def _add_h2h_features(logs: pd.DataFrame, lookback: int = 10) -> pd.DataFrame:
     """
-    Add head-to-head matchup history features - OPTIMIZED VERSION.
+    Add head-to-head matchup history features.
 
     For each game, computes stats from the last N games between the two teams.
     Only uses games that occurred BEFORE the current game (no future leakage).
@@ -183,89 +351,122 @@ def _add_h2h_features(logs: pd.DataFrame, lookback: int = 10) -> pd.DataFrame:
     Features:
     - h2h_win_pct: Win percentage in last N games vs this opponent
     - h2h_goal_diff: Average goal differential in last N games vs this opponent
-    - h2h_games_played: Number of games played vs this opponent in history
-    """
-    logs = logs.copy()
-
-    # Initialize H2H features with neutral prior
-    logs["h2h_win_pct"] = 0.5
-    logs["h2h_goal_diff"] = 0.0
-    logs["h2h_games_played"] = 0
-
-    # Sort chronologically to ensure proper ordering
-    logs = logs.sort_values(["season", "gameDate"]).reset_index(drop=True)
-
-    # Create a matchup identifier (sorted team abbrevs to handle both home/away)
-    def get_matchup_key(row):
-        teams = sorted([row["teamAbbrev"], row["opponentTeamAbbrev"]])
-        return f"{teams[0]}_vs_{teams[1]}"
-
-    logs["matchup_key"] = logs.apply(get_matchup_key, axis=1)
-
-    # Group by matchup and process each group independently
-    for matchup_key, group in logs.groupby("matchup_key"):
-        if len(group) < 2:
-            continue  # Skip if only one game between these teams
-
-        indices = group.index.tolist()
-
-        # For each game in this matchup
-        for i, idx in enumerate(indices):
-            if i == 0:
-                continue  # First game has no history
-
-            # Get previous games in this matchup
-            prev_indices = indices[:i]
-            prev_games = logs.loc[prev_indices].tail(lookback)
-
-            current_team = logs.loc[idx, "teamAbbrev"]
-
-            # Calculate H2H stats from perspective of current team
-            h2h_wins = 0
-            h2h_goal_diffs = []
-
-            for prev_idx in prev_games.index:
-                prev_team = logs.loc[prev_idx, "teamAbbrev"]
-                prev_win = logs.loc[prev_idx, "win"]
-                prev_goal_diff = logs.loc[prev_idx, "goal_diff"]
-
-                if prev_team == current_team:
-                    # Current team was "team" in previous game
-                    if prev_win == 1:
-                        h2h_wins += 1
-                    h2h_goal_diffs.append(prev_goal_diff)
-                else:
-                    # Current team was "opponent" in previous game - flip result
-                    if prev_win == 0:
-                        h2h_wins += 1
-                    h2h_goal_diffs.append(-prev_goal_diff)
-
-            # Update H2H features
-            games_count = len(prev_games)
-            logs.loc[idx, "h2h_win_pct"] = h2h_wins / games_count if games_count > 0 else 0.5
-            logs.loc[idx, "h2h_goal_diff"] = sum(h2h_goal_diffs) / games_count if h2h_goal_diffs else 0.0
-            logs.loc[idx, "h2h_games_played"] = games_count
-
-    # Drop temporary column
-    logs = logs.drop(columns=["matchup_key"])
+    - h2h_games_played: Number of games played vs this opponent in history (capped at N)
 
-    return logs
+    Each game is scored once from the perspective of the alphabetically-first
+    team of the matchup; windowed sums over prior games come from cumulative
+    sums over the matchup-sorted game list, and each team row reads them back
+    through a perspective sign. Rows keep their order and index.
+    """
+    team = logs["teamAbbrev"].fillna("").astype(str)
+    opponent = logs["opponentTeamAbbrev"].fillna("").astype(str)
+    first_is_team = (team <= opponent).to_numpy()
+    sign = np.where(first_is_team, 1.0, -1.0)
+
+    # One row per game, from the first team's perspective
+    first_goal_diff = sign * pd.to_numeric(logs["goal_diff"], errors="coerce").fillna(0.0).to_numpy()
+    games = pd.DataFrame({
+        "gameId": logs["gameId"].to_numpy(),
+        "gameDate": logs["gameDate"].to_numpy(),
+        "matchup": np.where(first_is_team, team + "_vs_" + opponent, opponent + "_vs_" + team),
+        "first_win": (first_goal_diff > 0).astype(float),
+        "first_goal_diff": first_goal_diff,
+    }).drop_duplicates("gameId")
+    games = games.sort_values(["matchup", "gameDate", "gameId"], kind="stable").reset_index(drop=True)
+
+    positions = games.groupby("matchup", sort=False).cumcount().to_numpy()
+    rows = np.arange(len(games))
+    start = rows - np.minimum(positions, lookback)
+    win_sums = np.concatenate([[0.0], np.cumsum(games["first_win"].to_numpy())])
+    diff_sums = np.concatenate([[0.0], np.cumsum(games["first_goal_diff"].to_numpy())])
+    prior_games = rows - start
+    prior_wins = win_sums[rows] - win_sums[start]
+    prior_diff = diff_sums[rows] - diff_sums[start]
+
+    # Back to team rows, flipping results for the second team of the matchup
+    game_rows = pd.Index(games["gameId"]).get_indexer(logs["gameId"])
+    n_games = prior_games[game_rows]
+    wins = np.where(first_is_team, prior_wins[game_rows], n_games - prior_wins[game_rows])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_pct = np.where(n_games > 0, wins / n_games, 0.5)
+        goal_diff = np.where(n_games > 0, sign * prior_diff[game_rows] / n_games, 0.0)
+
+    return logs.assign(
+        h2h_win_pct=win_pct,
+        h2h_goal_diff=goal_diff,
+        h2h_games_played=n_games.astype(int),
+    )
 
 
-def engineer_team_features(logs: pd.DataFrame, rolling_windows: Iterable[int] = ROLL_WINDOWS) -> pd.DataFrame:
-    """
-    Create lagged features using ONLY information available BEFORE each game.
+# Lagged rolling means: (feature name template, source column, divisor).
+# Features whose source column is missing from the logs are skipped.
+ROLLING_FEATURE_SPECS: Sequence[tuple[str, str, float]] = (
+    # Core stats
+    ("rolling_win_pct_{window}", "win", 1.0),
+    ("rolling_goal_diff_{window}", "goal_diff", 1.0),
+    # Faceoffs (CRITICAL PREDICTOR)
+    ("rolling_faceoff_{window}", "faceoffWinPct", 100.0),
+    # Shots
+    ("shotsFor_roll_{window}", "shotsForPerGame", 1.0),
+    ("shotsAgainst_roll_{window}", "shotsAgainstPerGame", 1.0),
+    # xGoals rolling (NEW - using MoneyPuck data!)
+    ("rolling_xg_for_{window}", "xGoalsFor", 1.0),
+    ("rolling_xg_against_{window}", "xGoalsAgainst", 1.0),
+    ("rolling_xg_diff_{window}", "xg_diff", 1.0),
+    # Possession metrics rolling (NEW)
+    ("rolling_corsi_{window}", "corsiPercentage", 100.0),
+    ("rolling_fenwick_{window}", "fenwickPercentage", 100.0),
+    # High danger shots rolling (NEW)
+    ("rolling_high_danger_shots_{window}", "highDangerShotsFor", 1.0),
+    # Rebound stats rolling (NEW)
+    ("rolling_rebounds_for_{window}", "reboundsFor", 1.0),
+    ("rolling_rebound_goals_{window}", "reboundGoalsFor", 1.0),
+    # Penalty stats rolling (NEW)
+    ("rolling_penalty_diff_{window}", "penaltyDifferential", 1.0),
+    ("rolling_penalty_minutes_{window}", "penaltyMinutes", 1.0),
+    # Rush stats rolling (NEW - MoneyPuck-inspired)
+    ("rolling_rush_shots_{window}", "rushShotsFor", 1.0),
+    ("rolling_rush_goals_{window}", "rushGoalsFor", 1.0),
+    # High danger xG rolling (NEW - more refined than just shots)
+    ("rolling_hd_xg_for_{window}", "highDangerxGoalsFor", 1.0),
+    ("rolling_hd_xg_against_{window}", "highDangerxGoalsAgainst", 1.0),
+    # Turnover differential rolling (NEW)
+    ("rolling_turnover_diff_{window}", "turnover_diff", 1.0),
+    # Goaltending rolling (NEW - Season aggregate gets rolling average for stability)
+    ("rolling_save_pct_{window}", "team_save_pct", 1.0),
+    ("rolling_gsax_{window}", "team_gsax_per_60", 1.0),
+    ("rolling_goalie_save_pct_{window}", "goalie_save_pct_game", 1.0),
+    ("rolling_goalie_xg_saved_{window}", "goalie_xg_saved", 1.0),
+    ("rolling_goalie_shots_faced_{window}", "goalie_shots_faced", 1.0),
+    # Special teams
+    ("rolling_powerPlayPct_{window}", "powerPlayPct", 1.0),
+    ("rolling_penaltyKillPct_{window}", "penaltyKillPct", 1.0),
+    ("rolling_powerPlayNetPct_{window}", "powerPlayNetPct", 1.0),
+    ("rolling_penaltyKillNetPct_{window}", "penaltyKillNetPct", 1.0),
+    ("rolling_seasonPointPct_{window}", "seasonPointPct", 1.0),
+    ("rolling_specialTeamEdge_{window}", "specialTeamEdge", 1.0),
+)
+
+
+# V7.0 momentum-weighted features: feature prefix -> source column
+MOMENTUM_COLUMNS: Mapping[str, str] = {
+    "momentum_xg_for": "xGoalsFor",
+    "momentum_xg_against": "xGoalsAgainst",
+    "momentum_goal_diff": "goal_diff",
+    "momentum_high_danger_shots": "highDangerShotsFor",
+    "momentum_win_rate": "win",
+}
 
-    **CRITICAL FOR LIVE PREDICTION:**
-    - All features use .shift(1) to exclude current game
-    - No future information leaks into features
-    - Early-season games get zeros/NaNs (expected - no history)
 
-    For predicting upcoming games, this ensures we only use data that would
-    actually be known before puck drop.
+def derive_game_stats(logs: pd.DataFrame) -> pd.DataFrame:
     """
-    logs = logs.copy()
+    Per-game (row-local) stats that the lagged features are built from.
 
+    Coerces numeric columns and adds goal_diff, win, xG differentials,
+    special-teams and goaltending game stats, turnover_diff, is_home and
+    shot_margin. Nothing here looks at other games, so new rows can be derived
+    on their own (see team_state.TeamStateStore). Modifies and returns `logs`.
+    """
     # Ensure numeric types
     numeric_columns = [
         "goalsFor",
@@ -333,30 +534,6 @@ def engineer_team_features(logs: pd.DataFrame, rolling_windows: Iterable[int] =
     if "highDangerxGoalsFor" in logs.columns and "xGoalsFor" in logs.columns:
         logs["high_danger_xg_share"] = logs["highDangerxGoalsFor"] / logs["xGoalsFor"].replace(0, np.nan)
 
-    # CRITICAL: Sort chronologically for proper lagging
-    logs.sort_values(["teamId", "seasonId", "gameDate", "gameId"], inplace=True)
-
-    # Group by team-season for cumulative and rolling stats
-    group = logs.groupby(["teamId", "seasonId"], sort=False)
-    
-    # Games played BEFORE current game
-    logs["games_played_prior"] = group.cumcount()
-
-    # Season-to-date averages (LAGGED - excludes current game)
-    denom = logs["games_played_prior"].replace(0, np.nan)
-    logs["season_win_pct"] = group["win"].cumsum().shift(1) / denom
-    logs["season_goal_diff_avg"] = group["goal_diff"].cumsum().shift(1) / denom
-    
-    # xGoals season averages
-    if "xGoalsFor" in logs.columns:
-        logs["season_xg_for_avg"] = group["xGoalsFor"].cumsum().shift(1) / denom
-        logs["season_xg_against_avg"] = group["xGoalsAgainst"].cumsum().shift(1) / denom
-        logs["season_xg_diff_avg"] = logs["season_xg_for_avg"] - logs["season_xg_against_avg"]
-
-    # Rest metrics (TRULY PRE-GAME: based on schedule)
-    logs["rest_days"] = group["gameDate"].diff().dt.days
-    logs["is_b2b"] = logs["rest_days"].fillna(10).le(1).astype(int)
-
     # Special teams signal (power play vs penalty kill)
     special_cols = [
         "powerPlayPct",
@@ -372,62 +549,6 @@ def engineer_team_features(logs: pd.DataFrame, rolling_windows: Iterable[int] =
             logs[special_col] = 0.0
     logs["specialTeamEdge"] = logs["powerPlayPct"] - logs["penaltyKillPct"]
 
-    # Altitude signals
-    avg_altitude = np.mean(list(ALTITUDE_FEET_BY_TEAM.values()))
-    logs["team_altitude_ft"] = logs["teamId"].map(ALTITUDE_FEET_BY_TEAM).fillna(0.0)
-    logs["altitude_diff"] = logs["team_altitude_ft"] - avg_altitude
-    logs["is_high_altitude"] = (logs["team_altitude_ft"] >= HIGH_ALTITUDE_THRESHOLD).astype(int)
-
-    # Line chemistry signals
-    for line_col in [
-        "lineTopTrioSeconds",
-        "lineTopPairSeconds",
-        "lineForwardConcentration",
-        "lineDefenseConcentration",
-        "lineForwardContinuity",
-        "lineDefenseContinuity",
-    ]:
-        if line_col in logs.columns:
-            logs[line_col] = pd.to_numeric(logs[line_col], errors="coerce").fillna(0.0)
-        else:
-            logs[line_col] = 0.0
-    logs["line_top_trio_min"] = logs["lineTopTrioSeconds"] / 60.0
-    logs["line_top_pair_min"] = logs["lineTopPairSeconds"] / 60.0
-    logs["line_forward_balance"] = logs["lineForwardConcentration"] - logs["lineDefenseConcentration"]
-    logs["line_defense_balance"] = logs["lineDefenseConcentration"] - logs["lineForwardConcentration"]
-
-    # Goalie pulse projections
-    starting_map = _load_starting_goalies()
-    team_abbrevs = logs["teamAbbrev"].fillna("").str.upper()
-    logs["goalie_confirmed_start"] = team_abbrevs.map(
-        lambda abbr: float(bool(starting_map.get(abbr, {}).get("confirmedStart")))
-    )
-    logs["goalie_injury_flag"] = team_abbrevs.map(
-        lambda abbr: float(bool(starting_map.get(abbr, {}).get("statusCode")))
-    )
-    injury_map = _load_player_injuries()
-    logs["team_injury_count"] = team_abbrevs.map(
-        lambda abbr: float(injury_map.get(abbr, 0))
-    )
-    home_injury_count = logs.groupby(["gameId", "homeRoad"]).cumcount()  # dummy to avoid lint
-    # We'll derive home/away by looking at homeRoad; replicates near original
-
-    # Goalie pulse projections
-    pulse_map = _load_goalie_pulse()
-    team_abbrevs = logs["teamAbbrev"].fillna("").str.upper()
-    logs["goalie_start_likelihood"] = team_abbrevs.map(
-        lambda abbr: pulse_map.get(abbr, {}).get("startLikelihood", 0.0)
-    )
-    logs["goalie_rest_days"] = team_abbrevs.map(
-        lambda abbr: pulse_map.get(abbr, {}).get("restDays", 0.0)
-    )
-    logs["goalie_rolling_gsa"] = team_abbrevs.map(
-        lambda abbr: pulse_map.get(abbr, {}).get("rollingGsa", 0.0)
-    )
-    logs["goalie_trend_score"] = team_abbrevs.map(
-        lambda abbr: pulse_map.get(abbr, {}).get("trendScore", 0.0)
-    )
-
     # Goaltender derived stats
     if {"goalieShotsFaced", "goalieGoalsAllowed", "goalieXgAllowed"}.issubset(logs.columns):
         logs["goalie_save_pct_game"] = (
@@ -441,220 +562,17 @@ def engineer_team_features(logs: pd.DataFrame, rolling_windows: Iterable[int] =
         logs["goalie_xg_saved"] = 0.0
         logs["goalie_shots_faced"] = 0.0
 
-    # Venue streaks derived from schedule (pre-game counts)
-    logs["is_home"] = logs["homeRoad"].eq("H")
-    logs["consecutive_home_prior"] = group["is_home"].transform(_lagged_streak)
-    logs["consecutive_away_prior"] = group["is_home"].transform(
-        lambda series: _lagged_streak(~series)
-    )
-    logs["travel_burden"] = logs["consecutive_away_prior"].clip(lower=0)
-
-    # Win/loss streaks (pre-game)
-    logs["consecutive_wins_prior"] = group["win"].transform(_lagged_streak)
-    logs["consecutive_losses_prior"] = group["win"].transform(
-        lambda series: _lagged_streak(~series.astype(bool))
-    )
-
-    # Head-to-head matchup history (pre-game only) - TEMPORARILY DISABLED FOR TESTING
-    # logs = _add_h2h_features(logs)
-
-    # Rolling statistics (ALL LAGGED)
-    roll_features: dict[str, pd.Series] = {}
-    
-    for window in rolling_windows:
-        # Core stats
-        roll_features[f"rolling_win_pct_{window}"] = group["win"].transform(
-            lambda s, w=window: _lagged_rolling(s, w)
-        )
-        roll_features[f"rolling_goal_diff_{window}"] = group["goal_diff"].transform(
-            lambda s, w=window: _lagged_rolling(s, w)
-        )
-        
-        # Faceoffs (CRITICAL PREDICTOR)
-        roll_features[f"rolling_faceoff_{window}"] = group["faceoffWinPct"].transform(
-            lambda s, w=window: _lagged_rolling(s, w)
-        ) / 100.0
-        
-        # Shots
-        roll_features[f"shotsFor_roll_{window}"] = group["shotsForPerGame"].transform(
-            lambda s, w=window: _lagged_rolling(s, w)
-        )
-        roll_features[f"shotsAgainst_roll_{window}"] = group["shotsAgainstPerGame"].transform(
-            lambda s, w=window: _lagged_rolling(s, w)
-        )
-        
-        # xGoals rolling (NEW - using MoneyPuck data!)
-        if "xGoalsFor" in logs.columns:
-            roll_features[f"rolling_xg_for_{window}"] = group["xGoalsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-            roll_features[f"rolling_xg_against_{window}"] = group["xGoalsAgainst"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-            roll_features[f"rolling_xg_diff_{window}"] = group["xg_diff"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        
-        # Possession metrics rolling (NEW)
-        if "corsiPercentage" in logs.columns:
-            roll_features[f"rolling_corsi_{window}"] = group["corsiPercentage"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            ) / 100.0
-
-        if "fenwickPercentage" in logs.columns:
-            roll_features[f"rolling_fenwick_{window}"] = group["fenwickPercentage"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            ) / 100.0
-
-        # High danger shots rolling (NEW)
-        if "highDangerShotsFor" in logs.columns:
-            roll_features[f"rolling_high_danger_shots_{window}"] = group["highDangerShotsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-
-        # Rebound stats rolling (NEW)
-        if "reboundsFor" in logs.columns:
-            roll_features[f"rolling_rebounds_for_{window}"] = group["reboundsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "reboundGoalsFor" in logs.columns:
-            roll_features[f"rolling_rebound_goals_{window}"] = group["reboundGoalsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-
-        # Penalty stats rolling (NEW)
-        if "penaltyDifferential" in logs.columns:
-            roll_features[f"rolling_penalty_diff_{window}"] = group["penaltyDifferential"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "penaltyMinutes" in logs.columns:
-            roll_features[f"rolling_penalty_minutes_{window}"] = group["penaltyMinutes"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-
-        # Rush stats rolling (NEW - MoneyPuck-inspired)
-        if "rushShotsFor" in logs.columns:
-            roll_features[f"rolling_rush_shots_{window}"] = group["rushShotsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "rushGoalsFor" in logs.columns:
-            roll_features[f"rolling_rush_goals_{window}"] = group["rushGoalsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-
-        # High danger xG rolling (NEW - more refined than just shots)
-        if "highDangerxGoalsFor" in logs.columns:
-            roll_features[f"rolling_hd_xg_for_{window}"] = group["highDangerxGoalsFor"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "highDangerxGoalsAgainst" in logs.columns:
-            roll_features[f"rolling_hd_xg_against_{window}"] = group["highDangerxGoalsAgainst"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-
-        # Turnover differential rolling (NEW)
-        if "takeaways" in logs.columns and "giveaways" in logs.columns:
-            logs["turnover_diff"] = logs["takeaways"] - logs["giveaways"]
-            roll_features[f"rolling_turnover_diff_{window}"] = group["turnover_diff"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-
-        # Goaltending rolling (NEW - Season aggregate gets rolling average for stability)
-        if "team_save_pct" in logs.columns:
-            roll_features[f"rolling_save_pct_{window}"] = group["team_save_pct"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        
-        if "team_gsax_per_60" in logs.columns:
-            roll_features[f"rolling_gsax_{window}"] = group["team_gsax_per_60"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "goalie_save_pct_game" in logs.columns:
-            roll_features[f"rolling_goalie_save_pct_{window}"] = group["goalie_save_pct_game"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "goalie_xg_saved" in logs.columns:
-            roll_features[f"rolling_goalie_xg_saved_{window}"] = group["goalie_xg_saved"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        if "goalie_shots_faced" in logs.columns:
-            roll_features[f"rolling_goalie_shots_faced_{window}"] = group["goalie_shots_faced"].transform(
-                lambda s, w=window: _lagged_rolling(s, w)
-            )
-        for special_col in [
-            "powerPlayPct",
-            "penaltyKillPct",
-            "powerPlayNetPct",
-            "penaltyKillNetPct",
-            "seasonPointPct",
-            "specialTeamEdge",
-        ]:
-            if special_col in logs.columns:
-                roll_features[f"rolling_{special_col}_{window}"] = group[special_col].transform(
-                    lambda s, w=window: _lagged_rolling(s, w)
-                )
-
-    logs = logs.assign(**roll_features)
-
-    # V7.0: Momentum-weighted rolling features (weights recent games more heavily)
-    # Using [0.4, 0.3, 0.2, 0.1] weights for last 4 games
-    MOMENTUM_WEIGHTS = [0.4, 0.3, 0.2, 0.1]
-    momentum_features: dict[str, pd.Series] = {}
-
-    # Core momentum features (highest impact)
-    if "xGoalsFor" in logs.columns:
-        momentum_features["momentum_xg_for_4"] = group["xGoalsFor"].transform(
-            lambda s: _momentum_weighted_rolling(s, MOMENTUM_WEIGHTS)
-        )
-        momentum_features["momentum_xg_against_4"] = group["xGoalsAgainst"].transform(
-            lambda s: _momentum_weighted_rolling(s, MOMENTUM_WEIGHTS)
-        )
-
-    momentum_features["momentum_goal_diff_4"] = group["goal_diff"].transform(
-        lambda s: _momentum_weighted_rolling(s, MOMENTUM_WEIGHTS)
-    )
-
-    if "highDangerShotsFor" in logs.columns:
-        momentum_features["momentum_high_danger_shots_4"] = group["highDangerShotsFor"].transform(
-            lambda s: _momentum_weighted_rolling(s, MOMENTUM_WEIGHTS)
-        )
-
-    momentum_features["momentum_win_rate_4"] = group["win"].transform(
-        lambda s: _momentum_weighted_rolling(s, MOMENTUM_WEIGHTS)
-    )
-
-    logs = logs.assign(**momentum_features)
+    if "takeaways" in logs.columns and "giveaways" in logs.columns:
+        logs["turnover_diff"] = logs["takeaways"] - logs["giveaways"]
 
-    # Shot margin trends
+    logs["is_home"] = logs["homeRoad"].eq("H")
     logs["shot_margin"] = logs["shotsForPerGame"] - logs["shotsAgainstPerGame"]
-    team_group = logs.groupby(["teamId", "seasonId"], sort=False)
-    logs["shot_margin_last_game"] = team_group["shot_margin"].shift(1)
-    logs["season_shot_margin"] = team_group["shot_margin"].transform(
-        lambda s: s.shift(1).expanding(min_periods=1).mean()
-    )
+    return logs
 
-    # Momentum indicators (recent vs season average)
-    logs["momentum_win_pct"] = logs["rolling_win_pct_5"] - logs["season_win_pct"]
-    logs["momentum_goal_diff"] = logs["rolling_goal_diff_5"] - logs["season_goal_diff_avg"]
-    logs["momentum_shot_margin"] = logs["shot_margin_last_game"] - logs["season_shot_margin"]
-    
-    # xGoals momentum (NEW)
-    if "rolling_xg_diff_5" in logs.columns and "season_xg_diff_avg" in logs.columns:
-        logs["momentum_xg"] = logs["rolling_xg_diff_5"] - logs["season_xg_diff_avg"]
 
-    # Schedule congestion indicators (PRE-GAME: based on known schedule)
-    gap = logs.groupby("teamId", sort=False)["rest_days"]
-    recent_one_day = gap.transform(lambda s: s.fillna(10).le(1).astype(int))
-    logs["games_last_3d"] = (recent_one_day + recent_one_day.shift(1).fillna(0)).clip(0, 3)
-    recent_two_day = gap.transform(lambda s: s.fillna(10).le(2).astype(int))
-    logs["games_last_6d"] = (
-        recent_two_day
-        + recent_two_day.shift(1).fillna(0)
-        + recent_two_day.shift(2).fillna(0)
-        + recent_two_day.shift(3).fillna(0)
-    ).clip(0, 4)
-
-    # List of ALL features (for fillna)
+def _filled_feature_columns(columns: Iterable[str], rolling_windows: Iterable[int]) -> list[str]:
+    """Engineered features whose missing values (no history yet) are filled with 0."""
+    columns = set(columns)
     feature_cols = [
         "season_win_pct",
         "season_goal_diff_avg",
@@ -723,14 +641,11 @@ def engineer_team_features(logs: pd.DataFrame, rolling_windows: Iterable[int] =
         ]
     )
     
-    # Add xGoals features if available
-    if "season_xg_for_avg" in logs.columns:
-        feature_cols.extend([
-            "season_xg_for_avg",
-            "season_xg_against_avg",
-            "season_xg_diff_avg",
-            "momentum_xg",
-        ])
+    # Add xGoals features if available (each on its own: a partial build may
+    # compute only some of them)
+    for column in ("season_xg_for_avg", "season_xg_against_avg", "season_xg_diff_avg", "momentum_xg"):
+        if column in columns:
+            feature_cols.append(column)
 
     # Add rolling window features
     for window in rolling_windows:
@@ -743,42 +658,375 @@ def engineer_team_features(logs: pd.DataFrame, rolling_windows: Iterable[int] =
         ])
         
         # xGoals rolling
-        if f"rolling_xg_for_{window}" in logs.columns:
-            feature_cols.extend([
-                f"rolling_xg_for_{window}",
-                f"rolling_xg_against_{window}",
-                f"rolling_xg_diff_{window}",
-            ])
+        for column in (f"rolling_xg_for_{window}", f"rolling_xg_against_{window}", f"rolling_xg_diff_{window}"):
+            if column in columns:
+                feature_cols.append(column)
         
         # Possession rolling
-        if f"rolling_corsi_{window}" in logs.columns:
+        if f"rolling_corsi_{window}" in columns:
             feature_cols.append(f"rolling_corsi_{window}")
-        if f"rolling_fenwick_{window}" in logs.columns:
+        if f"rolling_fenwick_{window}" in columns:
             feature_cols.append(f"rolling_fenwick_{window}")
         
         # High danger rolling
-        if f"rolling_high_danger_shots_{window}" in logs.columns:
+        if f"rolling_high_danger_shots_{window}" in columns:
             feature_cols.append(f"rolling_high_danger_shots_{window}")
 
         # Rebound rolling
-        if f"rolling_rebounds_for_{window}" in logs.columns:
+        if f"rolling_rebounds_for_{window}" in columns:
             feature_cols.append(f"rolling_rebounds_for_{window}")
-        if f"rolling_rebound_goals_{window}" in logs.columns:
+        if f"rolling_rebound_goals_{window}" in columns:
             feature_cols.append(f"rolling_rebound_goals_{window}")
 
         # Penalty rolling
-        if f"rolling_penalty_diff_{window}" in logs.columns:
+        if f"rolling_penalty_diff_{window}" in columns:
             feature_cols.append(f"rolling_penalty_diff_{window}")
-        if f"rolling_penalty_minutes_{window}" in logs.columns:
+        if f"rolling_penalty_minutes_{window}" in columns:
             feature_cols.append(f"rolling_penalty_minutes_{window}")
 
         # Goaltending rolling
-        if f"rolling_save_pct_{window}" in logs.columns:
+        if f"rolling_save_pct_{window}" in columns:
             feature_cols.append(f"rolling_save_pct_{window}")
-        if f"rolling_gsax_{window}" in logs.columns:
+        if f"rolling_gsax_{window}" in columns:
             feature_cols.append(f"rolling_gsax_{window}")
+    return feature_cols
+
+
+# Team-stage feature families, registered in execution order. Producers take
+# (logs, ctx) and return logs with their features added; engineer_team_features
+# runs the ones a feature request needs.
+TEAM_FEATURES = FeatureRegistry("team")
+
+
+@dataclass(frozen=True)
+class _TeamFeatureContext:
+    group: Any  # logs grouped by (teamId, seasonId), chronologically sorted
+    rolling_windows: Sequence[int]
+    momentum_weights: Mapping[str, Sequence[float]]
+    wanted: Optional[frozenset[str]] = None  # None = every output of the family
+
+    def wants(self, name: str) -> bool:
+        return self.wanted is None or name in self.wanted
+
+
+def _requested_windows(names: Iterable[str]) -> list[int]:
+    """Rolling windows referenced by rolling feature names (``*_{window}``)."""
+    return sorted({int(name.rsplit("_", 1)[1]) for name in names if name.rsplit("_", 1)[-1].isdigit()})
+
+
+@TEAM_FEATURES.family(
+    "season_averages",
+    outputs=("games_played_prior", "season_win_pct", "season_goal_diff_avg"),
+    depends={"season_win_pct": ("games_played_prior",), "season_goal_diff_avg": ("games_played_prior",)},
+)
+def _season_averages(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Games played BEFORE current game
+    logs["games_played_prior"] = ctx.group.cumcount()
+
+    # Season-to-date averages (LAGGED - excludes current game)
+    denom = logs["games_played_prior"].replace(0, np.nan)
+    logs["season_win_pct"] = ctx.group["win"].cumsum().shift(1) / denom
+    logs["season_goal_diff_avg"] = ctx.group["goal_diff"].cumsum().shift(1) / denom
+    return logs
+
+
+@TEAM_FEATURES.family(
+    "season_xg_averages",
+    outputs=("season_xg_for_avg", "season_xg_against_avg", "season_xg_diff_avg"),
+    inputs=("xGoalsFor", "xGoalsAgainst"),
+    depends=("games_played_prior",),
+)
+def _season_xg_averages(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    denom = logs["games_played_prior"].replace(0, np.nan)
+    logs["season_xg_for_avg"] = ctx.group["xGoalsFor"].cumsum().shift(1) / denom
+    logs["season_xg_against_avg"] = ctx.group["xGoalsAgainst"].cumsum().shift(1) / denom
+    logs["season_xg_diff_avg"] = logs["season_xg_for_avg"] - logs["season_xg_against_avg"]
+    return logs
+
+
+@TEAM_FEATURES.family("rest", outputs=("rest_days", "is_b2b"), depends={"is_b2b": ("rest_days",)})
+def _rest_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Rest metrics (TRULY PRE-GAME: based on schedule)
+    logs["rest_days"] = ctx.group["gameDate"].diff().dt.days
+    logs["is_b2b"] = logs["rest_days"].fillna(10).le(1).astype(int)
+    return logs
+
+
+@TEAM_FEATURES.family("altitude", outputs=("team_altitude_ft", "altitude_diff", "is_high_altitude"))
+def _altitude_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    avg_altitude = np.mean(list(ALTITUDE_FEET_BY_TEAM.values()))
+    logs["team_altitude_ft"] = logs["teamId"].map(ALTITUDE_FEET_BY_TEAM).fillna(0.0)
+    logs["altitude_diff"] = logs["team_altitude_ft"] - avg_altitude
+    logs["is_high_altitude"] = (logs["team_altitude_ft"] >= HIGH_ALTITUDE_THRESHOLD).astype(int)
+    return logs
+
+
+LINE_COLUMNS: Sequence[str] = (
+    "lineTopTrioSeconds",
+    "lineTopPairSeconds",
+    "lineForwardConcentration",
+    "lineDefenseConcentration",
+    "lineForwardContinuity",
+    "lineDefenseContinuity",
+)
+
+
+@TEAM_FEATURES.family(
+    "line_chemistry",
+    outputs=(*LINE_COLUMNS, "line_top_trio_min", "line_top_pair_min", "line_forward_balance", "line_defense_balance"),
+)
+def _line_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    for line_col in LINE_COLUMNS:
+        if line_col in logs.columns:
+            logs[line_col] = pd.to_numeric(logs[line_col], errors="coerce").fillna(0.0)
+        else:
+            logs[line_col] = 0.0
+    logs["line_top_trio_min"] = logs["lineTopTrioSeconds"] / 60.0
+    logs["line_top_pair_min"] = logs["lineTopPairSeconds"] / 60.0
+    logs["line_forward_balance"] = logs["lineForwardConcentration"] - logs["lineDefenseConcentration"]
+    logs["line_defense_balance"] = logs["lineDefenseConcentration"] - logs["lineForwardConcentration"]
+    return logs
+
+
+@TEAM_FEATURES.family(
+    "goalie_status",
+    outputs=("goalie_confirmed_start", "goalie_injury_flag", "team_injury_count"),
+    inputs=("teamAbbrev",),
+)
+def _goalie_status_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    starting_map = _load_starting_goalies()
+    team_abbrevs = logs["teamAbbrev"].fillna("").str.upper()
+    logs["goalie_confirmed_start"] = team_abbrevs.map(
+        lambda abbr: float(bool(starting_map.get(abbr, {}).get("confirmedStart")))
+    )
+    logs["goalie_injury_flag"] = team_abbrevs.map(
+        lambda abbr: float(bool(starting_map.get(abbr, {}).get("statusCode")))
+    )
+    injury_map = _load_player_injuries()
+    logs["team_injury_count"] = team_abbrevs.map(
+        lambda abbr: float(injury_map.get(abbr, 0))
+    )
+    return logs
+
+
+@TEAM_FEATURES.family(
+    "goalie_pulse",
+    outputs=("goalie_start_likelihood", "goalie_rest_days", "goalie_rolling_gsa", "goalie_trend_score"),
+    inputs=("teamAbbrev",),
+)
+def _goalie_pulse_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    pulse_map = _load_goalie_pulse()
+    team_abbrevs = logs["teamAbbrev"].fillna("").str.upper()
+    logs["goalie_start_likelihood"] = team_abbrevs.map(
+        lambda abbr: pulse_map.get(abbr, {}).get("startLikelihood", 0.0)
+    )
+    logs["goalie_rest_days"] = team_abbrevs.map(
+        lambda abbr: pulse_map.get(abbr, {}).get("restDays", 0.0)
+    )
+    logs["goalie_rolling_gsa"] = team_abbrevs.map(
+        lambda abbr: pulse_map.get(abbr, {}).get("rollingGsa", 0.0)
+    )
+    logs["goalie_trend_score"] = team_abbrevs.map(
+        lambda abbr: pulse_map.get(abbr, {}).get("trendScore", 0.0)
+    )
+    return logs
+
+
+@TEAM_FEATURES.family(
+    "streaks",
+    outputs=(
+        "consecutive_home_prior",
+        "consecutive_away_prior",
+        "travel_burden",
+        "consecutive_wins_prior",
+        "consecutive_losses_prior",
+    ),
+    depends={"travel_burden": ("consecutive_away_prior",)},
+)
+def _streak_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Venue streaks derived from schedule and win/loss streaks (pre-game counts)
+    streaks = _lagged_streaks(ctx.group, {
+        "consecutive_home_prior": logs["is_home"],
+        "consecutive_away_prior": ~logs["is_home"],
+        "consecutive_wins_prior": logs["win"].astype(bool),
+        "consecutive_losses_prior": ~logs["win"].astype(bool),
+    })
+    streaks.insert(2, "travel_burden", streaks["consecutive_away_prior"].clip(lower=0))
+    # One concat instead of column-by-column inserts (which fragment the frame
+    # when engineer_team_features runs in place)
+    return pd.concat([logs.drop(columns=streaks.columns, errors="ignore"), streaks], axis=1)
+
+
+@TEAM_FEATURES.family(
+    "head_to_head",
+    outputs=("h2h_win_pct", "h2h_goal_diff", "h2h_games_played"),
+    inputs=("opponentTeamAbbrev",),
+)
+def _h2h_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Head-to-head matchup history (pre-game only)
+    return _add_h2h_features(logs)
+
+
+@TEAM_FEATURES.family("rolling", outputs=tuple(template for template, _, _ in ROLLING_FEATURE_SPECS))
+def _rolling_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Rolling statistics (ALL LAGGED)
+    windows = list(ctx.rolling_windows) if ctx.wanted is None else _requested_windows(ctx.wanted)
+    rolling_specs = [
+        (template, column, divisor, window)
+        for window in windows
+        for template, column, divisor in ROLLING_FEATURE_SPECS
+        if column in logs.columns and ctx.wants(template.format(window=window))
+    ]
+    rolling = _lagged_rolling_block(
+        logs,
+        ctx.group,
+        list(dict.fromkeys(column for _, column, _, _ in rolling_specs)),
+        list(dict.fromkeys(window for _, _, _, window in rolling_specs)),
+    )
+    roll_features = pd.DataFrame(
+        {
+            template.format(window=window): rolling[(column, window)] / divisor
+            for template, column, divisor, window in rolling_specs
+        },
+        index=logs.index,
+    )
+    return pd.concat(
+        [logs.drop(columns=roll_features.columns, errors="ignore"), roll_features], axis=1, copy=False
+    )
+
+
+@TEAM_FEATURES.family("momentum_weighted", outputs=tuple(f"{prefix}_{{suffix}}" for prefix in MOMENTUM_COLUMNS))
+def _momentum_weighted_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # V7.0: Momentum-weighted rolling features (weights recent games more heavily)
+    columns = {
+        prefix: column
+        for prefix, column in MOMENTUM_COLUMNS.items()
+        if any(ctx.wants(f"{prefix}_{suffix}") for suffix in ctx.momentum_weights)
+    }
+    weight_sets = {
+        suffix: weights
+        for suffix, weights in ctx.momentum_weights.items()
+        if any(ctx.wants(f"{prefix}_{suffix}") for prefix in columns)
+    }
+    momentum_features = _momentum_features(logs, ctx.group, columns, weight_sets)
+    return logs.assign(**{name: values for name, values in momentum_features.items() if ctx.wants(name)})
+
+
+@TEAM_FEATURES.family("shot_margin_trends", outputs=("shot_margin_last_game", "season_shot_margin"))
+def _shot_margin_features(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    team_group = logs.groupby(["teamId", "seasonId"], sort=False)
+    logs["shot_margin_last_game"] = team_group["shot_margin"].shift(1)
+    if ctx.wants("season_shot_margin"):
+        logs["season_shot_margin"] = team_group["shot_margin"].transform(
+            lambda s: s.shift(1).expanding(min_periods=1).mean()
+        )
+    return logs
+
+
+@TEAM_FEATURES.family(
+    "momentum_indicators",
+    outputs=("momentum_win_pct", "momentum_goal_diff", "momentum_shot_margin", "momentum_xg"),
+    depends={
+        "momentum_win_pct": ("rolling_win_pct_5", "season_win_pct"),
+        "momentum_goal_diff": ("rolling_goal_diff_5", "season_goal_diff_avg"),
+        "momentum_shot_margin": ("shot_margin_last_game", "season_shot_margin"),
+        "momentum_xg": ("rolling_xg_diff_5", "season_xg_diff_avg"),
+    },
+)
+def _momentum_indicators(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Momentum indicators (recent vs season average)
+    if ctx.wants("momentum_win_pct"):
+        logs["momentum_win_pct"] = logs["rolling_win_pct_5"] - logs["season_win_pct"]
+    if ctx.wants("momentum_goal_diff"):
+        logs["momentum_goal_diff"] = logs["rolling_goal_diff_5"] - logs["season_goal_diff_avg"]
+    if ctx.wants("momentum_shot_margin"):
+        logs["momentum_shot_margin"] = logs["shot_margin_last_game"] - logs["season_shot_margin"]
+
+    # xGoals momentum (NEW)
+    if ctx.wants("momentum_xg") and "rolling_xg_diff_5" in logs.columns and "season_xg_diff_avg" in logs.columns:
+        logs["momentum_xg"] = logs["rolling_xg_diff_5"] - logs["season_xg_diff_avg"]
+    return logs
+
+
+@TEAM_FEATURES.family("schedule_congestion", outputs=("games_last_3d", "games_last_6d"), depends=("rest_days",))
+def _schedule_congestion(logs: pd.DataFrame, ctx: _TeamFeatureContext) -> pd.DataFrame:
+    # Schedule congestion indicators (PRE-GAME: based on known schedule)
+    # (shifts stay within each team so a team's first game never sees another team's row)
+    rest = logs["rest_days"].fillna(10)
+    recent_one_day = rest.le(1).astype(int)
+    recent_two_day = rest.le(2).astype(int)
+    one_day_by_team = recent_one_day.groupby(logs["teamId"], sort=False)
+    two_day_by_team = recent_two_day.groupby(logs["teamId"], sort=False)
+    logs["games_last_3d"] = (recent_one_day + one_day_by_team.shift(1).fillna(0)).clip(0, 3)
+    if ctx.wants("games_last_6d"):
+        logs["games_last_6d"] = (
+            recent_two_day
+            + two_day_by_team.shift(1).fillna(0)
+            + two_day_by_team.shift(2).fillna(0)
+            + two_day_by_team.shift(3).fillna(0)
+        ).clip(0, 4)
+    return logs
+
+
+def engineer_team_features(
+    logs: pd.DataFrame,
+    rolling_windows: Iterable[int] = ROLL_WINDOWS,
+    momentum_weights: Optional[Mapping[str, Sequence[float]]] = None,
+    features: Optional[Iterable[str]] = None,
+    copy: bool = True,
+) -> pd.DataFrame:
+    """
+    Create lagged features using ONLY information available BEFORE each game.
+
+    momentum_weights maps a feature suffix to a weight vector (most recent game
+    first); every set is computed in the same pass, e.g.
+    {"4": MOMENTUM_WEIGHTS, "ewm10": exponential_momentum_weights(10, 0.75)}
+    adds momentum_xg_for_ewm10 etc. alongside the default *_4 features.
+
+    features restricts the output to the named TEAM_FEATURES and what they
+    depend on; families none of them need are skipped entirely (rolling
+    features are computed for the requested windows only). Raises ValueError
+    for names no family produces.
+
+    copy=False skips the defensive copy of `logs`: derived columns are added
+    to (and the rows re-sorted in) the caller's frame, which saves a full copy
+    when the caller has no further use for it.
+
+    **CRITICAL FOR LIVE PREDICTION:**
+    - All features use .shift(1) to exclude current game
+    - No future information leaks into features
+    - Early-season games get zeros/NaNs (expected - no history)
+
+    For predicting upcoming games, this ensures we only use data that would
+    actually be known before puck drop.
+    """
+    plan = TEAM_FEATURES.resolve(None if features is None else list(features))
+    if plan.external:
+        raise ValueError(f"Unknown team features: {sorted(plan.external)}")
+
+    logs = derive_game_stats(logs.copy() if copy else logs)
+
+    # CRITICAL: Sort chronologically for proper lagging
+    logs.sort_values(["teamId", "seasonId", "gameDate", "gameId"], inplace=True)
+
+    # Group by team-season for cumulative and rolling stats
+    ctx = _TeamFeatureContext(
+        group=logs.groupby(["teamId", "seasonId"], sort=False),
+        rolling_windows=list(rolling_windows),
+        momentum_weights=momentum_weights or {"4": MOMENTUM_WEIGHTS},
+    )
+    for family in plan.families:
+        if not set(family.inputs).issubset(logs.columns):
+            continue
+        logs = family.producer(logs, replace(ctx, wanted=plan.outputs(family)))
 
     # Fill NaNs (expected for early-season games with no history)
+    fill_windows = ctx.rolling_windows
+    if plan.wanted is not None:
+        fill_windows = _requested_windows(plan.wanted.get("rolling", ()))
+    feature_cols = [
+        column for column in _filled_feature_columns(logs.columns, fill_windows) if column in logs.columns
+    ]
     logs[feature_cols] = logs[feature_cols].fillna(0.0)
-    
+
     return logs
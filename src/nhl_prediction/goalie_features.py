@@ -97,46 +97,39 @@ def _add_individual_goalie_features(
     for feature in goalie_features:
         team_logs[feature] = 0.0
 
+    # Starter lookups and as-of queries use the calendar day, so timestamps
+    # match the YYYY-MM-DD keys and same-day games never leak into the form
+    game_dates = pd.to_datetime(team_logs['gameDate']).dt.strftime('%Y-%m-%d')
     features_added = 0
 
-    # Process each game
-    for idx, row in team_logs.iterrows():
-        game_date = str(row.get('gameDate', ''))
-        home_team = str(row.get('teamAbbrev_home', ''))
-        away_team = str(row.get('teamAbbrev_away', ''))
-
-        # Get starting goalies for this game
-        game_starters = starting_goalies.get(game_date, {})
-        home_goalie_id = game_starters.get(home_team)
-        away_goalie_id = game_starters.get(away_team)
-
-        # Home goalie features
-        if home_goalie_id:
-            home_recent = tracker.get_recent_form(home_goalie_id, game_date, last_n_games=5)
-            team_logs.at[idx, 'goalie_gsa_last5_home'] = home_recent.get('gsa_avg', 0.0)
-            team_logs.at[idx, 'goalie_save_pct_last5_home'] = home_recent.get('save_pct', 0.910)
-            team_logs.at[idx, 'goalie_hd_save_pct_last5_home'] = home_recent.get('hd_save_pct', 0.850)
-            team_logs.at[idx, 'goalie_games_played_last5_home'] = home_recent.get('games_played', 0)
-
-            # vs opponent
-            home_vs_away = tracker.get_vs_opponent(home_goalie_id, away_team, game_date)
-            team_logs.at[idx, 'goalie_vs_opp_save_pct_home'] = home_vs_away.get('save_pct', 0.910)
-
-            features_added += 1
-
-        # Away goalie features
-        if away_goalie_id:
-            away_recent = tracker.get_recent_form(away_goalie_id, game_date, last_n_games=5)
-            team_logs.at[idx, 'goalie_gsa_last5_away'] = away_recent.get('gsa_avg', 0.0)
-            team_logs.at[idx, 'goalie_save_pct_last5_away'] = away_recent.get('save_pct', 0.910)
-            team_logs.at[idx, 'goalie_hd_save_pct_last5_away'] = away_recent.get('hd_save_pct', 0.850)
-            team_logs.at[idx, 'goalie_games_played_last5_away'] = away_recent.get('games_played', 0)
-
-            # vs opponent
-            away_vs_home = tracker.get_vs_opponent(away_goalie_id, home_team, game_date)
-            team_logs.at[idx, 'goalie_vs_opp_save_pct_away'] = away_vs_home.get('save_pct', 0.910)
-
-            features_added += 1
+    for side, opponent_side in (('home', 'away'), ('away', 'home')):
+        teams = team_logs[f'teamAbbrev_{side}'].astype(str)
+        opponents = team_logs[f'teamAbbrev_{opponent_side}'].astype(str)
+        goalie_ids = pd.Series(
+            [starting_goalies.get(date, {}).get(team) for date, team in zip(game_dates, teams)],
+            index=team_logs.index,
+            dtype=object,
+        )
+        has_goalie = goalie_ids.map(bool).to_numpy()
+        if not has_goalie.any():
+            continue
+
+        # One batch query per side instead of a tracker lookup per game
+        recent = tracker.batch_recent_form(goalie_ids[has_goalie], game_dates[has_goalie], last_n_games=5)
+        vs_opponent = tracker.batch_vs_opponent(goalie_ids[has_goalie], opponents[has_goalie], game_dates[has_goalie])
+
+        for feature, values in (
+            (f'goalie_gsa_last5_{side}', recent['gsa_avg']),
+            (f'goalie_save_pct_last5_{side}', recent['save_pct']),
+            (f'goalie_hd_save_pct_last5_{side}', recent['hd_save_pct']),
+            (f'goalie_games_played_last5_{side}', recent['games_played']),
+            (f'goalie_vs_opp_save_pct_{side}', vs_opponent['save_pct']),
+        ):
+            column = team_logs[feature].to_numpy(copy=True)
+            column[has_goalie] = values.to_numpy()
+            team_logs[feature] = column
+
+        features_added += int(has_goalie.sum())
 
     # Add differential features
     team_logs['goalie_gsa_diff'] = (
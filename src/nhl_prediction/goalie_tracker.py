@@ -15,21 +15,157 @@ Key metrics:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 import logging
 
 LOGGER = logging.getLogger(__name__)
 
+# Per-game fields stored for every goalie appearance (see GoalieTracker.add_game)
+GAME_FIELDS = (
+    'game_id', 'game_date', 'team', 'opponent',
+    'saves', 'shots_against', 'goals_against', 'save_pct',
+    'high_danger_saves', 'high_danger_shots', 'hd_save_pct',
+    'rush_saves', 'rush_shots', 'rush_save_pct',
+    'expected_goals_against', 'gsa', 'toi_seconds',
+)
+
+# Goalie table columns (native_ingest.GOALIE_TABLE_COLUMNS) behind each add_game argument
+GOALIE_TABLE_FIELDS = {
+    'game_id': 'gameId',
+    'game_date': 'gameDate',
+    'team': 'teamAbbrev',
+    'opponent': 'opponentTeamAbbrev',
+    'saves': 'saves',
+    'shots_against': 'shotsAgainst',
+    'goals_against': 'goalsAgainst',
+    'high_danger_saves': 'highDangerSaves',
+    'high_danger_shots': 'highDangerShotsAgainst',
+    'rush_saves': 'rushSaves',
+    'rush_shots': 'rushShotsAgainst',
+    'expected_goals_against': 'xGoalsAgainst',
+    'toi_seconds': 'toiSeconds',
+}
+
+# League-average stats returned when a goalie has no (or too little) history
+DEFAULT_GOALIE_STATS = {
+    'games_played': 0,
+    'save_pct': 0.910,  # League average
+    'hd_save_pct': 0.850,  # Estimated league average
+    'rush_save_pct': 0.880,  # Estimated league average
+    'gsa_avg': 0.0,
+    'gsa_total': 0.0,
+    'goals_against_avg': 3.0,
+    'shots_against_avg': 30.0
+}
+
+
+def _to_days(dates: Iterable[Any]) -> np.ndarray:
+    """Dates (strings or timestamps) as integer day numbers; only the calendar day counts."""
+    return pd.to_datetime(pd.Series(list(dates), dtype=object)).to_numpy().astype('datetime64[D]').astype(np.int64)
+
+
+class _AsOfIndex:
+    """
+    Games grouped by a key and sorted by date within each group, with prefix
+    sums of the stat columns, for "games of this key before this date" queries.
+    """
+
+    def __init__(self, keys: pd.Index, days: np.ndarray, values: Dict[str, np.ndarray]):
+        if len(keys):
+            codes, self.groups = pd.factorize(keys)
+        else:
+            codes, self.groups = np.zeros(0, dtype=np.int64), keys
+        self.day_base = int(days.min()) if len(days) else 0
+        # Composite (group, day) keys; a group's games are one contiguous, date-sorted run
+        self.span = int(days.max()) - self.day_base + 2 if len(days) else 2
+        composite = codes * self.span + (days - self.day_base)
+        # Same-day games sort latest-added first, so a "last N" window cut
+        # inside a day keeps the earliest-added ones (as the list scan did)
+        order = np.lexsort((-np.arange(len(composite)), composite))
+        self.composite = composite[order]
+        group_ids = np.arange(len(self.groups))
+        self.group_start = np.searchsorted(self.composite, group_ids * self.span, side='left')
+        self.prefix = {name: np.concatenate(([0.0], np.cumsum(column[order]))) for name, column in values.items()}
+
+    def window(self, keys: pd.Index, before_days: np.ndarray, last_n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorted-position bounds [lo, hi) of each query's games dated before before_days.
+
+        Only the last `last_n` of them with last_n; unknown keys get an empty window.
+        """
+        codes = self.groups.get_indexer(keys) if len(self.groups) else np.full(len(keys), -1)
+        found = codes >= 0
+        codes = np.where(found, codes, 0)
+        offsets = np.clip(before_days - self.day_base, 0, self.span - 1)
+        hi = np.where(found, np.searchsorted(self.composite, codes * self.span + offsets, side='left'), 0)
+        lo = np.where(found, self.group_start[codes] if len(self.groups) else 0, 0)
+        if last_n is not None:
+            lo = np.maximum(lo, hi - last_n)
+        return lo, hi
+
+    def sums(self, name: str, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        prefix = self.prefix[name]
+        return prefix[hi] - prefix[lo]
+
 
 class GoalieTracker:
-    """Track individual goalie performance across games."""
+    """
+    Track individual goalie performance across games.
+
+    Games are stored column by column. The first query after add_game builds
+    date-sorted indexes with prefix sums per goalie, per (goalie, opponent)
+    and per (goalie, season), so every as-of query is a binary search and a
+    few subtractions; the batch_* methods answer a whole frame of queries in
+    one vectorized call.
+    """
 
     def __init__(self):
         """Initialize goalie tracker with empty history."""
-        self.goalie_games = defaultdict(list)  # goalie_id -> list of game stats
+        self._goalie_ids: List[int] = []
+        self._columns: Dict[str, List[Any]] = {field: [] for field in GAME_FIELDS}
+        self._indexes: Optional[Dict[str, _AsOfIndex]] = None
         self.goalie_info = {}  # goalie_id -> {name, team, etc}
 
+    @classmethod
+    def from_frame(cls, goalie_games: pd.DataFrame) -> 'GoalieTracker':
+        """
+        Build a tracker from a goalie table in one vectorized pass.
+
+        Equivalent to calling add_game for every row of a frame with the
+        native_ingest goalie-table columns (see GOALIE_TABLE_FIELDS).
+        """
+        tracker = cls()
+        columns = {field: goalie_games[column].to_numpy() for field, column in GOALIE_TABLE_FIELDS.items()}
+        columns['game_id'] = columns['game_id'].astype(str)
+        columns['game_date'] = pd.to_datetime(goalie_games['gameDate']).dt.strftime('%Y-%m-%d').to_numpy()
+
+        def rate(made: np.ndarray, attempts: np.ndarray) -> np.ndarray:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(attempts > 0, made / np.where(attempts > 0, attempts, 1), 0.0)
+
+        columns['save_pct'] = rate(columns['saves'], columns['shots_against'])
+        columns['hd_save_pct'] = rate(columns['high_danger_saves'], columns['high_danger_shots'])
+        columns['rush_save_pct'] = rate(columns['rush_saves'], columns['rush_shots'])
+        columns['gsa'] = columns['expected_goals_against'] - columns['goals_against']
+
+        tracker._goalie_ids = goalie_games['goalieId'].tolist()
+        tracker._columns = {field: columns[field].tolist() for field in GAME_FIELDS}
+        return tracker
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_indexes'] = None  # rebuilt on demand
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        legacy_games = state.pop('goalie_games', None)
+        self.__init__()
+        self.__dict__.update(state)
+        # Trackers pickled before the columnar layout kept a list of game dicts per goalie
+        for goalie_id, games in (legacy_games or {}).items():
+            for game in games:
+                self._append(goalie_id, game)
+
     def add_game(
         self,
         goalie_id: int,
@@ -73,7 +209,7 @@ class GoalieTracker:
         # Calculate GSA (Goals Saved Above Expected)
         gsa = expected_goals_against - goals_against
 
-        game_stats = {
+        self._append(goalie_id, {
             'game_id': game_id,
             'game_date': game_date,
             'team': team,
@@ -91,9 +227,136 @@ class GoalieTracker:
             'expected_goals_against': expected_goals_against,
             'gsa': gsa,
             'toi_seconds': toi_seconds
+        })
+
+    def _append(self, goalie_id: int, game: Dict[str, Any]) -> None:
+        self._goalie_ids.append(goalie_id)
+        for field in GAME_FIELDS:
+            self._columns[field].append(game[field])
+        self._indexes = None
+
+    @property
+    def goalie_games(self) -> Dict[int, List[Dict[str, Any]]]:
+        """Each goalie's games as dicts, in the order they were added."""
+        games: Dict[int, List[Dict[str, Any]]] = {}
+        for position, goalie_id in enumerate(self._goalie_ids):
+            games.setdefault(goalie_id, []).append({field: self._columns[field][position] for field in GAME_FIELDS})
+        return games
+
+    def _index(self, name: str) -> _AsOfIndex:
+        if self._indexes is None:
+            self._indexes = self._build_indexes()
+        return self._indexes[name]
+
+    def _build_indexes(self) -> Dict[str, _AsOfIndex]:
+        columns = {field: np.asarray(values) for field, values in self._columns.items()}
+        goalies = np.asarray(self._goalie_ids)
+        days = _to_days(columns['game_date'])
+        has_hd = (columns['high_danger_shots'] > 0).astype(float)
+        has_rush = (columns['rush_shots'] > 0).astype(float)
+        values = {
+            'games': np.ones(len(goalies)),
+            'saves': columns['saves'].astype(float),
+            'shots_against': columns['shots_against'].astype(float),
+            'goals_against': columns['goals_against'].astype(float),
+            'save_pct': columns['save_pct'].astype(float),
+            'gsa': columns['gsa'].astype(float),
+            'hd_games': has_hd,
+            'hd_save_pct': columns['hd_save_pct'].astype(float) * has_hd,
+            'rush_games': has_rush,
+            'rush_save_pct': columns['rush_save_pct'].astype(float) * has_rush,
+        }
+        # game_id starts with the season's first year (2023020001 is in 20232024)
+        seasons = np.array([str(game_id)[:4] for game_id in columns['game_id']], dtype=object)
+        return {
+            'goalie': _AsOfIndex(pd.Index(goalies), days, values),
+            'opponent': _AsOfIndex(pd.MultiIndex.from_arrays([goalies, columns['opponent']]), days, values),
+            'season': _AsOfIndex(pd.MultiIndex.from_arrays([goalies, seasons]), days, values),
         }
 
-        self.goalie_games[goalie_id].append(game_stats)
+    # ------------------------------------------------------------------
+    # Batch queries: one row per query, league-average defaults where the
+    # goalie has no (or too little) history
+    # ------------------------------------------------------------------
+
+    def batch_recent_form(
+        self,
+        goalie_ids: Sequence[int],
+        before_dates: Sequence[Any],
+        last_n_games: int = 5,
+    ) -> pd.DataFrame:
+        """get_recent_form for many (goalie, date) pairs at once."""
+        index = self._index('goalie')
+        lo, hi = index.window(pd.Index(list(goalie_ids)), _to_days(before_dates), last_n=last_n_games)
+        games = index.sums('games', lo, hi)
+        hd_games = index.sums('hd_games', lo, hi)
+        rush_games = index.sums('rush_games', lo, hi)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats = {
+                'games_played': games.astype(int),
+                'save_pct': index.sums('save_pct', lo, hi) / games,
+                'shots_against_avg': index.sums('shots_against', lo, hi) / games,
+                'goals_against_avg': index.sums('goals_against', lo, hi) / games,
+                'hd_save_pct': np.where(hd_games > 0, index.sums('hd_save_pct', lo, hi) / hd_games, 0.0),
+                'rush_save_pct': np.where(rush_games > 0, index.sums('rush_save_pct', lo, hi) / rush_games, 0.0),
+                'gsa_avg': index.sums('gsa', lo, hi) / games,
+                'gsa_total': index.sums('gsa', lo, hi),
+            }
+        return _with_defaults(stats, games > 0)
+
+    def batch_vs_opponent(
+        self,
+        goalie_ids: Sequence[int],
+        opponents: Sequence[str],
+        before_dates: Sequence[Any],
+        min_games: int = 3,
+    ) -> pd.DataFrame:
+        """get_vs_opponent for many (goalie, opponent, date) triples at once."""
+        index = self._index('opponent')
+        keys = pd.MultiIndex.from_arrays([list(goalie_ids), list(opponents)])
+        lo, hi = index.window(keys, _to_days(before_dates))
+        games = index.sums('games', lo, hi)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats = {
+                'games_played': games.astype(int),
+                'save_pct': index.sums('save_pct', lo, hi) / games,
+                'goals_against_avg': index.sums('goals_against', lo, hi) / games,
+                'gsa_avg': index.sums('gsa', lo, hi) / games,
+            }
+        return _with_defaults(stats, games >= max(min_games, 1))
+
+    def batch_season_stats(
+        self,
+        goalie_ids: Sequence[int],
+        seasons: Sequence[str],
+        before_dates: Optional[Sequence[Any]] = None,
+    ) -> pd.DataFrame:
+        """get_season_stats for many (goalie, season[, date]) queries at once."""
+        index = self._index('season')
+        keys = pd.MultiIndex.from_arrays([list(goalie_ids), [str(season)[:4] for season in seasons]])
+        if before_dates is None:
+            before_days = np.full(len(keys), np.iinfo(np.int64).max // 4)
+        else:
+            before_days = _to_days(before_dates)
+        lo, hi = index.window(keys, before_days)
+        games = index.sums('games', lo, hi)
+        saves = index.sums('saves', lo, hi)
+        shots = index.sums('shots_against', lo, hi)
+        gsa = index.sums('gsa', lo, hi)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats = {
+                'games_played': games.astype(int),
+                'save_pct': np.where(shots > 0, saves / shots, 0.0),
+                'saves_total': saves,
+                'shots_against_total': shots,
+                'gsa_total': gsa,
+                'gsa_avg': gsa / games,
+            }
+        return _with_defaults(stats, games > 0)
+
+    # ------------------------------------------------------------------
+    # Single queries
+    # ------------------------------------------------------------------
 
     def get_recent_form(
         self,
@@ -112,33 +375,7 @@ class GoalieTracker:
         Returns:
             Dict with averaged stats from recent games
         """
-        if goalie_id not in self.goalie_games:
-            return self._default_stats()
-
-        # Filter games before date and sort by date
-        games = [
-            g for g in self.goalie_games[goalie_id]
-            if g['game_date'] < before_date
-        ]
-        games.sort(key=lambda x: x['game_date'], reverse=True)
-
-        # Take last N games
-        recent_games = games[:last_n_games]
-
-        if not recent_games:
-            return self._default_stats()
-
-        # Calculate averages
-        return {
-            'games_played': len(recent_games),
-            'save_pct': np.mean([g['save_pct'] for g in recent_games]),
-            'shots_against_avg': np.mean([g['shots_against'] for g in recent_games]),
-            'goals_against_avg': np.mean([g['goals_against'] for g in recent_games]),
-            'hd_save_pct': np.mean([g['hd_save_pct'] for g in recent_games if g['high_danger_shots'] > 0] or [0.0]),
-            'rush_save_pct': np.mean([g['rush_save_pct'] for g in recent_games if g['rush_shots'] > 0] or [0.0]),
-            'gsa_avg': np.mean([g['gsa'] for g in recent_games]),
-            'gsa_total': sum([g['gsa'] for g in recent_games])
-        }
+        return _single(self.batch_recent_form([goalie_id], [before_date], last_n_games))
 
     def get_vs_opponent(
         self,
@@ -159,25 +396,7 @@ class GoalieTracker:
         Returns:
             Dict with stats vs opponent (or defaults if < min_games)
         """
-        if goalie_id not in self.goalie_games:
-            return self._default_stats()
-
-        # Filter games vs opponent before date
-        vs_games = [
-            g for g in self.goalie_games[goalie_id]
-            if g['opponent'] == opponent and g['game_date'] < before_date
-        ]
-
-        if len(vs_games) < min_games:
-            # Not enough history, return league average
-            return self._default_stats()
-
-        return {
-            'games_played': len(vs_games),
-            'save_pct': np.mean([g['save_pct'] for g in vs_games]),
-            'goals_against_avg': np.mean([g['goals_against'] for g in vs_games]),
-            'gsa_avg': np.mean([g['gsa'] for g in vs_games])
-        }
+        return _single(self.batch_vs_opponent([goalie_id], [opponent], [before_date], min_games))
 
     def get_season_stats(
         self,
@@ -196,107 +415,70 @@ class GoalieTracker:
         Returns:
             Dict with season stats
         """
-        if goalie_id not in self.goalie_games:
-            return self._default_stats()
-
-        # Filter games in season
-        season_games = [
-            g for g in self.goalie_games[goalie_id]
-            if season in g['game_id']  # game_id starts with season
-        ]
+        before_dates = None if not before_date else [before_date]
+        return _single(self.batch_season_stats([goalie_id], [season], before_dates))
 
-        if before_date:
-            season_games = [g for g in season_games if g['game_date'] < before_date]
+    def _default_stats(self) -> Dict[str, float]:
+        """Return default/league average stats when data unavailable."""
+        return dict(DEFAULT_GOALIE_STATS)
 
-        if not season_games:
-            return self._default_stats()
 
-        total_saves = sum([g['saves'] for g in season_games])
-        total_shots = sum([g['shots_against'] for g in season_games])
-        total_gsa = sum([g['gsa'] for g in season_games])
+def _with_defaults(stats: Dict[str, np.ndarray], found: np.ndarray) -> pd.DataFrame:
+    """Stats frame with a `found` column; rows without enough history get the league defaults."""
+    frame = pd.DataFrame(stats)
+    for column in frame.columns:
+        default = DEFAULT_GOALIE_STATS.get(column, 0.0)
+        frame[column] = frame[column].where(found, default)
+    frame['found'] = found
+    return frame
 
-        return {
-            'games_played': len(season_games),
-            'save_pct': total_saves / total_shots if total_shots > 0 else 0.0,
-            'saves_total': total_saves,
-            'shots_against_total': total_shots,
-            'gsa_total': total_gsa,
-            'gsa_avg': total_gsa / len(season_games)
-        }
 
-    def _default_stats(self) -> Dict[str, float]:
-        """Return default/league average stats when data unavailable."""
-        return {
-            'games_played': 0,
-            'save_pct': 0.910,  # League average
-            'hd_save_pct': 0.850,  # Estimated league average
-            'rush_save_pct': 0.880,  # Estimated league average
-            'gsa_avg': 0.0,
-            'gsa_total': 0.0,
-            'goals_against_avg': 3.0,
-            'shots_against_avg': 30.0
-        }
+def _single(frame: pd.DataFrame) -> Dict[str, float]:
+    """A one-row batch result as the dict the single-query methods return."""
+    row = frame.iloc[0]
+    if not row['found']:
+        return dict(DEFAULT_GOALIE_STATS)
+    return {column: row[column] for column in frame.columns if column != 'found'}
 
 
 def extract_goalie_stats_from_game(game_data: dict, xg_model) -> List[dict]:
     """
     Extract goalie stats from NHL API game play-by-play data.
 
+    Shots are charged to the goalie in net (goalieInNetId) by the native
+    ingest pass, so this gives the same rows the season goalie tables hold.
+
     Args:
         game_data: Play-by-play data from NHL API
-        xg_model: Trained xG model for calculating expected goals
+        xg_model: Trained xG model (native_ingest.ExpectedGoalsModel)
 
     Returns:
-        List of dicts with goalie stats (one per goalie who played)
+        List of dicts with goalie stats (one per goalie who faced a shot),
+        keyed by native_ingest.GOALIE_TABLE_COLUMNS
     """
-    # This will be implemented to parse play-by-play and extract:
-    # - Which goalies played
-    # - Shots faced by each
-    # - Goals allowed
-    # - Shot types (high-danger, rush, etc.)
-    # - xG against each goalie
+    from .native_ingest import _process_game_plays
 
-    # Placeholder for now - will integrate with native_ingest.py
-    return []
+    goalie_rows: List[dict] = []
+    _process_game_plays(str(game_data['id']), game_data, xg_model, goalie_rows=goalie_rows)
+    return goalie_rows
 
 
-def build_goalie_database(seasons: List[str], cache_dir: str = "data/goalie_cache") -> GoalieTracker:
+def build_goalie_database(seasons: List[str]) -> GoalieTracker:
     """
     Build comprehensive goalie database from multiple seasons.
 
+    Reads the per-season goalie tables native ingest writes next to the team
+    logs (one parquet read per season) instead of reprocessing games; seasons
+    without a table are skipped.
+
     Args:
-        seasons: List of season IDs to process
-        cache_dir: Directory to cache goalie data
+        seasons: List of season IDs to load
 
     Returns:
         GoalieTracker with all goalie games loaded
     """
-    import os
-    from pathlib import Path
-
-    cache_path = Path(cache_dir)
-    cache_path.mkdir(parents=True, exist_ok=True)
-
-    tracker = GoalieTracker()
-
-    # Check for cached data
-    cache_file = cache_path / f"goalie_db_{'_'.join(seasons)}.pkl"
-    if cache_file.exists():
-        import pickle
-        LOGGER.info(f"Loading goalie database from cache: {cache_file}")
-        with open(cache_file, 'rb') as f:
-            return pickle.load(f)
-
-    # Build from scratch
-    LOGGER.info(f"Building goalie database for seasons: {seasons}")
-
-    # This will integrate with native_ingest.py to process all games
-    # For now, return empty tracker
-
-    # Cache for future use
-    import pickle
-    with open(cache_file, 'wb') as f:
-        pickle.dump(tracker, f)
+    from .native_ingest import load_goalie_table
 
-    LOGGER.info(f"Goalie database cached to: {cache_file}")
-    return tracker
+    goalie_games = load_goalie_table(seasons)
+    LOGGER.info(f"Loaded {len(goalie_games)} goalie games for seasons: {seasons}")
+    return GoalieTracker.from_frame(goalie_games)
@@ -0,0 +1,85 @@
+"""Memory helpers for building many seasons of features in small containers."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+LOGGER = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (NaN where unsupported)."""
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageMemory:
+    """
+    Records the process's peak RSS as each pipeline stage finishes.
+
+    The peak is a process-wide high-water mark, so a stage's cost shows up as
+    the growth since the previous mark.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, stage: str) -> None:
+        if not self.enabled:
+            return
+        peak = peak_rss_mb()
+        growth = peak - self.stages[-1][1] if self.stages else 0.0
+        self.stages.append((stage, peak))
+        LOGGER.info("Peak RSS after %s: %.1f MB (+%.1f MB)", stage, peak, growth)
+
+
+def _smallest_int_dtype(series: pd.Series):
+    if series.empty:
+        return None
+    low, high = series.min(), series.max()
+    for dtype in (np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return None
+
+
+def downcast_frame(frame: pd.DataFrame, categorical_columns: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Shrink a frame column by column, in place, and return it.
+
+    Integer counts become int16/int32 (whichever holds their range), float64
+    rates become float32 and the named columns (team IDs, abbreviations)
+    become categoricals. Booleans, datetimes, strings and extension dtypes
+    are left alone.
+    """
+    categorical_columns = set(categorical_columns)
+    for column in frame.columns:
+        series = frame[column]
+        if column in categorical_columns:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                frame[column] = series.astype("category")
+            continue
+        if not isinstance(series.dtype, np.dtype) or series.dtype.kind == "b":
+            continue
+        if series.dtype.kind in "iu" and series.dtype.itemsize > 2:
+            dtype = _smallest_int_dtype(series)
+            if dtype is not None:
+                frame[column] = series.astype(dtype)
+        elif series.dtype == np.float64:
+            frame[column] = series.astype(np.float32)
+    return frame
@@ -4,15 +4,19 @@ from __future__ import annotations
 
 import logging
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 
+from .data_sources.cache import PackedCache, open_cache
 from .data_sources.gamecenter import GamecenterClient
 
 LOGGER = logging.getLogger(__name__)
@@ -83,6 +87,28 @@ def _parse_situation_code(code: str) -> Dict[str, Any]:
     }
 
 
+def _skater_strength(code: str | None) -> Tuple[int, int] | None:
+    """
+    (away skaters, home skaters) from a situation code, not counting the extra
+    attacker of a team whose net is empty; None if the code is unreadable.
+
+    Situation codes read away goalie, away skaters, home skaters, home goalie:
+    "1451" is 4 away skaters against 5 home skaters (home power play), "0651"
+    an extra attacker for the away team with its net empty (even strength),
+    and "0641" an away power play with the away goalie pulled.
+    """
+    if not code or len(code) != 4 or not code.isdigit():
+        return None
+    return int(code[1]) - (code[0] == "0"), int(code[2]) - (code[3] == "0")
+
+
+def _goalies_in_net(code: str | None) -> Tuple[bool, bool]:
+    """(away goalie in, home goalie in) from a situation code; unreadable codes count as both in."""
+    if not code or len(code) != 4 or not code.isdigit():
+        return True, True
+    return code[0] == "1", code[3] == "1"
+
+
 @dataclass
 class ShotFeatures:
     """Features for expected goals model."""
@@ -212,12 +238,14 @@ def _build_xg_training_data(game_ids: List[str], client: GamecenterClient) -> pd
 
     all_shots = []
 
-    for i, game_id in enumerate(game_ids):
+    for i, (game_id, pbp) in enumerate(client.iter_play_by_play(game_ids)):
         if i % 100 == 0:
             LOGGER.info(f"Processing game {i+1}/{len(game_ids)}")
 
+        if pbp is None:
+            continue
+
         try:
-            pbp = client.get_play_by_play(game_id)
             plays = pbp.get("plays", [])
             home_defending = None
 
@@ -345,36 +373,93 @@ class ExpectedGoalsModel:
 
     def predict_xg(self, shot_features: ShotFeatures) -> float:
         """Predict expected goal value for a single shot."""
-        # Convert to feature dict
-        features = shot_features.to_dict()
+        return float(self.predict_xg_batch([shot_features])[0])
 
-        # Add shot type one-hot encoding
-        shot_type = shot_features.shot_type.lower()
-        for col in self.feature_columns:
+    def predict_xg_batch(self, shots: Sequence[ShotFeatures] | pd.DataFrame) -> np.ndarray:
+        """
+        Predict expected goal values for many shots in one model call.
+
+        Accepts either a sequence of ShotFeatures or a column-oriented frame
+        (as produced by shot_features_frame). Columns the model expects but
+        the frame lacks (e.g. is_rebound) are scored as 0, matching predict_xg.
+        """
+        frame = shots if isinstance(shots, pd.DataFrame) else shot_features_frame(shots)
+        if frame.empty:
+            return np.zeros(0, dtype=float)
+
+        X = np.zeros((len(frame), len(self.feature_columns)), dtype=float)
+        shot_types = frame["shot_type"].astype(str).str.lower().to_numpy()
+
+        for j, col in enumerate(self.feature_columns):
             if col.startswith("shot_"):
-                features[col] = 1 if col == f"shot_{shot_type}" else 0
+                # Shot type one-hot encoding
+                X[:, j] = shot_types == col[len("shot_"):]
+            elif col in frame.columns:
+                X[:, j] = frame[col].to_numpy(dtype=float)
 
-        # Ensure all features present
-        for col in self.feature_columns:
-            if col not in features:
-                features[col] = 0
+        X = pd.DataFrame(X, columns=self.feature_columns)
+        return self.model.predict_proba(X)[:, 1]
 
-        # Create DataFrame with correct column order
-        X = pd.DataFrame([features])[self.feature_columns]
 
-        # Predict probability
-        return self.model.predict_proba(X)[0, 1]
+def shot_features_frame(shots: Sequence[ShotFeatures]) -> pd.DataFrame:
+    """Stack ShotFeatures into a column-oriented frame for batch xG scoring."""
+    if not shots:
+        return pd.DataFrame()
+    return pd.DataFrame([shot.to_dict() for shot in shots])
 
 
 # ============================================================================
 # GAME LOG PROCESSING
 # ============================================================================
 
-def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoalsModel) -> Dict[str, Any]:
+# Periods whose starting score is recorded per team-game: goalsFor/goalsAgainst
+# entering the period and trailing/leading flags (used by comeback features)
+SCORE_STATE_PERIODS = (2, 3)
+SCORE_STATE_COLUMNS = [
+    f"{stat}EnteringP{period}"
+    for period in SCORE_STATE_PERIODS
+    for stat in ("goalsFor", "goalsAgainst", "trailing", "leading")
+]
+
+# Special teams counts per team-game. Power-play goals and opportunities come
+# from the skater strength of each play (penaltiesTaken/penaltiesDrawn are
+# counted alongside the other events)
+SPECIAL_TEAMS_COLUMNS = [
+    "powerPlayGoalsFor",
+    "powerPlayGoalsAgainst",
+    "shortHandedGoalsFor",
+    "shortHandedGoalsAgainst",
+    "powerPlayOpportunities",
+    "penaltyKillOpportunities",
+]
+
+# Per-goalie per-game rows of the goalie table (one per goalie who faced a shot)
+GOALIE_TABLE_COLUMNS = [
+    "gameId", "seasonId", "gameDate", "goalieId", "teamId", "teamAbbrev", "opponentTeamAbbrev", "homeRoad",
+    "shotsAgainst", "saves", "goalsAgainst", "xGoalsAgainst",
+    "highDangerShotsAgainst", "highDangerSaves", "rushShotsAgainst", "rushSaves", "toiSeconds",
+]
+
+REGULATION_PERIOD_SECONDS = 1200
+
+
+def _process_game_plays(
+    game_id: str,
+    pbp: Dict[str, Any],
+    xg_model: ExpectedGoalsModel,
+    shot_rows: List[Dict[str, Any]] | None = None,
+    goalie_rows: List[Dict[str, Any]] | None = None,
+) -> Dict[str, Any]:
     """
     Process all plays from a game to compute advanced metrics.
 
-    Returns team-level statistics for both home and away teams.
+    Returns team-level statistics for both home and away teams, including the
+    score state at the start of periods 2 and 3 (SCORE_STATE_COLUMNS) and the
+    special teams counts (SPECIAL_TEAMS_COLUMNS). When shot_rows
+    is given, one row per shot attempt (see SHOT_TABLE_COLUMNS) is appended to it.
+    When goalie_rows is given, one row per goalie who faced a shot on goal (see
+    GOALIE_TABLE_COLUMNS) is appended to it; shots are charged to the
+    goalieInNetId of the play, so empty-net goals count against no goalie.
     """
     plays = pbp.get("plays", [])
     home_team_id = pbp["homeTeam"]["id"]
@@ -476,16 +561,42 @@ def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoa
         },
     }
 
+    for team_stats in stats.values():
+        team_stats.update(dict.fromkeys(SCORE_STATE_COLUMNS, 0))
+        team_stats.update(dict.fromkeys(SPECIAL_TEAMS_COLUMNS, 0))
+
     home_defending = None
 
+    # Shots are collected during the play loop and scored in a single batch
+    # afterwards; xG is then scattered back into the team aggregates.
+    shot_features: List[ShotFeatures] = []
+    shot_owners: List[Tuple[int, int, bool]] = []  # (acting, opponent, high_danger)
+    shot_goalies: List[Tuple[int | None, bool, bool]] = []  # (goalie in net, goal, rush)
+
+    # Time in net accrues between plays to each team's current goalie while the
+    # situation code has one in; time before a goalie's first shot faced is
+    # credited to them once they are seen (usually the starter)
+    goalie_in_net: Dict[int, int | None] = {home_team_id: None, away_team_id: None}
+    unattributed_toi = {home_team_id: 0, away_team_id: 0}
+    goalie_toi: Dict[Tuple[int, int], int] = {}
+    last_clock = None
+    last_nets = (True, True)
+
     # Track last shot for rebound detection
     last_shot_time = None
     last_shot_team = None
 
+    # Shot-table rebounds follow the xG training definition (any attempt)
+    last_attempt_time = None
+    last_attempt_team = None
+
     # Track last event for rush detection
     last_event_time = 0
     last_event_type = ""
 
+    # Team holding a man advantage as of the previous play (power-play opportunities)
+    last_advantage_team = None
+
     # Process each play
     for play in plays:
         type_key = play.get("typeDescKey", "")
@@ -505,6 +616,33 @@ def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoa
         except:
             current_time_sec = 0
 
+        # Game clock for goalie time on ice (the shootout adds none)
+        if goalie_rows is not None and play.get("periodDescriptor", {}).get("periodType") != "SO":
+            clock = (period - 1) * REGULATION_PERIOD_SECONDS + current_time_sec
+            if last_clock is not None and clock > last_clock:
+                for team_id, in_net in zip((away_team_id, home_team_id), last_nets):
+                    if not in_net:
+                        continue
+                    goalie = goalie_in_net[team_id]
+                    if goalie is None:
+                        unattributed_toi[team_id] += clock - last_clock
+                    else:
+                        goalie_toi[(team_id, goalie)] = goalie_toi.get((team_id, goalie), 0) + clock - last_clock
+            last_clock = clock
+            last_nets = _goalies_in_net(play.get("situationCode"))
+
+        # Man advantage, parsed once per play; a new advantage is a power-play opportunity
+        # (pulling a goalie during it neither ends the advantage nor starts a new one)
+        strength = _skater_strength(play.get("situationCode"))
+        advantage_team = None
+        if strength is not None and strength[0] != strength[1]:
+            advantage_team = home_team_id if strength[1] > strength[0] else away_team_id
+        if advantage_team is not None and advantage_team != last_advantage_team:
+            shorthanded_team = away_team_id if advantage_team == home_team_id else home_team_id
+            stats[advantage_team]["powerPlayOpportunities"] += 1
+            stats[shorthanded_team]["penaltyKillOpportunities"] += 1
+        last_advantage_team = advantage_team
+
         # Skip if no event owner
         if not event_owner:
             continue
@@ -518,6 +656,49 @@ def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoa
             stats[acting_team]["goalsFor"] += 1
             stats[opponent_team]["goalsAgainst"] += 1
 
+            # Special teams goals
+            if advantage_team == acting_team:
+                stats[acting_team]["powerPlayGoalsFor"] += 1
+                stats[opponent_team]["powerPlayGoalsAgainst"] += 1
+            elif advantage_team == opponent_team:
+                stats[acting_team]["shortHandedGoalsFor"] += 1
+                stats[opponent_team]["shortHandedGoalsAgainst"] += 1
+
+            # Score entering each later period
+            for later_period in SCORE_STATE_PERIODS:
+                if period < later_period:
+                    stats[acting_team][f"goalsForEnteringP{later_period}"] += 1
+                    stats[opponent_team][f"goalsAgainstEnteringP{later_period}"] += 1
+
+        # === SHOT TABLE ===
+        features = None
+        if type_key in ["shot-on-goal", "goal"] or (shot_rows is not None and type_key in SHOT_ATTEMPT_TYPES):
+            features = _extract_shot_features(play, home_defending, period, last_event_time, last_event_type)
+
+        if shot_rows is not None and type_key in SHOT_ATTEMPT_TYPES:
+            attempt_rebound = (
+                last_attempt_team == acting_team
+                and last_attempt_time is not None
+                and 0 < current_time_sec - last_attempt_time <= 3
+            )
+            last_attempt_time = current_time_sec
+            last_attempt_team = acting_team
+            shot_rows.append({
+                "gameId": game_id,
+                "teamId": acting_team,
+                "opponentTeamId": opponent_team,
+                "eventType": type_key,
+                "period": period,
+                "timeInPeriod": current_time_sec,
+                "xCoord": details.get("xCoord"),
+                "yCoord": details.get("yCoord"),
+                "situationCode": play.get("situationCode", ""),
+                **features.to_dict(),
+                "is_rebound": int(attempt_rebound),
+                "is_high_danger": int(_is_high_danger_location(features.distance, features.angle)),
+                "is_goal": int(type_key == "goal"),
+            })
+
         # === SHOTS AND xG ===
         if type_key in ["shot-on-goal", "goal"]:
             stats[acting_team]["shotsForPerGame"] += 1
@@ -540,19 +721,27 @@ def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoa
             last_shot_time = current_time_sec
             last_shot_team = acting_team
 
-            # Compute xG
-            features = _extract_shot_features(play, home_defending, period, last_event_time, last_event_type)
-            xg = xg_model.predict_xg(features)
-
-            stats[acting_team]["xGoalsFor"] += xg
-            stats[opponent_team]["xGoalsAgainst"] += xg
+            # Collect features for batched xG scoring
+            is_high_danger = _is_high_danger_location(features.distance, features.angle)
+            shot_features.append(features)
+            shot_owners.append((acting_team, opponent_team, is_high_danger))
+
+            # Charge the shot to the goalie in net (shootout attempts are not
+            # goalie stats; None keeps shot_goalies aligned with shot_owners)
+            goalie_id = details.get("goalieInNetId")
+            if play.get("periodDescriptor", {}).get("periodType") == "SO":
+                goalie_id = None
+            shot_goalies.append((goalie_id, type_key == "goal", features.is_rush_shot))
+            if goalie_rows is not None and goalie_id is not None and goalie_in_net[opponent_team] != goalie_id:
+                if goalie_in_net[opponent_team] is None:
+                    goalie_toi[(opponent_team, goalie_id)] = unattributed_toi[opponent_team]
+                    unattributed_toi[opponent_team] = 0
+                goalie_in_net[opponent_team] = goalie_id
 
             # High-danger shots
-            if _is_high_danger_location(features.distance, features.angle):
+            if is_high_danger:
                 stats[acting_team]["highDangerShotsFor"] += 1
                 stats[opponent_team]["highDangerShotsAgainst"] += 1
-                stats[acting_team]["highDangerxGoalsFor"] += xg
-                stats[opponent_team]["highDangerxGoalsAgainst"] += xg
 
             # Rush shots (within 4s of turnover/faceoff/zone entry)
             if features.is_rush_shot:
@@ -620,6 +809,48 @@ def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoa
             stats[blocking_team]["blockedShotsFor"] += 1  # Defensive blocks
             stats[shooting_team]["blockedShotsAgainst"] += 1  # Offensive shots blocked
 
+    # Score all shots in one model call and scatter xG back to the teams
+    xg_values = xg_model.predict_xg_batch(shot_features) if shot_features else np.zeros(0)
+    for (acting_team, opponent_team, is_high_danger), xg in zip(shot_owners, xg_values):
+        stats[acting_team]["xGoalsFor"] += xg
+        stats[opponent_team]["xGoalsAgainst"] += xg
+        if is_high_danger:
+            stats[acting_team]["highDangerxGoalsFor"] += xg
+            stats[opponent_team]["highDangerxGoalsAgainst"] += xg
+
+    # ... and to the goalies who faced them
+    if goalie_rows is not None:
+        goalies: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for (_, team_id, is_high_danger), (goalie_id, is_goal, is_rush), xg in zip(shot_owners, shot_goalies, xg_values):
+            if goalie_id is None:
+                continue
+            row = goalies.get((team_id, goalie_id))
+            if row is None:
+                team_stats = stats[team_id]
+                row = goalies[(team_id, goalie_id)] = {
+                    "gameId": game_id,
+                    "gameDate": game_date,
+                    "goalieId": goalie_id,
+                    "teamId": team_id,
+                    "teamAbbrev": team_stats["teamAbbrev"],
+                    "opponentTeamAbbrev": team_stats["opponentTeamAbbrev"],
+                    "homeRoad": team_stats["homeRoad"],
+                    **dict.fromkeys(GOALIE_TABLE_COLUMNS[8:], 0),
+                    "xGoalsAgainst": 0.0,
+                    "toiSeconds": goalie_toi.get((team_id, goalie_id), 0),
+                }
+            row["shotsAgainst"] += 1
+            row["goalsAgainst"] += int(is_goal)
+            row["saves"] += int(not is_goal)
+            row["xGoalsAgainst"] += xg
+            if is_high_danger:
+                row["highDangerShotsAgainst"] += 1
+                row["highDangerSaves"] += int(not is_goal)
+            if is_rush:
+                row["rushShotsAgainst"] += 1
+                row["rushSaves"] += int(not is_goal)
+        goalie_rows.extend(goalies.values())
+
     # Compute derived metrics
     for team_id in [home_team_id, away_team_id]:
         s = stats[team_id]
@@ -660,23 +891,242 @@ def _process_game_plays(game_id: str, pbp: Dict[str, Any], xg_model: ExpectedGoa
         # Rush goal conversion (how effective are our rush shots?)
         s["rushGoalConversion"] = (s["rushGoalsFor"] / s["rushShotsFor"] * 100) if s["rushShotsFor"] > 0 else 0.0
 
+        # Trailing / leading at the start of each recorded period
+        for period in SCORE_STATE_PERIODS:
+            margin = s[f"goalsForEnteringP{period}"] - s[f"goalsAgainstEnteringP{period}"]
+            s[f"trailingEnteringP{period}"] = int(margin < 0)
+            s[f"leadingEnteringP{period}"] = int(margin > 0)
+
     return stats
 
 
-def _fetch_games_for_season(season_id: str, client: GamecenterClient) -> List[str]:
-    """Get all game IDs for a season."""
-    # Season format: "20232024" -> use 2023
+# ============================================================================
+# SHOT TABLE
+# ============================================================================
+
+SHOT_ATTEMPT_TYPES = ("shot-on-goal", "goal", "missed-shot", "blocked-shot")
+
+# Columns of the per-shot table written alongside each season's team logs
+SHOT_TABLE_COLUMNS = [
+    "gameId", "seasonId", "teamId", "opponentTeamId", "eventType",
+    "period", "timeInPeriod", "xCoord", "yCoord", "situationCode",
+    "distance", "angle", "shot_type",
+    "is_even_strength", "is_power_play", "is_offensive_zone",
+    "is_rush_shot", "is_third_period", "is_deflection", "is_screened", "is_one_timer",
+    "is_rebound", "is_high_danger", "is_goal",
+]
+
+# Features ingest scores xG with (ShotFeatures.to_dict); is_rebound is not
+# among them, so re-aggregation leaves it out to reproduce ingest exactly
+INGEST_XG_COLUMNS = [
+    "distance", "angle", "shot_type",
+    "is_even_strength", "is_power_play", "is_offensive_zone",
+    "is_rush_shot", "is_third_period", "is_deflection", "is_screened", "is_one_timer",
+]
+
+XG_AGGREGATE_COLUMNS = ["xGoalsFor", "xGoalsAgainst", "highDangerxGoalsFor", "highDangerxGoalsAgainst"]
+
+
+def _get_shot_table_path(season_id: str) -> Path:
+    """Get path to the season's per-shot table."""
+    return CACHE_DIR / f"shots_{season_id}.parquet"
+
+
+def _save_shot_table(season_id: str, shots: pd.DataFrame) -> None:
+    """Save a season's shot table (atomically, like the team-log cache)."""
+    path = _get_shot_table_path(season_id)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    shots.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    LOGGER.info(f"Cached {len(shots)} shots for season {season_id}")
+
+
+def load_shot_table(seasons: List[str]) -> pd.DataFrame:
+    """Load the per-shot tables for the given seasons (missing seasons are skipped)."""
+    frames = [
+        pd.read_parquet(_get_shot_table_path(season_id))
+        for season_id in seasons
+        if _get_shot_table_path(season_id).exists()
+    ]
+    if not frames:
+        return pd.DataFrame(columns=SHOT_TABLE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _get_goalie_table_path(season_id: str) -> Path:
+    """Get path to the season's per-goalie game table."""
+    return CACHE_DIR / f"goalies_{season_id}.parquet"
+
+
+def _save_goalie_table(season_id: str, goalies: pd.DataFrame) -> None:
+    """Save a season's goalie table (atomically, like the team-log cache)."""
+    path = _get_goalie_table_path(season_id)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    goalies.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    LOGGER.info(f"Cached {len(goalies)} goalie games for season {season_id}")
+
+
+def load_goalie_table(seasons: List[str]) -> pd.DataFrame:
+    """Load the per-goalie game tables for the given seasons (missing seasons are skipped)."""
+    frames = [
+        pd.read_parquet(_get_goalie_table_path(season_id))
+        for season_id in seasons
+        if _get_goalie_table_path(season_id).exists()
+    ]
+    if not frames:
+        return pd.DataFrame(columns=GOALIE_TABLE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def xg_training_frame(shots: pd.DataFrame) -> pd.DataFrame:
+    """Select the xG training columns (all shot attempts) from a shot table."""
+    columns = INGEST_XG_COLUMNS + ["is_rebound", "is_goal", "gameId"]
+    return shots[columns].rename(columns={"gameId": "game_id"}).reset_index(drop=True)
+
+
+def aggregate_shot_xg(shots: pd.DataFrame, xg_model: ExpectedGoalsModel) -> pd.DataFrame:
+    """
+    Re-score a shot table and sum xG to team-game level.
+
+    Only shots on goal and goals carry xG at ingest, so the result matches the
+    xGoals*/highDangerxGoals* columns _process_game_plays produces for the same
+    model. Returns one row per (gameId, teamId) that took or faced a shot.
+    """
+    on_goal = shots[shots["eventType"].isin(["shot-on-goal", "goal"])]
+    xg = xg_model.predict_xg_batch(on_goal[INGEST_XG_COLUMNS])
+    scored = pd.DataFrame({
+        "gameId": on_goal["gameId"].to_numpy(),
+        "teamId": on_goal["teamId"].to_numpy(),
+        "opponentTeamId": on_goal["opponentTeamId"].to_numpy(),
+        "xg": xg,
+        "hd_xg": xg * on_goal["is_high_danger"].to_numpy(dtype=float),
+    })
+
+    for_ = scored.groupby(["gameId", "teamId"])[["xg", "hd_xg"]].sum()
+    for_.columns = ["xGoalsFor", "highDangerxGoalsFor"]
+    against = scored.groupby(["gameId", "opponentTeamId"])[["xg", "hd_xg"]].sum()
+    against.columns = ["xGoalsAgainst", "highDangerxGoalsAgainst"]
+    against.index = against.index.set_names(["gameId", "teamId"])
+
+    result = for_.join(against, how="outer").fillna(0.0)
+    return result[XG_AGGREGATE_COLUMNS].reset_index()
+
+
+def rescore_team_logs(team_logs: pd.DataFrame, shots: pd.DataFrame, xg_model: ExpectedGoalsModel) -> pd.DataFrame:
+    """
+    Replace the xG aggregates in team logs with values from a (new) xG model.
+
+    Uses the shot table instead of re-parsing play-by-play; xGoalsPercentage and
+    the goaltending metrics that depend on xGoalsAgainst are recomputed.
+    """
+    aggregates = aggregate_shot_xg(shots, xg_model)
+    logs = team_logs.drop(columns=XG_AGGREGATE_COLUMNS)
+    logs = logs.merge(aggregates, on=["gameId", "teamId"], how="left")
+    logs[XG_AGGREGATE_COLUMNS] = logs[XG_AGGREGATE_COLUMNS].fillna(0.0)
+
+    total_xg = logs["xGoalsFor"] + logs["xGoalsAgainst"]
+    logs["xGoalsPercentage"] = np.where(total_xg > 0, logs["xGoalsFor"] / total_xg.where(total_xg > 0, 1) * 100, 50.0)
+
+    return _compute_goaltending_metrics(logs)
+
+
+# ============================================================================
+# SEASON GAME INDEX
+# ============================================================================
+
+REGULAR_SEASON_GAME_TYPE = 2
+FINAL_GAME_STATES = ("OFF", "FINAL")
+GAME_INDEX_COLUMNS = ["gameId", "gameDate", "gameState", "homeTeamId", "awayTeamId"]
+
+
+def _get_game_index_path(season_id: str) -> Path:
+    """Get path to the cached season game index."""
+    return CACHE_DIR / f"game_index_{season_id}.parquet"
+
+
+def build_season_game_index(season_id: str, client: GamecenterClient) -> pd.DataFrame:
+    """
+    Build the authoritative regular-season game list from the NHL schedule.
+
+    Walks the weekly /schedule endpoint across the season window (~40
+    requests) instead of probing every possible game number, so cancelled or
+    postponed games leave no gaps and unplayed games are known up front.
+    Whether a cached week is refetched is left to the client's schedule
+    freshness policy (settled weeks are immutable).
+
+    Returns:
+        DataFrame with gameId, gameDate, gameState, homeTeamId, awayTeamId
+        (one row per game, sorted by gameId)
+    """
     year = int(season_id[:4])
+    date = pd.Timestamp(f"{year}-09-15")
+    season_end = pd.Timestamp(f"{year + 1}-06-30")
+
+    games: Dict[str, Dict[str, Any]] = {}
+    # Early weeks can still describe the previous season (e.g. the 2020
+    # bubble playoffs in September), so its end date is only trusted once a
+    # game of this season has been seen
+    in_season = False
+
+    while date <= season_end:
+        payload = client.get_schedule(date.strftime("%Y-%m-%d"))
+
+        for day in payload.get("gameWeek", []):
+            for game in day.get("games", []):
+                if game.get("gameType") != REGULAR_SEASON_GAME_TYPE:
+                    continue
+                if str(game.get("season")) != season_id:
+                    continue
+                in_season = True
+                game_id = str(game["id"])
+                games[game_id] = {
+                    "gameId": game_id,
+                    "gameDate": day.get("date", ""),
+                    "gameState": game.get("gameState", ""),
+                    "homeTeamId": game.get("homeTeam", {}).get("id"),
+                    "awayTeamId": game.get("awayTeam", {}).get("id"),
+                }
+
+        if in_season and payload.get("regularSeasonEndDate"):
+            season_end = min(season_end, pd.Timestamp(payload["regularSeasonEndDate"]))
+
+        next_date = pd.Timestamp(payload["nextStartDate"]) if payload.get("nextStartDate") else None
+        date = next_date if next_date is not None and next_date > date else date + pd.Timedelta(days=7)
+
+    index = pd.DataFrame(list(games.values()), columns=GAME_INDEX_COLUMNS)
+    index = index.sort_values("gameId").reset_index(drop=True)
+    LOGGER.info(
+        f"Built game index for season {season_id}: {len(index)} games "
+        f"({index['gameState'].isin(FINAL_GAME_STATES).sum()} final)"
+    )
+    return index
+
+
+def load_season_game_index(season_id: str, client: GamecenterClient, refresh: bool = False) -> pd.DataFrame:
+    """
+    Load the season game index, rebuilding it while the season is in progress.
 
-    # Regular season game IDs: {season}02{game_num}
-    # Typical season has ~1271 games (32 teams * 82 games / 2)
-    game_ids = []
+    A cached index is reused as-is once every game in it is FINAL/OFF.
+    """
+    index_path = _get_game_index_path(season_id)
+
+    if index_path.exists() and not refresh:
+        index = pd.read_parquet(index_path)
+        if not index.empty and index["gameState"].isin(FINAL_GAME_STATES).all():
+            return index
 
-    for game_num in range(1, 1400):
-        game_id = f"{year}02{game_num:04d}"
-        game_ids.append(game_id)
+    index = build_season_game_index(season_id, client)
+    if not index.empty:
+        index.to_parquet(index_path, index=False)
+    return index
 
-    return game_ids
+
+def _fetch_games_for_season(season_id: str, client: GamecenterClient) -> List[str]:
+    """Get IDs of all completed (FINAL/OFF) regular-season games for a season."""
+    index = load_season_game_index(season_id, client)
+    final_games = index[index["gameState"].isin(FINAL_GAME_STATES)]
+    return final_games["gameId"].tolist()
 
 
 def _load_cached_xg_model() -> ExpectedGoalsModel | None:
@@ -719,18 +1169,257 @@ def _load_cached_season(season_id: str) -> pd.DataFrame | None:
 
 
 def _save_season_cache(season_id: str, df: pd.DataFrame) -> None:
-    """Save season data to cache."""
+    """Save season data to cache (atomically, so readers never see a partial file)."""
     cache_path = _get_season_cache_path(season_id)
-    df.to_parquet(cache_path, index=False)
+    tmp_path = cache_path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
     LOGGER.info(f"Cached {len(df)} team-games for season {season_id}")
 
 
-def load_native_game_logs(seasons: List[str]) -> pd.DataFrame:
+def _get_xg_model(client: GamecenterClient) -> ExpectedGoalsModel:
+    """Load the cached xG model, training (and caching) a new one if needed."""
+    xg_model = _load_cached_xg_model()
+    if xg_model is not None:
+        return xg_model
+
+    LOGGER.info("No cached xG model found - training new model...")
+
+    # Get training games from earlier seasons (use fewer games for speed)
+    # Sample ~200 games from 2021-2022 season should give us ~50K shots
+    training_game_ids = []
+    for train_season in ["20212022"]:
+        season_games = _fetch_games_for_season(train_season, client)[:200]  # 200 games = ~50K shots
+        training_game_ids.extend(season_games)
+
+    LOGGER.info(f"Training xG model on {len(training_game_ids)} games...")
+
+    # Build training data, from the shot table when that season has one
+    shots = load_shot_table(["20212022"])
+    if not shots.empty:
+        training_data = xg_training_frame(shots[shots["gameId"].isin(training_game_ids)])
+    else:
+        training_data = _build_xg_training_data(training_game_ids, client)
+
+    # Train model
+    sklearn_model = _train_xg_model(training_data)
+
+    # Cache model
+    _save_xg_model(sklearn_model)
+
+    return ExpectedGoalsModel(sklearn_model)
+
+
+def _collect_season_rows(
+    season_id: str,
+    game_ids: List[str],
+    client: GamecenterClient,
+    xg_model: ExpectedGoalsModel,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Process games in order, returning (team-game rows, shot rows, goalie rows)."""
+    season_team_games = []
+    season_shots: List[Dict[str, Any]] = []
+    season_goalies: List[Dict[str, Any]] = []
+
+    # Play-by-play downloads run ahead on worker threads while this loop parses
+    for i, (game_id, pbp) in enumerate(client.iter_play_by_play(game_ids)):
+        if i % 100 == 0:
+            LOGGER.info(f"Processing game {i+1}/{len(game_ids)} in season {season_id}")
+
+        if pbp is None:
+            continue
+
+        try:
+            # Payloads cached before the game finished are stale - refetch
+            if pbp.get("gameState") not in FINAL_GAME_STATES:
+                pbp = client.get_play_by_play(game_id, use_cache=False)
+
+            # Process game
+            game_shots: List[Dict[str, Any]] = []
+            game_goalies: List[Dict[str, Any]] = []
+            game_stats = _process_game_plays(game_id, pbp, xg_model, shot_rows=game_shots, goalie_rows=game_goalies)
+
+            # Add both team stats to list
+            for team_id, team_stats in game_stats.items():
+                team_stats["seasonId"] = season_id
+                season_team_games.append(team_stats)
+            for row in game_shots + game_goalies:
+                row["seasonId"] = season_id
+            season_shots.extend(game_shots)
+            season_goalies.extend(game_goalies)
+
+        except Exception as e:
+            LOGGER.warning(f"Error processing game {game_id}: {str(e)[:100]}")
+
+    return season_team_games, season_shots, season_goalies
+
+
+# Per-process state for season worker pools (set once by _init_season_worker)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_season_worker(
+    model: HistGradientBoostingClassifier,
+    cache_root: Path,
+    cache_backend: str,
+    rate_limit_seconds: float,
+) -> None:
+    """Load the xG model and open the payload cache once per worker process."""
+    _WORKER_STATE["xg_model"] = ExpectedGoalsModel(model)
+    _WORKER_STATE["client"] = GamecenterClient(
+        cache=open_cache(cache_root, backend=cache_backend),
+        rate_limit_seconds=rate_limit_seconds,
+        max_workers=1,
+    )
+
+
+def _process_game_chunk(
+    season_id: str, game_ids: List[str]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Worker entry point: process a contiguous chunk of a season's games."""
+    return _collect_season_rows(season_id, game_ids, _WORKER_STATE["client"], _WORKER_STATE["xg_model"])
+
+
+def _collect_season_rows_parallel(
+    season_id: str,
+    game_ids: List[str],
+    client: GamecenterClient,
+    xg_model: ExpectedGoalsModel,
+    workers: int,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Process a season's games across a process pool.
+
+    Downloads happen up front in this process so the shared rate limiter still
+    governs every request; workers then only read the payload cache. Games are
+    split into contiguous chunks and merged back in chunk order, so the result
+    is identical to the serial path.
+    """
+    available = client.prefetch(game_ids)
+    LOGGER.info(f"Prefetched {available}/{len(game_ids)} games for season {season_id}")
+
+    # A few chunks per worker keeps the pool balanced without much overhead
+    chunk_size = max(1, math.ceil(len(game_ids) / (workers * 4)))
+    chunks = [game_ids[i:i + chunk_size] for i in range(0, len(game_ids), chunk_size)]
+
+    cache_backend = "packed" if isinstance(client.cache, PackedCache) else "json"
+
+    season_team_games: List[Dict[str, Any]] = []
+    season_shots: List[Dict[str, Any]] = []
+    season_goalies: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_season_worker,
+        initargs=(xg_model.model, client.cache.root, cache_backend, client.rate_limit_seconds),
+    ) as executor:
+        for team_games, shots, goalies in executor.map(partial(_process_game_chunk, season_id), chunks):
+            season_team_games.extend(team_games)
+            season_shots.extend(shots)
+            season_goalies.extend(goalies)
+
+    return season_team_games, season_shots, season_goalies
+
+
+def _process_season_games(
+    season_id: str,
+    game_ids: List[str],
+    client: GamecenterClient,
+    xg_model: ExpectedGoalsModel,
+    workers: int = 1,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Aggregate the given games to team-game rows (goaltending metrics not yet applied).
+
+    With workers > 1 the games are processed on a process pool (see
+    _collect_season_rows_parallel); the output does not depend on workers.
+
+    Returns (team_games, shots, goalies): the season's per-shot and
+    per-goalie game tables come out of the same pass.
+    """
+    if workers > 1 and len(game_ids) > 1:
+        team_games, shots, goalies = _collect_season_rows_parallel(season_id, game_ids, client, xg_model, workers)
+    else:
+        team_games, shots, goalies = _collect_season_rows(season_id, game_ids, client, xg_model)
+
+    return (
+        pd.DataFrame(team_games),
+        pd.DataFrame(shots, columns=SHOT_TABLE_COLUMNS),
+        pd.DataFrame(goalies, columns=GOALIE_TABLE_COLUMNS),
+    )
+
+
+def _predates_ingest_columns(cached_df: pd.DataFrame) -> bool:
+    """Whether a cached season was saved before ingest recorded period scores and special teams counts."""
+    columns = [*SCORE_STATE_COLUMNS, *SPECIAL_TEAMS_COLUMNS]
+    return not set(columns).issubset(cached_df.columns) or bool(cached_df[columns].isna().any(axis=None))
+
+
+def _append_new_games(
+    season_id: str,
+    cached_df: pd.DataFrame,
+    client: GamecenterClient,
+    get_model: Callable[[], ExpectedGoalsModel],
+) -> pd.DataFrame:
+    """
+    Top up a cached season with FINAL games it does not contain yet.
+
+    Only the missing games are processed, and goaltending metrics are recomputed
+    only for the teams that played them (they are season-to-date running totals,
+    so other teams' rows are unaffected). The season's shot and goalie tables
+    are extended too when they exist. Raises ValueError for a cache saved
+    before ingest recorded period scores and special teams counts: new rows
+    would carry them and the old ones would not, so rebuild the season instead.
+    """
+    if _predates_ingest_columns(cached_df):
+        raise ValueError(
+            f"Season {season_id} was cached before ingest recorded period scores and special teams counts; "
+            "rebuild it instead of appending"
+        )
+
+    final_ids = _fetch_games_for_season(season_id, client)
+    known_ids = set(cached_df["gameId"].astype(str))
+    missing_ids = [game_id for game_id in final_ids if game_id not in known_ids]
+
+    if not missing_ids:
+        return cached_df
+
+    LOGGER.info(f"Appending {len(missing_ids)} new games to cached season {season_id}")
+    new_df, new_shots, new_goalies = _process_season_games(season_id, missing_ids, client, get_model())
+    if new_df.empty:
+        return cached_df
+
+    combined = pd.concat([cached_df, new_df], ignore_index=True)
+    affected = combined["teamId"].isin(new_df["teamId"].unique())
+    combined = pd.concat(
+        [combined[~affected], _compute_goaltending_metrics(combined[affected])],
+        ignore_index=True,
+    )
+    combined = combined.sort_values(["teamId", "gameDate"]).reset_index(drop=True)
+
+    _save_season_cache(season_id, combined)
+
+    # Seasons cached before shot/goalie tables existed need a full rebuild to get them
+    processed_ids = new_df["gameId"].unique()
+    shot_path = _get_shot_table_path(season_id)
+    if shot_path.exists():
+        shots = pd.read_parquet(shot_path)
+        shots = shots[~shots["gameId"].isin(processed_ids)]
+        _save_shot_table(season_id, pd.concat([shots, new_shots], ignore_index=True))
+    goalie_path = _get_goalie_table_path(season_id)
+    if goalie_path.exists():
+        goalies = pd.read_parquet(goalie_path)
+        goalies = goalies[~goalies["gameId"].isin(processed_ids)]
+        _save_goalie_table(season_id, pd.concat([goalies, new_goalies], ignore_index=True))
+
+    return combined
+
+
+def load_native_game_logs(seasons: List[str], incremental: bool = False, workers: int = 1) -> pd.DataFrame:
     """
     Load game logs from native NHL API data for multiple seasons.
 
     This replaces MoneyPuck data by:
-    1. Fetching play-by-play data from NHL API
+    1. Fetching play-by-play data for completed games (from the season game index)
     2. Computing xG using our own model
     3. Computing Corsi/Fenwick/high-danger metrics
     4. Aggregating to team-game level
@@ -739,6 +1428,10 @@ def load_native_game_logs(seasons: List[str]) -> pd.DataFrame:
 
     Args:
         seasons: List of season IDs (e.g., ["20212022", "20222023"])
+        incremental: Also top up cached seasons with newly completed games
+            (daily runs during the season) instead of serving them as-is
+        workers: Number of processes used to parse and score each season
+            that has to be built from scratch
 
     Returns:
         DataFrame with team-game logs matching MoneyPuck schema
@@ -746,116 +1439,75 @@ def load_native_game_logs(seasons: List[str]) -> pd.DataFrame:
     LOGGER.info(f"Loading native game logs for seasons: {seasons}")
 
     # Try to load cached data for each season
-    season_dataframes = []
+    cached_seasons: Dict[str, pd.DataFrame] = {}
     seasons_to_fetch = []
 
     for season_id in seasons:
         cached_df = _load_cached_season(season_id)
         if cached_df is not None:
-            season_dataframes.append(cached_df)
+            cached_seasons[season_id] = cached_df
         else:
             seasons_to_fetch.append(season_id)
 
     # If all seasons are cached, combine and return
-    if not seasons_to_fetch:
+    if not seasons_to_fetch and not incremental:
         LOGGER.info("All seasons loaded from cache!")
+        season_dataframes = list(cached_seasons.values())
         return pd.concat(season_dataframes, ignore_index=True) if season_dataframes else pd.DataFrame()
 
-    # Otherwise, fetch missing seasons from NHL API
-    LOGGER.info(f"Fetching {len(seasons_to_fetch)} seasons from NHL API: {seasons_to_fetch}")
-
     # Use slower rate limiting to avoid 503 errors
     client = GamecenterClient(rate_limit_seconds=1.0)
 
-    # Load or train xG model
-    xg_model = _load_cached_xg_model()
-
-    if xg_model is None:
-        LOGGER.info("No cached xG model found - training new model...")
-
-        # Get training games from earlier seasons (use fewer games for speed)
-        # Sample ~200 games from 2021-2022 season should give us ~50K shots
-        training_game_ids = []
-        for train_season in ["20212022"]:
-            season_games = _fetch_games_for_season(train_season, client)[:200]  # 200 games = ~50K shots
-            training_game_ids.extend(season_games)
-
-        LOGGER.info(f"Training xG model on {len(training_game_ids)} games...")
-
-        # Build training data
-        training_data = _build_xg_training_data(training_game_ids, client)
+    # Load or train the xG model only once a game actually needs scoring
+    xg_model: ExpectedGoalsModel | None = None
 
-        # Train model
-        sklearn_model = _train_xg_model(training_data)
+    def get_model() -> ExpectedGoalsModel:
+        nonlocal xg_model
+        if xg_model is None:
+            xg_model = _get_xg_model(client)
+        return xg_model
 
-        # Cache model
-        _save_xg_model(sklearn_model)
+    if incremental:
+        for season_id, cached_df in list(cached_seasons.items()):
+            if _predates_ingest_columns(cached_df):
+                LOGGER.warning(f"Season {season_id} was cached with an older schema; rebuilding it")
+                del cached_seasons[season_id]
+                seasons_to_fetch.append(season_id)
+            else:
+                cached_seasons[season_id] = _append_new_games(season_id, cached_df, client, get_model)
 
-        xg_model = ExpectedGoalsModel(sklearn_model)
+    if seasons_to_fetch:
+        LOGGER.info(f"Fetching {len(seasons_to_fetch)} seasons from NHL API: {seasons_to_fetch}")
 
     # Process requested seasons that need to be fetched
+    fetched_seasons: Dict[str, pd.DataFrame] = {}
     for season_id in seasons_to_fetch:
         LOGGER.info(f"Processing season {season_id}...")
 
-        season_team_games = []
-
         game_ids = _fetch_games_for_season(season_id, client)
-        consecutive_errors = 0
-        max_consecutive_errors = 10  # Stop after 10 consecutive failures
-
-        for i, game_id in enumerate(game_ids):
-            if i % 100 == 0:
-                LOGGER.info(f"Processing game {i+1}/{len(game_ids)} in season {season_id}")
-
-            try:
-                pbp = client.get_play_by_play(game_id)
-
-                # Skip if game not played yet
-                if pbp.get("gameState") not in ["OFF", "FINAL"]:
-                    consecutive_errors += 1
-                    if consecutive_errors >= max_consecutive_errors:
-                        LOGGER.info(f"Reached unplayed games, processed {len(all_team_games)} team-games so far")
-                        break
-                    continue
-
-                # Successfully processed game - reset error counter
-                consecutive_errors = 0
-
-                # Process game
-                game_stats = _process_game_plays(game_id, pbp, xg_model)
-
-                # Add both team stats to list
-                for team_id, team_stats in game_stats.items():
-                    team_stats["seasonId"] = season_id
-                    season_team_games.append(team_stats)
+        LOGGER.info(f"Found {len(game_ids)} completed games in season {season_id}")
 
-            except Exception as e:
-                consecutive_errors += 1
-                error_msg = str(e)
-
-                # Log first few errors for debugging
-                if i < 20:
-                    LOGGER.warning(f"Error processing game {game_id}: {error_msg[:100]}")
-
-                # Stop if we hit too many consecutive errors (likely end of season or API issues)
-                if consecutive_errors >= max_consecutive_errors:
-                    LOGGER.info(f"Stopped after {consecutive_errors} consecutive errors. Processed {len(season_team_games)} team-games.")
-                    break
-
-        # Convert season data to DataFrame
-        season_df = pd.DataFrame(season_team_games)
+        season_df, season_shots, season_goalies = _process_season_games(
+            season_id, game_ids, client, get_model(), workers=workers
+        )
 
         if not season_df.empty:
             # Compute goaltending metrics for this season
             season_df = _compute_goaltending_metrics(season_df)
 
-            # Cache this season for future runs
+            # Cache this season (and its shot and goalie tables) for future runs
             _save_season_cache(season_id, season_df)
+            _save_shot_table(season_id, season_shots)
+            _save_goalie_table(season_id, season_goalies)
 
-            # Add to list of all seasons
-            season_dataframes.append(season_df)
+            fetched_seasons[season_id] = season_df
 
-    # Combine all seasons (cached + newly fetched)
+    # Combine all seasons (cached + newly fetched) in the requested order
+    season_dataframes = [
+        cached_seasons.get(season_id, fetched_seasons.get(season_id))
+        for season_id in seasons
+        if season_id in cached_seasons or season_id in fetched_seasons
+    ]
     if not season_dataframes:
         LOGGER.warning("No games found - returning empty DataFrame")
         return pd.DataFrame()
@@ -14,7 +14,8 @@ from datetime import datetime
 from typing import List, Dict, Optional
 import pandas as pd
 import logging
-import time
+
+from .data_sources.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -23,23 +24,12 @@ SCHEDULE_API = "https://api-web.nhle.com/v1/schedule"
 TEAM_SUMMARY_API = "https://api.nhle.com/stats/rest/en/team/summary"
 GAME_API = "https://api-web.nhle.com/v1/gamecenter"
 
-# Rate limiting
-_last_request_time = 0
-_min_request_interval = 0.5  # seconds between requests
-
-
+# Requests go through the shared pooled client, which applies per-host rate
+# limits and retries transient 429/5xx failures with backoff.
 _default_headers = {
     'User-Agent': 'Mozilla/5.0 (compatible; PuckCast/1.0; +https://puckcast.ai)'
 }
 
-def _rate_limit():
-    """Ensure we don't hammer the API."""
-    global _last_request_time
-    elapsed = time.time() - _last_request_time
-    if elapsed < _min_request_interval:
-        time.sleep(_min_request_interval - elapsed)
-    _last_request_time = time.time()
-
 
 def fetch_schedule(date: str) -> List[Dict]:
     """
@@ -61,13 +51,11 @@ def fetch_schedule(date: str) -> List[Dict]:
     - Only returns metadata (teams, venue, time)
     - Does NOT return scores or in-game statistics
     """
-    _rate_limit()
-    
     url = f"{SCHEDULE_API}/{date}"
     logger.info(f"Fetching schedule from: {url}")
     
     try:
-        response = requests.get(url, headers=_default_headers, timeout=10)
+        response = get_http_client().get(url, headers=_default_headers, timeout=10)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch schedule for {date}: {e}")
@@ -180,15 +168,13 @@ def fetch_team_special_teams(season_id: str = '20242025') -> pd.DataFrame:
     CURRENT season stats. For training data, use the native ingest system which
     processes historical play-by-play data.
     """
-    _rate_limit()
-    
     url = TEAM_SUMMARY_API
     params = {'cayenneExp': f'seasonId={season_id}'}
     
     logger.info(f"Fetching special teams data for season {season_id}")
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_http_client().get(url, params=params, timeout=10)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch team summary: {e}")
@@ -246,12 +232,10 @@ def fetch_starting_goalies(game_id: int) -> Optional[Dict]:
     For predictions made earlier, you'll need to use each team's likely starter
     based on recent games or rotation patterns.
     """
-    _rate_limit()
-    
     url = f"{GAME_API}/{game_id}/landing"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = get_http_client().get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         
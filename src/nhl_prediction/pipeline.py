@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List, Dict
+from typing import Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
 from .data_ingest import build_game_dataframe, fetch_multi_season_logs
-from .features import ROLL_WINDOWS, engineer_team_features
+from .elo import elo_ratings
+from .feature_registry import FeaturePlan, FeatureRegistry
+from .features import ROLL_WINDOWS, TEAM_FEATURES, engineer_team_features
+from .memory import StageMemory, downcast_frame
+from .situational_features import SITUATIONAL_FEATURES
 
 
 @dataclass(frozen=True)
@@ -19,14 +23,149 @@ class Dataset:
     target: pd.Series
 
 
-def build_dataset(seasons: Iterable[str]) -> Dataset:
-    """Fetch data, engineer features, and prepare modelling matrix."""
-    raw_logs = fetch_multi_season_logs(seasons)
-    enriched_logs = engineer_team_features(raw_logs)
-    games = build_game_dataframe(enriched_logs)
-    games = _add_elo_features(games)
+# Game-stage feature families, run on the matchup frame once the team-log
+# features (features.TEAM_FEATURES) are merged in as *_home / *_away columns.
+GAME_FEATURES = FeatureRegistry("game")
+
+# Team-log columns every game row needs (merge keys, scores, team identity for
+# Elo, dummies and the situational features), kept by low_memory projection
+MERGE_KEY_COLUMNS: Sequence[str] = (
+    "gameId",
+    "gameDate",
+    "seasonId",
+    "teamId",
+    "teamAbbrev",
+    "opponentTeamAbbrev",
+    "homeRoad",
+    "goalsFor",
+    "goalsAgainst",
+    "trailingEnteringP3",
+)
+LOW_MEMORY_CATEGORICALS: Sequence[str] = ("teamId", "teamAbbrev", "opponentTeamAbbrev", "homeRoad")
+
+
+def build_dataset(
+    seasons: Iterable[str],
+    incremental: bool = False,
+    features: Optional[Sequence[str]] = None,
+    low_memory: bool = False,
+) -> Dataset:
+    """
+    Fetch data, engineer features, and prepare modelling matrix.
+
+    With incremental=True, cached seasons are topped up with newly completed games.
+
+    features names the model columns wanted (e.g. the curated V70_FEATURES):
+    only the team and game feature families they depend on are computed, and
+    Dataset.features holds those columns in request order. Names produced by
+    later stages (situational features, league-wide rates) only contribute
+    their dependencies; the caller adds them.
+
+    low_memory is for building many seasons in small containers: counts are
+    stored as int16/int32 and rates as float32, the team logs are engineered
+    in place rather than copied, and only the merge keys plus the columns
+    behind the requested features are carried into the home/away merge (so
+    Dataset.games has no other raw stats), with team IDs and abbreviations
+    as categoricals. Peak RSS is logged after each stage.
+    """
+    memory = StageMemory(enabled=low_memory)
+    logs = fetch_multi_season_logs(seasons, incremental=incremental)
+    if low_memory:
+        logs = downcast_frame(logs)
+    memory.mark("fetch")
+
+    if features is None:
+        team_features, game_plan = None, GAME_FEATURES.resolve()
+    else:
+        features = list(dict.fromkeys(features))
+        team_features, game_plan = _plan_features(features)
+
+    logs = engineer_team_features(logs, features=team_features, copy=not low_memory)
+    if low_memory:
+        if features is None:
+            merged = [*_default_feature_bases(ROLL_WINDOWS), *DEFAULT_ADDITIONAL_FEATURES, "rest_days"]
+        else:
+            merged = [*features, *team_features]
+        logs = downcast_frame(_project_for_merge(logs, merged), categorical_columns=LOW_MEMORY_CATEGORICALS)
+    memory.mark("engineer_team_features")
+
+    # gameId breaks same-day ties so row order does not depend on which families run
+    games = build_game_dataframe(logs).sort_values(["gameDate", "gameId"], kind="stable")
+    del logs
+    memory.mark("build_game_dataframe")
+
+    if features is None:
+        games, diff_columns = _add_diff_features(games, _default_feature_bases(ROLL_WINDOWS))
+    else:
+        games, _ = _add_diff_features(games, [name[: -len("_diff")] for name in features if name.endswith("_diff")])
+
+    for family in game_plan.families:
+        games = family.producer(games)
+    if low_memory:
+        games = downcast_frame(games)
+    memory.mark("game_features")
+
+    if features is None:
+        feature_columns = diff_columns + _default_game_feature_columns(games)
+    else:
+        feature_columns = [name for name in features if name in games.columns]
+
+    features = games[feature_columns].fillna(0.0)
+    target = games["home_win"]
+    memory.mark("feature_matrix")
+    return Dataset(games=games, features=features, target=target)
+
+
+def _project_for_merge(logs: pd.DataFrame, requested: Iterable[str]) -> pd.DataFrame:
+    """The merge keys plus the team-log columns behind the requested model columns."""
+    columns = list(MERGE_KEY_COLUMNS)
+    for name in requested:
+        columns.append(name)
+        for suffix in ("_diff", "_home", "_away"):
+            if name.endswith(suffix):
+                columns.append(name[: -len(suffix)])
+    keep = set(columns)
+    return logs.drop(columns=[column for column in logs.columns if column not in keep])
+
+
+def _plan_features(features: Sequence[str]) -> Tuple[List[str], FeaturePlan]:
+    """
+    Team features and game families needed for the requested model columns.
+
+    Game-level names resolve through GAME_FEATURES, and situational names
+    through SITUATIONAL_FEATURES for their dependencies; everything else is a
+    team feature, requested directly or as its _diff / _home / _away column.
+    """
+    situational = SITUATIONAL_FEATURES.resolve(name for name in features if name in SITUATIONAL_FEATURES)
+    needed = [*features, *sorted(situational.external)]
+    game_plan = GAME_FEATURES.resolve(name for name in needed if name in GAME_FEATURES)
+
+    team_features: List[str] = []
+    for name in [*needed, *sorted(game_plan.external)]:
+        for suffix in ("_diff", "_home", "_away"):
+            if name.endswith(suffix) and name[: -len(suffix)] in TEAM_FEATURES:
+                name = name[: -len(suffix)]
+                break
+        if name in TEAM_FEATURES and name not in team_features:
+            team_features.append(name)
+    return team_features, game_plan
+
+
+def _add_diff_features(games: pd.DataFrame, bases: Iterable[str]) -> Tuple[pd.DataFrame, List[str]]:
+    """Add home-minus-away {base}_diff columns for numeric team features, in one concat."""
+    diffs = {}
+    for base in bases:
+        home_col = f"{base}_home"
+        away_col = f"{base}_away"
+        if home_col in games.columns and away_col in games.columns:
+            if np.issubdtype(games[home_col].dtype, np.number) and np.issubdtype(games[away_col].dtype, np.number):
+                diffs[f"{base}_diff"] = games[home_col] - games[away_col]
+    games = pd.concat([games.drop(columns=list(diffs), errors="ignore"), pd.DataFrame(diffs, index=games.index)], axis=1)
+    return games, list(diffs)
 
-    rolling_windows = ROLL_WINDOWS
+
+def _default_feature_bases(rolling_windows: Iterable[int]) -> List[str]:
+    """Team features turned into home-minus-away differentials for the full feature matrix."""
     feature_bases: List[str] = [
         "season_win_pct",
         "season_goal_diff_avg",
@@ -65,6 +204,10 @@ def build_dataset(seasons: Iterable[str]) -> Dataset:
         "goalie_rolling_gsa",
         "goalie_trend_score",
         "team_injury_count",
+        # Head-to-head matchup history
+        "h2h_win_pct",
+        "h2h_goal_diff",
+        "h2h_games_played",
         # NEW: xGoals season averages
         "season_xg_for_avg",
         "season_xg_against_avg",
@@ -123,91 +266,57 @@ def build_dataset(seasons: Iterable[str]) -> Dataset:
             ]
         )
 
-    feature_columns: List[str] = []
-    for base in feature_bases:
-        home_col = f"{base}_home"
-        away_col = f"{base}_away"
-        if home_col in games.columns and away_col in games.columns:
-            if np.issubdtype(games[home_col].dtype, np.number) and np.issubdtype(games[away_col].dtype, np.number):
-                diff_col = f"{base}_diff"
-                games[diff_col] = games[home_col] - games[away_col]
-                feature_columns.append(diff_col)
-
-    additional_features = [
-        "games_played_prior_home",
-        "games_played_prior_away",
-        "rest_days_home",
-        "rest_days_away",
-        "games_last_3d_home",
-        "games_last_3d_away",
-        "games_last_6d_home",
-        "games_last_6d_away",
-        "is_b2b_home",
-        "is_b2b_away",
-        "elo_diff_pre",
-        "elo_expectation_home",
-        "team_altitude_ft_home",
-        "team_altitude_ft_away",
-        "altitude_diff_home",
-        "altitude_diff_away",
-        "is_high_altitude_home",
-        "is_high_altitude_away",
-        "consecutive_home_prior_home",
-        "consecutive_home_prior_away",
-        "consecutive_away_prior_home",
-        "consecutive_away_prior_away",
-        "travel_burden_home",
-        "travel_burden_away",
-    ]
-    for feat in additional_features:
-        if feat in games.columns:
-            feature_columns.append(feat)
+    return feature_bases
+
+
+# Per-side and game-level columns of the full feature matrix, after the differentials
+DEFAULT_ADDITIONAL_FEATURES: List[str] = [
+    "games_played_prior_home",
+    "games_played_prior_away",
+    "rest_days_home",
+    "rest_days_away",
+    "games_last_3d_home",
+    "games_last_3d_away",
+    "games_last_6d_home",
+    "games_last_6d_away",
+    "is_b2b_home",
+    "is_b2b_away",
+    "elo_diff_pre",
+    "elo_expectation_home",
+    "team_altitude_ft_home",
+    "team_altitude_ft_away",
+    "altitude_diff_home",
+    "altitude_diff_away",
+    "is_high_altitude_home",
+    "is_high_altitude_away",
+    "consecutive_home_prior_home",
+    "consecutive_home_prior_away",
+    "consecutive_away_prior_home",
+    "consecutive_away_prior_away",
+    "travel_burden_home",
+    "travel_burden_away",
+]
+
+
+def _default_game_feature_columns(games: pd.DataFrame) -> List[str]:
+    """Per-side and game-level columns of the full feature matrix, after the differentials."""
+    feature_columns = [feat for feat in DEFAULT_ADDITIONAL_FEATURES if feat in games.columns]
 
     # NOTE: Special teams matchup features removed because MoneyPuck doesn't provide
     # game-by-game PP%/PK%. Would need season-long calculation which isn't accurate.
     # xGoals features provide better shot quality signal anyway.
 
-    # Rest-based features.
-    def _rest_bucket(days: float) -> str:
-        if pd.isna(days):
-            return "no_prev"
-        if days <= 1:
-            return "b2b"
-        if days == 2:
-            return "one_day"
-        if days == 3:
-            return "two_days"
-        return "three_plus"
-
-    games["rest_bucket_home"] = games["rest_days_home"].apply(_rest_bucket)
-    games["rest_bucket_away"] = games["rest_days_away"].apply(_rest_bucket)
-    games["rest_diff"] = games["rest_days_home"] - games["rest_days_away"]
-    games["home_b2b"] = (games["rest_bucket_home"] == "b2b").astype(int)
-    games["away_b2b"] = (games["rest_bucket_away"] == "b2b").astype(int)
     feature_columns.extend(["rest_diff", "home_b2b", "away_b2b"])
-
-    games = pd.get_dummies(
-        games,
-        columns=["rest_bucket_home", "rest_bucket_away"],
-        prefix=["rest_home", "rest_away"],
-        dtype=int,
-    )
-    rest_dummy_cols = [
+    feature_columns.extend(
         col for col in games.columns if col.startswith("rest_home_") or col.startswith("rest_away_")
-    ]
-    feature_columns.extend(rest_dummy_cols)
-
-    home_team_dummies = pd.get_dummies(games["teamId_home"], prefix="home_team", dtype=int)
-    away_team_dummies = pd.get_dummies(games["teamId_away"], prefix="away_team", dtype=int)
-    games = pd.concat([games, home_team_dummies, away_team_dummies], axis=1)
-    feature_columns.extend(home_team_dummies.columns.tolist())
-    feature_columns.extend(away_team_dummies.columns.tolist())
-
-    features = games[feature_columns].fillna(0.0)
-    target = games["home_win"]
-    return Dataset(games=games, features=features, target=target)
+    )
+    feature_columns.extend(
+        col for col in games.columns if col.startswith("home_team_") or col.startswith("away_team_")
+    )
+    return feature_columns
 
 
+@GAME_FEATURES.family("elo", outputs=("elo_home_pre", "elo_away_pre", "elo_diff_pre", "elo_expectation_home"))
 def _add_elo_features(
     games: pd.DataFrame,
     base_rating: float = 1500.0,
@@ -244,70 +353,73 @@ def _add_elo_features(
         home_adv_window: Number of games for rolling home win rate calculation.
         home_adv_scale: Multiplier for converting home win rate to Elo points.
     """
-    games = games.sort_values("gameDate").copy()
-    elo_home: List[float] = []
-    elo_away: List[float] = []
-    expected_home_probs: List[float] = []
-
-    current_season: str | None = None
-    ratings: Dict[int, float] = {}
-    prev_season_ratings: Dict[int, float] = {}
-
-    # V8.5: Track recent home wins for dynamic home advantage
-    recent_home_wins: List[int] = []
-    HISTORICAL_HW = 0.535  # Historical league home win rate
-
-    for _, row in games.iterrows():
-        season = row["seasonId"]
-        if season != current_season:
-            # Save previous season ratings before transition
-            if current_season is not None:
-                prev_season_ratings = ratings.copy()
-            current_season = season
-            # Apply season carryover (regress toward mean)
-            if season_carryover > 0 and prev_season_ratings:
-                ratings = {
-                    team: base_rating + season_carryover * (rating - base_rating)
-                    for team, rating in prev_season_ratings.items()
-                }
-            else:
-                ratings = {}
-
-        home_id = int(row["teamId_home"])
-        away_id = int(row["teamId_away"])
-
-        home_rating = ratings.get(home_id, base_rating)
-        away_rating = ratings.get(away_id, base_rating)
-
-        elo_home.append(home_rating)
-        elo_away.append(away_rating)
-
-        # V8.2: Calculate dynamic home advantage based on recent home win rate
-        if dynamic_home_advantage and len(recent_home_wins) >= 25:
-            recent_hw_rate = np.mean(recent_home_wins[-home_adv_window:])
-            # Convert home win rate to Elo points: 50% = 0 pts, 53.5% ≈ 24.5 pts (with scale=700)
-            current_home_adv = (recent_hw_rate - 0.5) * home_adv_scale
-            # Clamp to reasonable range (0-70 points)
-            current_home_adv = max(0.0, min(70.0, current_home_adv))
-        else:
-            current_home_adv = home_advantage
-
-        expected_home = 1.0 / (1.0 + 10 ** ((away_rating - (home_rating + current_home_adv)) / 400))
-        expected_home_probs.append(expected_home)
-
-        outcome_home = 1.0 if row["home_win"] == 1 else 0.0
-        recent_home_wins.append(int(row["home_win"]))
-
-        goal_diff = row["home_score"] - row["away_score"]
-        margin = max(abs(goal_diff), 1)
-        multiplier = np.log(margin + 1) * (2.2 / ((abs(home_rating - away_rating) * 0.001) + 2.2))
-        delta = k_factor * multiplier * (outcome_home - expected_home)
-
-        ratings[home_id] = home_rating + delta
-        ratings[away_id] = away_rating - delta
+    # gameId breaks same-day ties so the home-win window (and TeamStateStore) see a fixed order
+    games = games.sort_values(["gameDate", "gameId"], kind="stable").copy()
+    elo_home, elo_away, expected_home_probs = elo_ratings(
+        games["seasonId"].to_numpy(),
+        games["teamId_home"].to_numpy(),
+        games["teamId_away"].to_numpy(),
+        games["home_score"].to_numpy(),
+        games["away_score"].to_numpy(),
+        games["home_win"].to_numpy(),
+        base_rating=base_rating,
+        k_factor=k_factor,
+        home_advantage=home_advantage,
+        season_carryover=season_carryover,
+        dynamic_home_advantage=dynamic_home_advantage,
+        home_adv_window=home_adv_window,
+        home_adv_scale=home_adv_scale,
+    )
 
     games["elo_home_pre"] = elo_home
     games["elo_away_pre"] = elo_away
     games["elo_diff_pre"] = games["elo_home_pre"] - games["elo_away_pre"]
     games["elo_expectation_home"] = expected_home_probs
     return games
+
+
+def _rest_bucket(days: float) -> str:
+    if pd.isna(days):
+        return "no_prev"
+    if days <= 1:
+        return "b2b"
+    if days == 2:
+        return "one_day"
+    if days == 3:
+        return "two_days"
+    return "three_plus"
+
+
+@GAME_FEATURES.family(
+    "rest_buckets",
+    outputs=("rest_diff", "home_b2b", "away_b2b", "rest_home_{bucket}", "rest_away_{bucket}"),
+    depends=("rest_days_home", "rest_days_away"),
+)
+def _add_rest_features(games: pd.DataFrame) -> pd.DataFrame:
+    """Rest differential, back-to-back flags and one-hot rest buckets per side."""
+    games["rest_bucket_home"] = games["rest_days_home"].apply(_rest_bucket)
+    games["rest_bucket_away"] = games["rest_days_away"].apply(_rest_bucket)
+    games["rest_diff"] = games["rest_days_home"] - games["rest_days_away"]
+    games["home_b2b"] = (games["rest_bucket_home"] == "b2b").astype(int)
+    games["away_b2b"] = (games["rest_bucket_away"] == "b2b").astype(int)
+    return pd.get_dummies(
+        games,
+        columns=["rest_bucket_home", "rest_bucket_away"],
+        prefix=["rest_home", "rest_away"],
+        dtype=int,
+    )
+
+
+@GAME_FEATURES.family("team_dummies", outputs=("home_team_{team}", "away_team_{team}"))
+def _add_team_dummies(games: pd.DataFrame) -> pd.DataFrame:
+    """One-hot home and away team indicators."""
+    home_ids, away_ids = games["teamId_home"], games["teamId_away"]
+    # Low-memory builds carry team ids as categoricals; levels of teams that
+    # play none of these games must not become (all-zero) columns
+    if isinstance(home_ids.dtype, pd.CategoricalDtype):
+        home_ids = home_ids.cat.remove_unused_categories()
+    if isinstance(away_ids.dtype, pd.CategoricalDtype):
+        away_ids = away_ids.cat.remove_unused_categories()
+    home_team_dummies = pd.get_dummies(home_ids, prefix="home_team", dtype=int)
+    away_team_dummies = pd.get_dummies(away_ids, prefix="away_team", dtype=int)
+    return pd.concat([games, home_team_dummies, away_team_dummies], axis=1)
@@ -12,49 +12,27 @@ Adds 5 high-impact features that capture game context:
 from __future__ import annotations
 
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+
+from .arena_geo import UNKNOWN_ARENA, arena_codes, travel_legs
+from .feature_registry import FeatureRegistry
 
 LOGGER = logging.getLogger(__name__)
 
-# NHL team locations (lat, lon) for travel distance calculation
-NHL_TEAM_LOCATIONS = {
-    'ANA': (33.8078, -117.8765),  # Anaheim
-    'ARI': (33.4484, -112.0740),  # Arizona (now Utah, but using PHX for historical)
-    'BOS': (42.3662, -71.0621),   # Boston
-    'BUF': (42.8750, -78.8761),   # Buffalo
-    'CAR': (35.8031, -78.7219),   # Carolina
-    'CBJ': (39.9690, -82.9910),   # Columbus
-    'CGY': (51.0375, -114.0519),  # Calgary
-    'CHI': (41.8807, -87.6742),   # Chicago
-    'COL': (39.7487, -105.0077),  # Colorado
-    'DAL': (32.7905, -96.8103),   # Dallas
-    'DET': (42.3410, -83.0550),   # Detroit
-    'EDM': (53.5467, -113.4969),  # Edmonton
-    'FLA': (26.1583, -80.3256),   # Florida
-    'LAK': (34.0430, -118.2673),  # LA Kings
-    'MIN': (44.9447, -93.1012),   # Minnesota
-    'MTL': (45.4961, -73.5693),   # Montreal
-    'NJD': (40.7334, -74.1711),   # New Jersey
-    'NSH': (36.1590, -86.7784),   # Nashville
-    'NYI': (40.7225, -73.5907),   # NY Islanders
-    'NYR': (40.7505, -73.9934),   # NY Rangers
-    'OTT': (45.2968, -75.9270),   # Ottawa
-    'PHI': (39.9012, -75.1720),   # Philadelphia
-    'PIT': (40.4394, -79.9894),   # Pittsburgh
-    'SEA': (47.6221, -122.3540),  # Seattle
-    'SJS': (37.3327, -121.9010),  # San Jose
-    'STL': (38.6266, -90.2025),   # St. Louis
-    'TBL': (27.9425, -82.4518),   # Tampa Bay
-    'TOR': (43.6435, -79.3791),   # Toronto
-    'VAN': (49.2778, -123.1089),  # Vancouver
-    'VGK': (36.0909, -115.1833),  # Vegas
-    'WPG': (49.8928, -97.1436),   # Winnipeg
-    'WSH': (38.8981, -77.0209),   # Washington
-}
+# Situational feature families, run on the game frame in registration order
+SITUATIONAL_FEATURES = FeatureRegistry("situational")
+
+# Fatigue index weight of a game 1, 2, ..., 7 days before the current one
+FATIGUE_WEIGHTS = (1.0, 0.8, 0.6, 0.4, 0.3, 0.2, 0.1)
+
+# Third period trailing performance: win% over the team's last N games trailing
+# entering the 3rd, once it has the minimum number of them
+TRAILING_PERF_WINDOW = 20
+TRAILING_PERF_MIN_GAMES = 5
+TRAILING_PERF_DEFAULT = 0.5
 
 # NHL Divisions (2021-22 onwards, after COVID realignment)
 NHL_DIVISIONS = {
@@ -65,27 +43,6 @@ NHL_DIVISIONS = {
 }
 
 
-def calculate_haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """
-    Calculate distance between two points on Earth (in miles).
-    Uses Haversine formula.
-    """
-    # Earth radius in miles
-    R = 3959.0
-
-    # Convert to radians
-    lat1_rad = np.radians(lat1)
-    lat2_rad = np.radians(lat2)
-    dlon = np.radians(lon2 - lon1)
-    dlat = np.radians(lat2 - lat1)
-
-    # Haversine formula
-    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2)**2
-    c = 2 * np.arcsin(np.sqrt(a))
-
-    return R * c
-
-
 def get_team_division(team_abbrev: str) -> str:
     """Get division for a team."""
     for division, teams in NHL_DIVISIONS.items():
@@ -94,7 +51,7 @@ def get_team_division(team_abbrev: str) -> str:
     return "Unknown"
 
 
-def add_situational_features(games: pd.DataFrame) -> pd.DataFrame:
+def add_situational_features(games: pd.DataFrame, features: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
     Add all 5 V7.3 situational context features to games dataframe.
 
@@ -105,38 +62,27 @@ def add_situational_features(games: pd.DataFrame) -> pd.DataFrame:
     4. divisional_matchup - Same division flag
     5. post_break_game_home/away - First game after 4+ days rest
 
-    Plus differential features for each.
+    Plus differential features for each. With features, only the families
+    producing those names are computed.
     """
     games = games.copy()
+    plan = SITUATIONAL_FEATURES.resolve(features)
 
     LOGGER.info("Adding V7.3 situational context features...")
 
-    # Feature 1: Fatigue Index
-    LOGGER.info("  [1/5] Computing fatigue index...")
-    games = _add_fatigue_index(games)
-
-    # Feature 2: Third Period Trailing Performance
-    LOGGER.info("  [2/5] Computing third period trailing performance...")
-    games = _add_third_period_trailing_perf(games)
-
-    # Feature 3: Travel Distance
-    LOGGER.info("  [3/5] Computing travel distance...")
-    games = _add_travel_distance(games)
-
-    # Feature 4: Divisional Matchups
-    LOGGER.info("  [4/5] Adding divisional matchup flag...")
-    games = _add_divisional_matchup(games)
-
-    # Feature 5: Post-Break Performance
-    LOGGER.info("  [5/5] Adding post-break game flag...")
-    games = _add_post_break_flag(games)
+    for step, family in enumerate(plan.families, start=1):
+        LOGGER.info(f"  [{step}/{len(plan.families)}] Computing {family.name.replace('_', ' ')}...")
+        games = family.producer(games)
 
     LOGGER.info(f"✓ Added {len([c for c in games.columns if any(x in c for x in ['fatigue', 'trailing', 'travel', 'divisional', 'break'])])} V7.3 situational features")
 
     return games
 
 
-def _add_fatigue_index(games: pd.DataFrame) -> pd.DataFrame:
+@SITUATIONAL_FEATURES.family(
+    "fatigue_index", outputs=("fatigue_index_home", "fatigue_index_away", "fatigue_index_diff")
+)
+def _add_fatigue_index(games: pd.DataFrame, weights: Sequence[float] = FATIGUE_WEIGHTS) -> pd.DataFrame:
     """
     Add fatigue index: weighted count of games in last 7 days.
 
@@ -148,56 +94,37 @@ def _add_fatigue_index(games: pd.DataFrame) -> pd.DataFrame:
     - 5 days ago: 0.3
     - 6 days ago: 0.2
     - 7 days ago: 0.1
-    """
-    games['fatigue_index_home'] = 0.0
-    games['fatigue_index_away'] = 0.0
 
-    # Sort by date for rolling window
+    `weights[i]` is the weight of a game i + 1 days ago; its length sets the
+    look-back window. As in V7.3, only the team's earlier games on the same
+    side (home or away) are counted.
+    """
     games = games.sort_values('gameDate')
 
-    # Group by team and calculate fatigue for each game
-    for team_side in ['home', 'away']:
-        team_col = f'teamAbbrev_{team_side}'
+    # Day offset -> weight; offset 0 (same day) is never in the window
+    weight_by_offset = np.concatenate(([0.0], np.asarray(weights, dtype=float)))
+    days = pd.to_datetime(games['gameDate']).to_numpy().astype('datetime64[D]').astype(np.int64)
+    if len(days):
+        days -= days.min()
+    span = days.max(initial=0) + len(weight_by_offset)
 
-        for team in games[team_col].unique():
-            team_games = games[games[team_col] == team].copy()
-
-            for idx, row in team_games.iterrows():
-                game_date = pd.to_datetime(row['gameDate'])
-
-                # Look back 7 days
-                recent_games = team_games[
-                    (team_games['gameDate'] < row['gameDate']) &
-                    (pd.to_datetime(team_games['gameDate']) >= game_date - timedelta(days=7))
-                ]
-
-                if len(recent_games) == 0:
-                    continue
-
-                # Calculate weighted fatigue
-                fatigue = 0.0
-                for _, prev_game in recent_games.iterrows():
-                    days_ago = (game_date - pd.to_datetime(prev_game['gameDate'])).days
-                    if days_ago == 1:
-                        weight = 1.0
-                    elif days_ago == 2:
-                        weight = 0.8
-                    elif days_ago == 3:
-                        weight = 0.6
-                    elif days_ago == 4:
-                        weight = 0.4
-                    elif days_ago == 5:
-                        weight = 0.3
-                    elif days_ago == 6:
-                        weight = 0.2
-                    elif days_ago == 7:
-                        weight = 0.1
-                    else:
-                        weight = 0.0
-
-                    fatigue += weight
-
-                games.at[idx, f'fatigue_index_{team_side}'] = fatigue
+    for team_side in ['home', 'away']:
+        team_codes = pd.factorize(games[f'teamAbbrev_{team_side}'])[0]
+        # One sorted key per (team, day): a team's window is a contiguous key range
+        order = np.lexsort((days, team_codes))
+        keys = team_codes[order] * span + days[order]
+
+        starts = np.searchsorted(keys, keys - (len(weight_by_offset) - 1), side='left')
+        ends = np.searchsorted(keys, keys, side='left')
+        counts = ends - starts
+        game_idx = np.repeat(np.arange(len(keys)), counts)
+        prev_idx = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+        fatigue = np.zeros(len(games))
+        fatigue[order] = np.bincount(
+            game_idx, weights=weight_by_offset[keys[game_idx] - keys[prev_idx]], minlength=len(keys)
+        )
+        games[f'fatigue_index_{team_side}'] = fatigue
 
     # Add differential
     games['fatigue_index_diff'] = games['fatigue_index_home'] - games['fatigue_index_away']
@@ -205,58 +132,76 @@ def _add_fatigue_index(games: pd.DataFrame) -> pd.DataFrame:
     return games
 
 
+@SITUATIONAL_FEATURES.family(
+    "third_period_trailing_perf",
+    outputs=("third_period_trailing_perf_home", "third_period_trailing_perf_away", "third_period_trailing_perf_diff"),
+)
 def _add_third_period_trailing_perf(games: pd.DataFrame) -> pd.DataFrame:
     """
     Add third period trailing performance: rolling win% when behind entering 3rd period.
 
-    Uses last 20 games where team was trailing entering 3rd period.
+    Uses the team's last 20 games (home and road) where it was trailing entering
+    the 3rd period, from the trailingEnteringP3 flags native ingest records off
+    the goal events; 50% until the team has 5 such games. Seasons cached before
+    ingest recorded period scores lack the flags (or, combined with newer
+    seasons, have them all missing); their games stay at 50% and do not count
+    as history (rebuild those seasons to get the feature).
     """
-    games['third_period_trailing_perf_home'] = 0.5  # Default: 50%
-    games['third_period_trailing_perf_away'] = 0.5
-
-    # Note: We don't have period-by-period score data in current dataset
-    # This would require play-by-play data analysis
-    # For now, use a proxy: games where team was losing by 1 goal and came back
-    # This is a simplified version - in production would need full period data
-
     games = games.sort_values('gameDate')
-
-    for team_side in ['home', 'away']:
-        team_col = f'teamAbbrev_{team_side}'
-
-        # Calculate comeback win rate (proxy for 3rd period trailing performance)
-        for team in games[team_col].unique():
-            team_games = games[games[team_col] == team].copy()
-
-            for idx, row in team_games.iterrows():
-                # Look back at last 20 games
-                prev_games = team_games[team_games['gameDate'] < row['gameDate']].tail(20)
-
-                if len(prev_games) < 5:  # Need minimum sample
-                    continue
-
-                # Count close games won (proxy for clutch performance)
-                # Use goal differential as proxy: positive = won, negative = lost
-                if team_side == 'home':
-                    close_wins = prev_games[
-                        (prev_games['goalsFor_home'] - prev_games['goalsAgainst_home'] > 0) &
-                        (abs(prev_games['goalsFor_home'] - prev_games['goalsAgainst_home']) <= 1)
-                    ]
-                    close_games = prev_games[
-                        abs(prev_games['goalsFor_home'] - prev_games['goalsAgainst_home']) <= 1
-                    ]
-                else:
-                    close_wins = prev_games[
-                        (prev_games['goalsFor_away'] - prev_games['goalsAgainst_away'] > 0) &
-                        (abs(prev_games['goalsFor_away'] - prev_games['goalsAgainst_away']) <= 1)
-                    ]
-                    close_games = prev_games[
-                        abs(prev_games['goalsFor_away'] - prev_games['goalsAgainst_away']) <= 1
-                    ]
-
-                if len(close_games) > 0:
-                    trailing_perf = len(close_wins) / len(close_games)
-                    games.at[idx, f'third_period_trailing_perf_{team_side}'] = trailing_perf
+    sides = ['home', 'away']
+    flags = [f'trailingEnteringP3_{side}' for side in sides]
+
+    if all(flag in games.columns for flag in flags):
+        unrecorded = games[flags].isna().any(axis=1)
+        if 'seasonId' in games.columns:
+            unrecorded = games['seasonId'].isin(games.loc[unrecorded, 'seasonId'])
+        unrecorded = unrecorded.to_numpy()
+    else:
+        unrecorded = np.ones(len(games), dtype=bool)
+
+    if unrecorded.all():
+        LOGGER.warning("Game logs have no period score state; third_period_trailing_perf stays at its default")
+        for side in sides:
+            games[f'third_period_trailing_perf_{side}'] = TRAILING_PERF_DEFAULT
+    else:
+        if unrecorded.any():
+            seasons = games['seasonId'][unrecorded].unique() if 'seasonId' in games.columns else []
+            LOGGER.warning(
+                f"No period score state for {int(unrecorded.sum())} games (seasons {sorted(map(str, seasons))}); "
+                "third_period_trailing_perf stays at its default for them"
+            )
+        # One row per team-game; row numbers follow the date order of `games`
+        team_games = pd.concat(
+            [
+                pd.DataFrame({
+                    'team': games[f'teamAbbrev_{side}'].to_numpy(dtype=object),
+                    'row': np.arange(len(games)),
+                    'side': side,
+                    'trailing': (games[f'trailingEnteringP3_{side}'].to_numpy() == 1) & ~unrecorded,
+                    'won': (games[f'goalsFor_{side}'] > games[f'goalsAgainst_{side}']).to_numpy(dtype=float),
+                })
+                for side in sides
+            ],
+            ignore_index=True,
+        ).sort_values(['team', 'row'], kind='stable')
+
+        # Win rate over the trailing games up to and including each one ...
+        trailed = team_games[team_games['trailing']]
+        team_games['trailing_rate'] = trailed.groupby('team', sort=False)['won'].rolling(
+            TRAILING_PERF_WINDOW, min_periods=TRAILING_PERF_MIN_GAMES
+        ).mean().droplevel(0)
+        # ... carried forward, so each game sees the rate from its earlier trailing games only
+        prior_rate = team_games.groupby('team', sort=False)['trailing_rate'].shift()
+        team_games['prior_rate'] = prior_rate.groupby(team_games['team'], sort=False).ffill().fillna(
+            TRAILING_PERF_DEFAULT
+        )
+
+        for side in sides:
+            side_games = team_games[team_games['side'] == side]
+            perf = np.empty(len(games))
+            perf[side_games['row'].to_numpy()] = side_games['prior_rate'].to_numpy()
+            perf[unrecorded] = TRAILING_PERF_DEFAULT
+            games[f'third_period_trailing_perf_{side}'] = perf
 
     # Add differential
     games['third_period_trailing_perf_diff'] = (
@@ -266,45 +211,35 @@ def _add_third_period_trailing_perf(games: pd.DataFrame) -> pd.DataFrame:
     return games
 
 
+@SITUATIONAL_FEATURES.family(
+    "travel_distance", outputs=("travel_distance_home", "travel_distance_away", "travel_distance_diff")
+)
 def _add_travel_distance(games: pd.DataFrame) -> pd.DataFrame:
     """
     Add travel distance: miles traveled since last game.
 
     Calculates great circle distance between previous game city and current game city.
+    As in V7.3, "last game" is the team's previous game on the same side, so
+    the home column is zero for located teams; teams without a known arena get 0.
     """
-    games['travel_distance_home'] = 0.0
-    games['travel_distance_away'] = 0.0
-
     games = games.sort_values('gameDate')
+    home_venue = arena_codes(games['teamAbbrev_home'])
 
     for team_side in ['home', 'away']:
         team_col = f'teamAbbrev_{team_side}'
+        team_venue = arena_codes(games[team_col])
 
-        for team in games[team_col].unique():
-            if team not in NHL_TEAM_LOCATIONS:
-                continue
-
-            team_games = games[games[team_col] == team].copy()
-
-            prev_location = None
-            for idx, row in team_games.iterrows():
-                # Current game location
-                if team_side == 'home':
-                    current_location = NHL_TEAM_LOCATIONS[team]
-                else:
-                    # Away team - game is at opponent's arena
-                    home_team = row['teamAbbrev_home']
-                    current_location = NHL_TEAM_LOCATIONS.get(home_team, NHL_TEAM_LOCATIONS[team])
-
-                # Calculate distance from previous game
-                if prev_location is not None:
-                    distance = calculate_haversine_distance(
-                        prev_location[0], prev_location[1],
-                        current_location[0], current_location[1]
-                    )
-                    games.at[idx, f'travel_distance_{team_side}'] = distance
+        if team_side == 'home':
+            venue = team_venue
+        else:
+            # Away team - game is at opponent's arena (own arena if the opponent is unknown)
+            venue = np.where(home_venue != UNKNOWN_ARENA, home_venue, team_venue)
+        venue = np.where(team_venue != UNKNOWN_ARENA, venue, UNKNOWN_ARENA)
 
-                prev_location = current_location
+        previous = pd.Series(venue, index=games.index).groupby(
+            games[team_col].to_numpy(), sort=False, dropna=False
+        ).shift(fill_value=UNKNOWN_ARENA)
+        games[f'travel_distance_{team_side}'] = travel_legs(previous.to_numpy(), venue)[0]
 
     # Add differential
     games['travel_distance_diff'] = games['travel_distance_home'] - games['travel_distance_away']
@@ -312,6 +247,7 @@ def _add_travel_distance(games: pd.DataFrame) -> pd.DataFrame:
     return games
 
 
+@SITUATIONAL_FEATURES.family("divisional_matchup", outputs=("divisional_matchup",))
 def _add_divisional_matchup(games: pd.DataFrame) -> pd.DataFrame:
     """
     Add divisional matchup flag: 1 if same division, 0 otherwise.
@@ -331,6 +267,11 @@ def _add_divisional_matchup(games: pd.DataFrame) -> pd.DataFrame:
     return games
 
 
+@SITUATIONAL_FEATURES.family(
+    "post_break",
+    outputs=("post_break_game_home", "post_break_game_away", "post_break_game_diff"),
+    depends=("rest_days_home", "rest_days_away"),
+)
 def _add_post_break_flag(games: pd.DataFrame) -> pd.DataFrame:
     """
     Add post-break flag: 1 if first game after 4+ days rest, 0 otherwise.
@@ -1,7 +1,8 @@
 """
 V7.4 Enhanced Special Teams Features
 
-Extracts power play and penalty kill performance metrics from play-by-play data.
+Power play and penalty kill performance metrics, from the special teams counts
+native ingest records while parsing play-by-play.
 
 WHY THESE FEATURES MATTER:
 - Special teams account for 20-25% of goals scored in NHL
@@ -21,50 +22,36 @@ FEATURES CREATED (6):
 from __future__ import annotations
 
 import logging
-from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List
 
 import pandas as pd
 import numpy as np
-from collections import defaultdict
 
 LOGGER = logging.getLogger(__name__)
 
+# Games in the rolling special teams window and in the home/away PP%/PK% window
+SPECIAL_TEAMS_ROLLING_WINDOW = 10
+HOME_AWAY_VARIANCE_WINDOW = 20
+# Home/away variance needs this many games in the window, and this many on each side
+HOME_AWAY_MIN_GAMES = 10
+HOME_AWAY_MIN_SPLIT_GAMES = 3
 
-def _parse_situation_code(code: str) -> Dict[str, bool]:
-    """
-    Parse NHL situation code to determine game state.
-
-    Format: ABCD where
-    - A = Away skaters
-    - B = Home skaters
-    - C = Strength state (5=even, 4=PP, etc.)
-    - D = ? (usually 1 or 5)
-
-    Example: "1551" = 5v5 even strength
-             "1541" = 5v4 power play
-             "1451" = 4v5 shorthanded
-    """
-    if not code or len(code) < 3:
-        return {"is_even_strength": True, "is_power_play": False}
-
-    away_skaters = int(code[0])
-    home_skaters = int(code[1])
-
-    is_even = away_skaters == home_skaters
-    is_pp = not is_even
 
-    return {
-        "is_even_strength": is_even,
-        "is_power_play": is_pp,
-        "away_skaters": away_skaters,
-        "home_skaters": home_skaters,
-    }
+# Game-frame special teams columns -> team-log columns recorded by native ingest
+SPECIAL_TEAMS_SOURCES = {
+    'pp_goals': 'powerPlayGoalsFor',
+    'sh_goals': 'shortHandedGoalsFor',
+    'sh_goals_allowed': 'powerPlayGoalsAgainst',
+    'penalties_taken': 'penaltiesTaken',
+    'penalties_drawn': 'penaltiesDrawn',
+    'pp_opportunities': 'powerPlayOpportunities',
+    'pk_opportunities': 'penaltyKillOpportunities',
+}
 
 
 def extract_special_teams_goals(games: pd.DataFrame) -> pd.DataFrame:
     """
-    Extract power play and shorthanded goals from play-by-play data.
+    Add power play and shorthanded goal counts per game.
 
     For each game, counts:
     - PP goals scored (home/away)
@@ -72,9 +59,14 @@ def extract_special_teams_goals(games: pd.DataFrame) -> pd.DataFrame:
     - SH goals allowed (home/away) - opponent PP goals
     - Total penalties taken (home/away) - proxy for PK opportunities
     - Total penalties drawn (home/away) - proxy for PP opportunities
+    - PP / PK opportunities (home/away) - man advantages gained / conceded
+
+    The counts are recorded by native ingest while it parses play-by-play
+    (native_ingest.SPECIAL_TEAMS_COLUMNS) and arrive here as the *_home /
+    *_away columns of the game frame, so nothing is re-parsed.
 
     Args:
-        games: DataFrame with gameId, teamId_home, teamId_away columns
+        games: DataFrame from build_game_dataframe
 
     Returns:
         DataFrame with special teams stats added:
@@ -83,131 +75,57 @@ def extract_special_teams_goals(games: pd.DataFrame) -> pd.DataFrame:
         - sh_goals_allowed_home, sh_goals_allowed_away
         - penalties_taken_home, penalties_taken_away
         - penalties_drawn_home, penalties_drawn_away
+        - pp_opportunities_home, pp_opportunities_away
+        - pk_opportunities_home, pk_opportunities_away
     """
-    from .data_sources.gamecenter import get_default_client
+    missing = sorted(
+        f'{source}_{side}'
+        for source in SPECIAL_TEAMS_SOURCES.values()
+        for side in ('home', 'away')
+        if f'{source}_{side}' not in games.columns
+    )
+    if missing:
+        raise ValueError(
+            f"Game frame lacks special teams counts {missing}; rebuild season caches cached before "
+            "native ingest recorded them"
+        )
+    # Seasons cached before the counts were recorded, combined with newer ones
+    sources = [f'{source}_{side}' for source in SPECIAL_TEAMS_SOURCES.values() for side in ('home', 'away')]
+    unrecorded = games[sources].isna().any(axis=1)
+    if unrecorded.any():
+        seasons = sorted(map(str, games.loc[unrecorded, 'seasonId'].unique())) if 'seasonId' in games.columns else []
+        raise ValueError(
+            f"{int(unrecorded.sum())} games (seasons {seasons}) have no special teams counts; rebuild season "
+            "caches cached before native ingest recorded them"
+        )
 
     games = games.copy()
-
-    # Initialize columns
-    games['pp_goals_home'] = 0
-    games['pp_goals_away'] = 0
-    games['sh_goals_home'] = 0
-    games['sh_goals_away'] = 0
-    games['sh_goals_allowed_home'] = 0
-    games['sh_goals_allowed_away'] = 0
-    games['penalties_taken_home'] = 0
-    games['penalties_taken_away'] = 0
-    games['penalties_drawn_home'] = 0
-    games['penalties_drawn_away'] = 0
-
-    client = get_default_client()
-
-    LOGGER.info(f"Extracting special teams goals from {len(games)} games...")
-
-    for idx, row in games.iterrows():
-        if idx % 200 == 0:
-            LOGGER.info(f"  Processing game {idx+1}/{len(games)}")
-
-        game_id = row['gameId']
-        home_team_id = row['teamId_home']
-        away_team_id = row['teamId_away']
-
-        try:
-            pbp = client.get_play_by_play(game_id)
-            plays = pbp.get('plays', [])
-
-            pp_goals_home = 0
-            pp_goals_away = 0
-            sh_goals_home = 0
-            sh_goals_away = 0
-            penalties_home = 0
-            penalties_away = 0
-
-            for play in plays:
-                type_key = play.get('typeDescKey', '')
-                details = play.get('details', {})
-                event_owner = details.get('eventOwnerTeamId')
-                situation_code = play.get('situationCode', '1551')
-                situation = _parse_situation_code(situation_code)
-
-                # Skip if no event owner
-                if not event_owner:
-                    continue
-
-                # GOALS - check if power play or shorthanded
-                if type_key == 'goal':
-                    # Determine which team scored
-                    scoring_team = event_owner
-                    defending_team = away_team_id if scoring_team == home_team_id else home_team_id
-
-                    if situation['is_power_play']:
-                        # Power play situation - determine who has advantage
-                        away_skaters = situation.get('away_skaters', 5)
-                        home_skaters = situation.get('home_skaters', 5)
-
-                        if scoring_team == home_team_id:
-                            if home_skaters > away_skaters:
-                                # Home team scored on PP
-                                pp_goals_home += 1
-                                sh_goals_away += 1  # Away team allowed goal while SH
-                            elif away_skaters > home_skaters:
-                                # Home team scored SH goal
-                                sh_goals_home += 1
-                                pp_goals_away += 0  # Away team PP did not score
-                        else:  # Away team scored
-                            if away_skaters > home_skaters:
-                                # Away team scored on PP
-                                pp_goals_away += 1
-                                sh_goals_home += 1  # Home team allowed goal while SH
-                            elif home_skaters > away_skaters:
-                                # Away team scored SH goal
-                                sh_goals_away += 1
-                                pp_goals_home += 0  # Home team PP did not score
-
-                # PENALTIES - track opportunities
-                if type_key == 'penalty':
-                    penalized_team = event_owner
-
-                    if penalized_team == home_team_id:
-                        penalties_home += 1
-                    else:
-                        penalties_away += 1
-
-            # Store results
-            games.at[idx, 'pp_goals_home'] = pp_goals_home
-            games.at[idx, 'pp_goals_away'] = pp_goals_away
-            games.at[idx, 'sh_goals_home'] = sh_goals_home
-            games.at[idx, 'sh_goals_away'] = sh_goals_away
-            games.at[idx, 'sh_goals_allowed_home'] = sh_goals_home  # SH goals allowed = opponent PP goals against us
-            games.at[idx, 'sh_goals_allowed_away'] = sh_goals_away
-            games.at[idx, 'penalties_taken_home'] = penalties_home
-            games.at[idx, 'penalties_taken_away'] = penalties_away
-            games.at[idx, 'penalties_drawn_home'] = penalties_away  # We draw penalties that opponents take
-            games.at[idx, 'penalties_drawn_away'] = penalties_home
-
-        except Exception as e:
-            LOGGER.warning(f"  Failed to extract special teams for game {game_id}: {e}")
-            continue
-
-    LOGGER.info("✓ Special teams goals extracted")
-
+    for column, source in SPECIAL_TEAMS_SOURCES.items():
+        for side in ('home', 'away'):
+            games[f'{column}_{side}'] = games[f'{source}_{side}'].astype(int)
     return games
 
 
-def add_special_teams_features(games: pd.DataFrame) -> pd.DataFrame:
+def add_special_teams_features(
+    games: pd.DataFrame,
+    rolling_window: int = SPECIAL_TEAMS_ROLLING_WINDOW,
+    variance_window: int = HOME_AWAY_VARIANCE_WINDOW,
+) -> pd.DataFrame:
     """
     Add all 6 V7.4 enhanced special teams features.
 
     Features added:
     1. special_teams_goal_diff_rolling - (PP goals - SH goals allowed) last 10
-    2. pp_opportunities_rolling - Penalties drawn last 10 games
-    3. pk_opportunities_rolling - Penalties taken last 10 games
+    2. pp_opportunities_rolling - PP opportunities last 10 games
+    3. pk_opportunities_rolling - PK opportunities last 10 games
     4. special_teams_efficiency_diff - (PP goals/PP opps) - (SH allowed/PK opps)
     5. pp_home_away_variance - PP% difference home vs away
     6. pk_home_away_variance - PK% difference home vs away
 
     Args:
         games: DataFrame with game data
+        rolling_window: Games in the rolling special teams window
+        variance_window: Games in the home/away PP%/PK% window
 
     Returns:
         DataFrame with special teams features added
@@ -216,13 +134,13 @@ def add_special_teams_features(games: pd.DataFrame) -> pd.DataFrame:
 
     LOGGER.info("Adding V7.4 enhanced special teams features...")
 
-    # Step 1: Extract special teams goals from play-by-play
-    LOGGER.info("  [1/6] Extracting special teams goals from play-by-play...")
+    # Step 1: Special teams goals and opportunities recorded at ingest
+    LOGGER.info("  [1/6] Collecting special teams goals...")
     games = extract_special_teams_goals(games)
 
     # Step 2: Create rolling features
     LOGGER.info("  [2/6] Computing rolling special teams metrics...")
-    games = _add_special_teams_rolling(games)
+    games = _add_special_teams_rolling(games, window=rolling_window)
 
     # Step 3: Efficiency metrics
     LOGGER.info("  [3/6] Computing special teams efficiency...")
@@ -230,69 +148,77 @@ def add_special_teams_features(games: pd.DataFrame) -> pd.DataFrame:
 
     # Step 4: Home/away variance
     LOGGER.info("  [4/6] Computing home/away variance...")
-    games = _add_home_away_variance(games)
+    games = _add_home_away_variance(games, window=variance_window)
 
     LOGGER.info(f"✓ Added {len([c for c in games.columns if 'special_teams' in c or 'pp_' in c or 'pk_' in c])} V7.4 special teams features")
 
     return games
 
 
-def _add_special_teams_rolling(games: pd.DataFrame) -> pd.DataFrame:
+def _team_games(games: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
     """
-    Add rolling 10-game special teams metrics.
+    Unpivot the home and away sides: one row per team-game.
 
-    Features:
-    - special_teams_goal_diff_rolling - (PP goals - SH goals allowed)
-    - pp_opportunities_rolling - Penalties drawn
-    - pk_opportunities_rolling - Penalties taken
+    Rows are in date order within each team-season; `row` is the game's
+    position in `games`, for _to_sides.
     """
-    games = games.sort_values('gameDate')
-
-    # Initialize columns
-    for side in ['home', 'away']:
-        games[f'special_teams_goal_diff_rolling_{side}'] = 0.0
-        games[f'pp_opportunities_rolling_{side}'] = 0.0
-        games[f'pk_opportunities_rolling_{side}'] = 0.0
+    sides = [
+        pd.DataFrame({
+            'row': np.arange(len(games)),
+            'teamId': games[f'teamId_{side}'].to_numpy(),
+            'seasonId': games['seasonId'].to_numpy(),
+            'gameDate': games['gameDate'].to_numpy(),
+            'is_home': float(side == 'home'),
+            **{column: games[f'{column}_{side}'].to_numpy(dtype=float) for column in columns},
+        })
+        for side in ('home', 'away')
+    ]
+    return pd.concat(sides, ignore_index=True).sort_values(
+        ['teamId', 'seasonId', 'gameDate', 'row'], kind='stable'
+    )
 
-    # Calculate rolling metrics for each team
-    for team_side in ['home', 'away']:
-        team_col = f'teamId_{team_side}'
 
-        for team_id in games[team_col].unique():
-            team_games = games[games[team_col] == team_id].copy()
+def _lagged_rolling_sum(team_games: pd.DataFrame, columns: List[str], window: int) -> pd.DataFrame:
+    """Sum of each column over the team's previous `window` games in the season (0 for its first game)."""
+    keys = [team_games['teamId'], team_games['seasonId']]
+    earlier = team_games[columns].groupby(keys, sort=False).cumsum() - team_games[columns]
+    return earlier - earlier.groupby(keys, sort=False).shift(window, fill_value=0.0)
 
-            for idx, row in team_games.iterrows():
-                # Get last 10 games BEFORE this game
-                prev_games = team_games[team_games['gameDate'] < row['gameDate']].tail(10)
 
-                if len(prev_games) == 0:
-                    continue
+def _to_sides(games: pd.DataFrame, team_games: pd.DataFrame, values: Dict[str, pd.Series]) -> pd.DataFrame:
+    """Pivot team-game values back onto `games` as {name}_home / {name}_away / {name}_diff."""
+    is_home = team_games['is_home'].to_numpy() == 1.0
+    rows = team_games['row'].to_numpy()
+    for name, series in values.items():
+        for side, mask in (('home', is_home), ('away', ~is_home)):
+            column = np.empty(len(games))
+            column[rows[mask]] = np.asarray(series, dtype=float)[mask]
+            games[f'{name}_{side}'] = column
+        games[f'{name}_diff'] = games[f'{name}_home'] - games[f'{name}_away']
+    return games
 
-                # Special teams goal differential
-                pp_goals = prev_games[f'pp_goals_{team_side}'].sum()
-                sh_goals_allowed = prev_games[f'sh_goals_allowed_{team_side}'].sum()
-                st_goal_diff = pp_goals - sh_goals_allowed
 
-                # Opportunities
-                pp_opps = prev_games[f'penalties_drawn_{team_side}'].sum()
-                pk_opps = prev_games[f'penalties_taken_{team_side}'].sum()
+def _add_special_teams_rolling(games: pd.DataFrame, window: int = SPECIAL_TEAMS_ROLLING_WINDOW) -> pd.DataFrame:
+    """
+    Add rolling special teams metrics over the team's previous `window` games.
 
-                games.at[idx, f'special_teams_goal_diff_rolling_{team_side}'] = st_goal_diff
-                games.at[idx, f'pp_opportunities_rolling_{team_side}'] = pp_opps
-                games.at[idx, f'pk_opportunities_rolling_{team_side}'] = pk_opps
+    Features:
+    - special_teams_goal_diff_rolling - (PP goals - SH goals allowed)
+    - pp_opportunities_rolling - Power play opportunities
+    - pk_opportunities_rolling - Penalty kill opportunities
 
-    # Add differentials
-    games['special_teams_goal_diff_rolling_diff'] = (
-        games['special_teams_goal_diff_rolling_home'] - games['special_teams_goal_diff_rolling_away']
-    )
-    games['pp_opportunities_rolling_diff'] = (
-        games['pp_opportunities_rolling_home'] - games['pp_opportunities_rolling_away']
-    )
-    games['pk_opportunities_rolling_diff'] = (
-        games['pk_opportunities_rolling_home'] - games['pk_opportunities_rolling_away']
-    )
+    Home and road games share one history per team-season.
+    """
+    games = games.sort_values('gameDate')
+    team_games = _team_games(games, ['pp_goals', 'sh_goals_allowed', 'pp_opportunities', 'pk_opportunities'])
+    team_games['st_goal_diff'] = team_games['pp_goals'] - team_games['sh_goals_allowed']
 
-    return games
+    rolling = _lagged_rolling_sum(team_games, ['st_goal_diff', 'pp_opportunities', 'pk_opportunities'], window)
+    return _to_sides(games, team_games, {
+        'special_teams_goal_diff_rolling': rolling['st_goal_diff'],
+        'pp_opportunities_rolling': rolling['pp_opportunities'],
+        'pk_opportunities_rolling': rolling['pk_opportunities'],
+    })
 
 
 def _add_special_teams_efficiency(games: pd.DataFrame) -> pd.DataFrame:
@@ -326,73 +252,50 @@ def _add_special_teams_efficiency(games: pd.DataFrame) -> pd.DataFrame:
     return games
 
 
-def _add_home_away_variance(games: pd.DataFrame) -> pd.DataFrame:
+def _add_home_away_variance(
+    games: pd.DataFrame,
+    window: int = HOME_AWAY_VARIANCE_WINDOW,
+    min_games: int = HOME_AWAY_MIN_GAMES,
+    min_split_games: int = HOME_AWAY_MIN_SPLIT_GAMES,
+) -> pd.DataFrame:
     """
     Add PP%/PK% variance between home and away games.
 
-    Some teams perform significantly better at home on special teams.
+    Some teams perform significantly better at home on special teams. Over
+    the team's previous `window` games in the season, PP% (PP goals per PP
+    opportunity) and PK% (PP goals allowed per PK opportunity) at home minus
+    on the road; 0 until the window holds `min_games` games with at least
+    `min_split_games` on each side.
     """
     games = games.sort_values('gameDate')
+    team_games = _team_games(games, ['pp_goals', 'pp_opportunities', 'sh_goals_allowed', 'pk_opportunities'])
+
+    # Split every count into its home and road part, then sum both over the window
+    split_columns = []
+    for venue, flag in (('home', team_games['is_home']), ('road', 1.0 - team_games['is_home'])):
+        team_games[f'{venue}_games'] = flag
+        split_columns.append(f'{venue}_games')
+        for column in ('pp_goals', 'pp_opportunities', 'sh_goals_allowed', 'pk_opportunities'):
+            team_games[f'{venue}_{column}'] = team_games[column] * flag
+            split_columns.append(f'{venue}_{column}')
+    window_sums = _lagged_rolling_sum(team_games, split_columns, window)
+
+    enough = (
+        (window_sums['home_games'] + window_sums['road_games'] >= min_games)
+        & (window_sums['home_games'] >= min_split_games)
+        & (window_sums['road_games'] >= min_split_games)
+    )
 
-    # Initialize
-    for side in ['home', 'away']:
-        games[f'pp_home_away_variance_{side}'] = 0.0
-        games[f'pk_home_away_variance_{side}'] = 0.0
-
-    # Calculate variance for each team
-    for team_side in ['home', 'away']:
-        team_col = f'teamId_{team_side}'
-
-        for team_id in games[team_col].unique():
-            team_games = games[games[team_col] == team_id].copy()
-
-            for idx, row in team_games.iterrows():
-                # Get last 20 games BEFORE this game
-                prev_games = team_games[team_games['gameDate'] < row['gameDate']].tail(20)
-
-                if len(prev_games) < 10:  # Need minimum sample
-                    continue
-
-                # Split by home/away
-                home_mask = prev_games['teamId_home'] == team_id
-                away_mask = prev_games['teamId_away'] == team_id
-
-                home_prev = prev_games[home_mask]
-                away_prev = prev_games[away_mask]
-
-                if len(home_prev) < 3 or len(away_prev) < 3:
-                    continue
-
-                # Calculate PP% at home vs away
-                if team_side == 'home':
-                    pp_home = home_prev['pp_goals_home'].sum() / max(home_prev['penalties_drawn_home'].sum(), 1)
-                    pp_away = away_prev['pp_goals_away'].sum() / max(away_prev['penalties_drawn_away'].sum(), 1)
-
-                    pk_home = home_prev['sh_goals_allowed_home'].sum() / max(home_prev['penalties_taken_home'].sum(), 1)
-                    pk_away = away_prev['sh_goals_allowed_away'].sum() / max(away_prev['penalties_taken_away'].sum(), 1)
-                else:
-                    pp_home = home_prev['pp_goals_home'].sum() / max(home_prev['penalties_drawn_home'].sum(), 1)
-                    pp_away = away_prev['pp_goals_away'].sum() / max(away_prev['penalties_drawn_away'].sum(), 1)
-
-                    pk_home = home_prev['sh_goals_allowed_home'].sum() / max(home_prev['penalties_taken_home'].sum(), 1)
-                    pk_away = away_prev['sh_goals_allowed_away'].sum() / max(away_prev['penalties_taken_away'].sum(), 1)
-
-                # Variance (difference)
-                pp_variance = pp_home - pp_away
-                pk_variance = pk_home - pk_away
+    def rate(venue: str, goals: str, opportunities: str) -> pd.Series:
+        return window_sums[f'{venue}_{goals}'] / window_sums[f'{venue}_{opportunities}'].clip(lower=1)
 
-                games.at[idx, f'pp_home_away_variance_{team_side}'] = pp_variance
-                games.at[idx, f'pk_home_away_variance_{team_side}'] = pk_variance
+    pp_variance = rate('home', 'pp_goals', 'pp_opportunities') - rate('road', 'pp_goals', 'pp_opportunities')
+    pk_variance = rate('home', 'sh_goals_allowed', 'pk_opportunities') - rate('road', 'sh_goals_allowed', 'pk_opportunities')
 
-    # Add differentials
-    games['pp_home_away_variance_diff'] = (
-        games['pp_home_away_variance_home'] - games['pp_home_away_variance_away']
-    )
-    games['pk_home_away_variance_diff'] = (
-        games['pk_home_away_variance_home'] - games['pk_home_away_variance_away']
-    )
-
-    return games
+    return _to_sides(games, team_games, {
+        'pp_home_away_variance': pp_variance.where(enough, 0.0),
+        'pk_home_away_variance': pk_variance.where(enough, 0.0),
+    })
 
 
 __all__ = [
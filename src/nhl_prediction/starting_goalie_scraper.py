@@ -31,6 +31,8 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from .data_sources.http_client import get_http_client
+
 LOGGER = logging.getLogger(__name__)
 
 # File paths
@@ -71,21 +73,6 @@ DF_STATUS_CONFIDENCE = {
     "unknown": 0.30,
 }
 
-# Rate limiting
-_LAST_REQUEST_TIME = 0
-_MIN_REQUEST_INTERVAL = 0.5  # seconds
-
-
-def _rate_limit():
-    """Ensure we don't hammer the API."""
-    import time
-    global _LAST_REQUEST_TIME
-    elapsed = time.time() - _LAST_REQUEST_TIME
-    if elapsed < _MIN_REQUEST_INTERVAL:
-        time.sleep(_MIN_REQUEST_INTERVAL - elapsed)
-    _LAST_REQUEST_TIME = time.time()
-
-
 class StartingGoalieScraper:
     """
     Scrapes and manages starting goalie information from multiple sources.
@@ -155,13 +142,11 @@ class StartingGoalieScraper:
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
 
-        _rate_limit()
-
         url = f"{SCHEDULE_API}/{date}"
         LOGGER.info(f"Fetching schedule for {date}...")
 
         try:
-            response = requests.get(url, timeout=10)
+            response = get_http_client().get(url, timeout=10)
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             LOGGER.error(f"Failed to fetch schedule: {e}")
@@ -209,12 +194,10 @@ class StartingGoalieScraper:
                 - gameState: Current game state
             Returns None if game has started or data unavailable
         """
-        _rate_limit()
-
         url = f"{GAME_API}/{game_id}/landing"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = get_http_client().get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -286,8 +269,6 @@ class StartingGoalieScraper:
                     }
                 }
         """
-        _rate_limit()
-
         url = DAILY_FACEOFF_URL
         if date:
             url = f"{DAILY_FACEOFF_URL}{date}"
@@ -300,7 +281,7 @@ class StartingGoalieScraper:
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
             }
-            response = requests.get(url, headers=headers, timeout=15)
+            response = get_http_client().get(url, headers=headers, timeout=15)
             response.raise_for_status()
 
             return self._parse_daily_faceoff_html(response.text)
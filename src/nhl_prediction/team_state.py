@@ -0,0 +1,342 @@
+"""Persistent per-team feature state for fast pre-game lookups.
+
+engineer_team_features re-derives every lagged feature from full season logs.
+TeamStateStore keeps only what those features need instead:
+- running season sums and counts per team-season
+- a ring buffer of recent games for the rolling and momentum windows
+- streak counters and the last game date
+- league Elo ratings
+
+The state is updated in O(new games) as results land. features_for(team_id,
+as_of_date) answers with the values engineer_team_features gives that team's
+next game.
+
+Usage:
+
+    store = TeamStateStore.from_logs(season_logs)   # or TeamStateStore.load()
+    store.update(new_logs)                          # only the new games are recorded
+    store.save()
+    features = store.features_for(10, "2025-01-15")
+
+Only team-history features are covered: season-to-date averages, rest and
+congestion, streaks, rolling and momentum windows, and Elo. Row-local inputs
+(goalie pulse, injuries, altitude, line chemistry) and the matchup-level
+head-to-head features are not part of a team's history, so they are not stored.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data_ingest import build_game_dataframe
+from .elo import EloState
+from .features import (
+    MOMENTUM_COLUMNS,
+    MOMENTUM_WEIGHTS,
+    ROLL_WINDOWS,
+    ROLLING_FEATURE_SPECS,
+    _filled_feature_columns,
+    derive_game_stats,
+)
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parents[2] / "data" / "cache" / "team_state.pkl"
+
+# Season-to-date averages: feature -> per-game source column
+SEASON_AVERAGES: Mapping[str, str] = {
+    "season_win_pct": "win",
+    "season_goal_diff_avg": "goal_diff",
+    "season_xg_for_avg": "xGoalsFor",
+    "season_xg_against_avg": "xGoalsAgainst",
+}
+
+STREAK_FEATURES = (
+    "consecutive_home_prior",
+    "consecutive_away_prior",
+    "consecutive_wins_prior",
+    "consecutive_losses_prior",
+)
+
+# Previous games whose rest flags feed games_last_3d / games_last_6d
+REST_HISTORY = 3
+
+
+def _tracked_columns(columns: Iterable[str]) -> list[str]:
+    """Per-game source columns the state keeps, in a fixed order."""
+    wanted = ["win", "goal_diff", "is_home", "shot_margin", *SEASON_AVERAGES.values()]
+    wanted += [column for _, column, _ in ROLLING_FEATURE_SPECS]
+    wanted += list(MOMENTUM_COLUMNS.values())
+    available = set(columns)
+    return [column for column in dict.fromkeys(wanted) if column in available]
+
+
+class _TeamState:
+    """One team's running state; season fields reset when a new season starts."""
+
+    def __init__(self, n_columns: int, buffer_size: int):
+        self.n_columns = n_columns
+        self.season_id: Optional[str] = None
+        self.last_game_date: Optional[pd.Timestamp] = None
+        self.last_key: Optional[tuple] = None
+        # (played within 1 day, played within 2 days) for the team's previous games, across seasons
+        self.rest_flags: deque[tuple[int, int]] = deque(maxlen=REST_HISTORY)
+        self.recent: deque[np.ndarray] = deque(maxlen=buffer_size)
+        self._start_season(None)
+
+    def _start_season(self, season_id: Optional[str]) -> None:
+        self.season_id = season_id
+        self.games = 0
+        self.sums = np.zeros(self.n_columns)
+        self.counts = np.zeros(self.n_columns, dtype=np.int64)
+        self.streaks = np.zeros(len(STREAK_FEATURES), dtype=np.int64)
+        self.recent.clear()
+
+    def rest_days(self, season_id: str, game_date: pd.Timestamp) -> float:
+        if season_id != self.season_id or self.games == 0:
+            return np.nan
+        return float((game_date - self.last_game_date).days)
+
+    def record(self, season_id: str, game_date: pd.Timestamp, key: tuple, values: np.ndarray, flags: np.ndarray) -> None:
+        rest = self.rest_days(season_id, game_date)
+        rest = 10.0 if np.isnan(rest) else rest
+        self.rest_flags.append((int(rest <= 1), int(rest <= 2)))
+
+        if season_id != self.season_id:
+            self._start_season(season_id)
+
+        observed = ~np.isnan(values)
+        self.sums += np.where(observed, values, 0.0)
+        self.counts += observed
+        self.streaks = np.where(flags, self.streaks + 1, 0)
+        self.recent.append(values)
+        self.games += 1
+        self.last_game_date = game_date
+        self.last_key = key
+
+
+class TeamStateStore:
+    """Incrementally-updated per-team feature state (see module docstring)."""
+
+    def __init__(
+        self,
+        rolling_windows: Iterable[int] = ROLL_WINDOWS,
+        momentum_weights: Optional[Mapping[str, Sequence[float]]] = None,
+        elo: Optional[EloState] = None,
+    ):
+        self.rolling_windows = list(rolling_windows)
+        self.momentum_weights = dict(momentum_weights or {"4": MOMENTUM_WEIGHTS})
+        self.elo = elo or EloState()
+        self.columns: Optional[list[str]] = None
+        self.teams: Dict[int, _TeamState] = {}
+        self._last_elo_key: Optional[tuple] = None
+        self._buffer_size = max(
+            [*self.rolling_windows, *(len(weights) for weights in self.momentum_weights.values()), 1]
+        )
+
+    @classmethod
+    def from_logs(cls, logs: pd.DataFrame, **kwargs) -> "TeamStateStore":
+        store = cls(**kwargs)
+        store.update(logs)
+        return store
+
+    def _index(self, column: str) -> int:
+        return self.columns.index(column)
+
+    def update(self, logs: pd.DataFrame) -> int:
+        """
+        Record team-game rows that are newer than each team's last recorded game.
+
+        Rows can overlap what is already recorded (e.g. a full season cache);
+        anything at or before a team's last game is skipped. Returns the number
+        of team-game rows added.
+        """
+        if logs.empty:
+            return 0
+        derived = derive_game_stats(logs.copy())
+        derived["gameDate"] = pd.to_datetime(derived["gameDate"])
+        derived["gameId"] = derived["gameId"].astype(str)
+        if self.columns is None:
+            self.columns = _tracked_columns(derived.columns)
+        # Cheap vectorized pre-filter so overlapping logs only walk the new rows
+        last_dates = pd.to_datetime(
+            derived["teamId"].map({team: state.last_game_date for team, state in self.teams.items()})
+        )
+        derived = derived[last_dates.isna() | (derived["gameDate"] >= last_dates)]
+        derived = derived.sort_values(["teamId", "seasonId", "gameDate", "gameId"], kind="stable")
+
+        values = derived.reindex(columns=self.columns).to_numpy(dtype=float)
+        win = derived["win"].astype(bool).to_numpy()
+        home = derived["is_home"].to_numpy(dtype=bool)
+        flags = np.column_stack([home, ~home, win, ~win])
+
+        added = 0
+        for row, (team_id, season_id, game_date, game_id) in enumerate(
+            zip(derived["teamId"], derived["seasonId"], derived["gameDate"], derived["gameId"])
+        ):
+            state = self.teams.get(int(team_id))
+            if state is None:
+                state = self.teams[int(team_id)] = _TeamState(len(self.columns), self._buffer_size)
+            key = (game_date, game_id)
+            if state.last_key is not None and key <= state.last_key:
+                continue
+            state.record(str(season_id), game_date, key, values[row], flags[row])
+            added += 1
+
+        self._update_elo(derived)
+        return added
+
+    def _update_elo(self, derived: pd.DataFrame) -> None:
+        if self._last_elo_key is not None:
+            last_date, _ = self._last_elo_key
+            derived = derived[derived["gameDate"] >= last_date]
+        if derived.empty:
+            return
+        games = build_game_dataframe(derived).sort_values(["gameDate", "gameId"], kind="stable")
+        for season, home_id, away_id, home_score, away_score, home_win, game_date, game_id in zip(
+            games["seasonId"],
+            games["teamId_home"],
+            games["teamId_away"],
+            games["home_score"],
+            games["away_score"],
+            games["home_win"],
+            games["gameDate"],
+            games["gameId"],
+        ):
+            key = (game_date, game_id)
+            if self._last_elo_key is not None and key <= self._last_elo_key:
+                continue
+            self.elo.play(season, home_id, away_id, home_score, away_score, home_win)
+            self._last_elo_key = key
+
+    def features_for(self, team_id: int, as_of_date, season_id: Optional[str] = None) -> Dict[str, float]:
+        """
+        Pre-game features for a team's next game on `as_of_date`.
+
+        season_id defaults to the team's latest recorded season; pass the new
+        season for a team's first game of a season. Raises ValueError if the
+        state already includes games on or after as_of_date.
+        """
+        if self.columns is None:
+            raise ValueError("TeamStateStore has no games recorded")
+        as_of = pd.Timestamp(as_of_date)
+        state = self.teams.get(int(team_id))
+        if season_id is None:
+            if state is None:
+                raise ValueError(f"No games recorded for team {team_id}; pass season_id")
+            season_id = state.season_id
+        season_id = str(season_id)
+        if state is not None and state.last_game_date is not None and state.last_game_date >= as_of:
+            raise ValueError(f"Team {team_id} already has games recorded on or after {as_of.date()}")
+
+        in_season = state is not None and state.season_id == season_id
+        n_games = state.games if in_season else 0
+        recent = np.array(state.recent) if in_season and n_games else np.empty((0, len(self.columns)))
+        available = set(self.columns)
+        features: Dict[str, float] = {"games_played_prior": n_games}
+
+        # Season-to-date averages (like cumsum().shift(1): NaN right after a NaN game)
+        for name, column in SEASON_AVERAGES.items():
+            if column not in available:
+                continue
+            col = self._index(column)
+            if n_games == 0 or np.isnan(recent[-1, col]):
+                features[name] = np.nan
+            else:
+                features[name] = state.sums[col] / n_games
+        if "season_xg_for_avg" in features and "season_xg_against_avg" in features:
+            features["season_xg_diff_avg"] = features["season_xg_for_avg"] - features["season_xg_against_avg"]
+
+        # Rest and schedule congestion
+        rest_days = state.rest_days(season_id, as_of) if in_season else np.nan
+        rest_filled = 10.0 if np.isnan(rest_days) else rest_days
+        previous = list(state.rest_flags) if state is not None else []
+        features["rest_days"] = rest_days
+        features["is_b2b"] = int(rest_filled <= 1)
+        features["games_last_3d"] = float(
+            np.clip(int(rest_filled <= 1) + sum(flag[0] for flag in previous[-1:]), 0, 3)
+        )
+        features["games_last_6d"] = float(
+            np.clip(int(rest_filled <= 2) + sum(flag[1] for flag in previous[-3:]), 0, 4)
+        )
+
+        # Streaks
+        streaks = state.streaks if in_season else np.zeros(len(STREAK_FEATURES), dtype=np.int64)
+        for name, count in zip(STREAK_FEATURES, streaks):
+            features[name] = int(count)
+        features["travel_burden"] = max(features["consecutive_away_prior"], 0)
+
+        # Rolling means over the ring buffer (NaNs skipped, NaN when nothing observed)
+        for window in self.rolling_windows:
+            tail = recent[-window:]
+            for template, column, divisor in ROLLING_FEATURE_SPECS:
+                if column not in available:
+                    continue
+                observed = tail[:, self._index(column)]
+                observed = observed[~np.isnan(observed)]
+                mean = observed.sum() / len(observed) if len(observed) else np.nan
+                features[template.format(window=window)] = mean / divisor
+
+        # Momentum-weighted windows (need a full window of prior games)
+        for prefix, column in MOMENTUM_COLUMNS.items():
+            if column not in available:
+                continue
+            col = self._index(column)
+            for suffix, weights in self.momentum_weights.items():
+                total = np.nan
+                if n_games >= len(weights):
+                    total = 0.0
+                    for k, weight in enumerate(weights):
+                        total += recent[-1 - k, col] * weight
+                features[f"{prefix}_{suffix}"] = total
+
+        # Shot margin trends and momentum indicators
+        margin = self._index("shot_margin")
+        features["shot_margin_last_game"] = recent[-1, margin] if n_games else np.nan
+        features["season_shot_margin"] = (
+            state.sums[margin] / state.counts[margin] if n_games and state.counts[margin] else np.nan
+        )
+        if "rolling_win_pct_5" in features:
+            features["momentum_win_pct"] = features["rolling_win_pct_5"] - features["season_win_pct"]
+            features["momentum_goal_diff"] = features["rolling_goal_diff_5"] - features["season_goal_diff_avg"]
+        features["momentum_shot_margin"] = features["shot_margin_last_game"] - features["season_shot_margin"]
+        if "rolling_xg_diff_5" in features and "season_xg_diff_avg" in features:
+            features["momentum_xg"] = features["rolling_xg_diff_5"] - features["season_xg_diff_avg"]
+
+        for name in _filled_feature_columns(features, self.rolling_windows):
+            if name in features and np.isnan(features[name]):
+                features[name] = 0.0
+
+        features["elo_pre"] = self.elo.rating(team_id, season_id)
+        return features
+
+    @property
+    def last_game_date(self) -> Optional[pd.Timestamp]:
+        """Date of the latest game recorded for any team."""
+        dates = [state.last_game_date for state in self.teams.values() if state.last_game_date is not None]
+        return max(dates) if dates else None
+
+    @property
+    def last_season_id(self) -> Optional[str]:
+        """Latest season recorded for any team."""
+        seasons = [state.season_id for state in self.teams.values() if state.season_id is not None]
+        return max(seasons) if seasons else None
+
+    def save(self, path: Path = DEFAULT_STATE_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            pickle.dump(self, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_STATE_PATH) -> "TeamStateStore":
+        with open(path, "rb") as handle:
+            return pickle.load(handle)
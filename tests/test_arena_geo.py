@@ -0,0 +1,100 @@
+"""Tests for the arena geo matrices and the travel features built on them."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.arena_geo import (  # noqa: E402
+    ARENA_CODES,
+    ARENA_LOCATIONS,
+    DISTANCE_MILES,
+    TIMEZONE_CHANGE,
+    UNKNOWN_ARENA,
+    arena_codes,
+    haversine_miles,
+    travel_legs,
+)
+from nhl_prediction.travel_features import add_travel_features  # noqa: E402
+
+from tests.test_features import synthetic_team_logs  # noqa: E402
+
+
+class TestArenaMatrices:
+    def test_matrices_match_pairwise_formula(self):
+        bos, lak = ARENA_CODES.index("BOS"), ARENA_CODES.index("LAK")
+
+        assert DISTANCE_MILES.shape == (len(ARENA_CODES), len(ARENA_CODES))
+        np.testing.assert_allclose(DISTANCE_MILES, DISTANCE_MILES.T)
+        assert np.all(np.diag(DISTANCE_MILES) == 0.0)
+        assert DISTANCE_MILES[bos, lak] == pytest.approx(
+            haversine_miles(*ARENA_LOCATIONS["BOS"][:2], *ARENA_LOCATIONS["LAK"][:2])
+        )
+        assert 2550 < DISTANCE_MILES[bos, lak] < 2650
+        assert TIMEZONE_CHANGE[lak, bos] == 3
+        assert TIMEZONE_CHANGE[bos, lak] == -3
+
+    def test_unknown_teams_give_empty_legs(self):
+        codes = arena_codes(["TOR", "XXX", "MTL"])
+
+        distance, tz_change, known = travel_legs(np.array([codes[0], codes[0], codes[1]]), codes)
+
+        assert codes[1] == UNKNOWN_ARENA
+        assert known.tolist() == [True, False, False]
+        assert distance[0] == 0.0 and distance[1] == 0.0 and tz_change[2] == 0
+
+
+def _reference_travel(logs):
+    """Direct walk over each team-season's games, one leg at a time."""
+    result = {}
+    for _, group in logs.sort_values("gameDate").groupby(["teamId", "seasonId"]):
+        previous, trip_games, trip_distance = None, 0, 0.0
+        for idx, row in group.iterrows():
+            venue = row["teamAbbrev"] if row["homeRoad"] == "H" else row["opponentTeamAbbrev"]
+            distance = 0.0 if previous is None else float(haversine_miles(
+                *ARENA_LOCATIONS[previous][:2], *ARENA_LOCATIONS[venue][:2]
+            ))
+            if row["homeRoad"] == "H":
+                trip_games, trip_distance = 0, 0.0
+            else:
+                trip_games, trip_distance = trip_games + 1, trip_distance + distance
+            result[idx] = (distance, trip_games, trip_distance)
+            previous = venue
+    return pd.DataFrame.from_dict(
+        result, orient="index", columns=["travel_distance", "road_trip_games", "road_trip_distance"]
+    )
+
+
+class TestTravelFeatures:
+    def test_matches_game_by_game_walk(self):
+        logs = synthetic_team_logs(seed=4)
+
+        result = add_travel_features(logs)
+
+        expected = _reference_travel(logs).loc[result.index]
+        np.testing.assert_allclose(result["travel_distance"], expected["travel_distance"], rtol=1e-9)
+        np.testing.assert_array_equal(result["road_trip_games"], expected["road_trip_games"])
+        np.testing.assert_allclose(result["road_trip_distance"], expected["road_trip_distance"], rtol=1e-9)
+
+    def test_timezone_and_coast_flags(self):
+        logs = pd.DataFrame(
+            {
+                "teamId": [6, 6, 6],
+                "seasonId": ["20232024"] * 3,
+                "gameDate": pd.to_datetime(["2023-10-10", "2023-10-12", "2023-10-14"]),
+                "teamAbbrev": ["BOS"] * 3,
+                "opponentTeamAbbrev": ["TOR", "LAK", "MTL"],
+                "homeRoad": ["H", "A", "H"],
+            }
+        )
+
+        result = add_travel_features(logs)
+
+        assert result["timezone_change"].tolist() == [0, -3, 3]
+        assert result["is_east_to_west"].tolist() == [0, 1, 0]
+        assert result["is_west_to_east"].tolist() == [0, 0, 1]
+        assert result["road_trip_games"].tolist() == [0, 1, 0]
@@ -0,0 +1,374 @@
+"""Tests for the NHL data-source clients."""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.data_sources.cache import (  # noqa: E402
+    JSONCache,
+    PackedCache,
+    migrate_json_tree,
+    open_cache,
+)
+from nhl_prediction.data_sources.freshness import (  # noqa: E402
+    read_meta,
+    schedule_week_ttl,
+    standings_ttl,
+    stats_summary_ttl,
+)
+from nhl_prediction.data_sources.gamecenter import GamecenterClient  # noqa: E402
+from nhl_prediction.data_sources.http_client import HttpClient  # noqa: E402
+from nhl_prediction.data_sources.rate_limit import TokenBucket  # noqa: E402
+from nhl_prediction.data_sources.replay import (  # noqa: E402
+    RecordingSession,
+    ReplaySession,
+    session_from_env,
+)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Returns a payload echoing the requested URL; optionally fails some games."""
+
+    def __init__(self, fail_substring=None, delay=0.0):
+        self.fail_substring = fail_substring
+        self.delay = delay
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        with self._lock:
+            self.urls.append(url)
+        time.sleep(self.delay)
+        if self.fail_substring and self.fail_substring in url:
+            return FakeResponse({}, status_code=503)
+        return FakeResponse({"url": url, "gameState": "OFF"})
+
+
+class ConditionalSession:
+    """Serves a versioned payload with an ETag and honours If-None-Match."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.version = 1
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None, **kwargs):
+        headers = headers or {}
+        self.requests.append(headers)
+        etag = f'"v{self.version}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(None, status_code=304, headers={"ETag": etag})
+        return FakeResponse({**self.payload, "version": self.version}, headers={"ETag": etag})
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=20.0, burst=3)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        # 3 immediate tokens, then 2 more at 20/s
+        assert 0.08 <= elapsed < 0.5
+
+    def test_zero_rate_is_unlimited(self):
+        bucket = TokenBucket.from_interval(0.0)
+        start = time.monotonic()
+        for _ in range(100):
+            bucket.acquire()
+        assert time.monotonic() - start < 0.1
+
+
+class TestConcurrentPlayByPlay:
+    def test_iter_preserves_order_and_reports_failures(self, tmp_path):
+        session = FakeSession(fail_substring="2023020003", delay=0.01)
+        client = GamecenterClient(session=session, cache=JSONCache(tmp_path), rate_limit_seconds=0.0)
+        game_ids = [f"202302{n:04d}" for n in range(1, 9)]
+
+        results = list(client.iter_play_by_play(game_ids, max_workers=4))
+
+        assert [game_id for game_id, _ in results] == game_ids
+        failed = [game_id for game_id, payload in results if payload is None]
+        assert failed == ["2023020003"]
+
+    def test_cache_hits_skip_network_and_limiter(self, tmp_path):
+        session = FakeSession()
+        client = GamecenterClient(session=session, cache=JSONCache(tmp_path), rate_limit_seconds=0.0)
+        game_ids = ["2023020001", "2023020002"]
+
+        assert client.prefetch(game_ids) == 2
+        assert len(session.urls) == 2
+
+        # A very slow limiter would make any network call obvious
+        client.rate_limiter = TokenBucket(rate=0.01, burst=1)
+        client.rate_limiter.acquire()
+        start = time.monotonic()
+        payloads = dict(client.iter_play_by_play(game_ids))
+        assert time.monotonic() - start < 1.0
+        assert len(session.urls) == 2
+        assert payloads["2023020002"]["url"].endswith("2023020002/play-by-play")
+
+
+class TestPackedCache:
+    def test_round_trip_and_key_normalisation(self, tmp_path):
+        cache = PackedCache(tmp_path)
+        payload = {"plays": [{"typeDescKey": "goal", "details": {"xCoord": 80}}], "gameState": "OFF"}
+
+        assert not cache.exists("2023/2023020001_pbp")
+        cache.write("2023/2023020001_pbp", payload)
+
+        assert cache.exists(Path("2023") / "2023020001_pbp.json")
+        assert cache.read("2023/2023020001_pbp.json") == payload
+        assert cache.read("2023/missing") is None
+
+        # Index is rebuilt from disk on reopen
+        cache.close()
+        assert PackedCache(tmp_path).read("2023/2023020001_pbp") == payload
+
+    def test_read_many_matches_json_cache(self, tmp_path):
+        json_cache = JSONCache(tmp_path / "json")
+        packed = PackedCache(tmp_path / "packed")
+        keys = [f"2023/202302{n:04d}_pbp.json" for n in range(1, 6)]
+        for n, key in enumerate(keys):
+            json_cache.write(key, {"id": n})
+            packed.write(key, {"id": n})
+
+        wanted = keys[1:4] + ["2023/2023029999_pbp.json"]
+        assert packed.read_many(wanted) == json_cache.read_many(wanted)
+        assert sorted(packed.read_many(wanted)) == keys[1:4]
+
+    def test_migration_and_backend_detection(self, tmp_path):
+        legacy = JSONCache(tmp_path)
+        legacy.write("2022/2022020001_pbp", {"id": 1})
+        legacy.write("schedule/2022-10-01", {"gameWeek": []})
+        assert isinstance(open_cache(tmp_path), JSONCache)
+
+        assert migrate_json_tree(tmp_path, delete_json=True) == 2
+        assert list(tmp_path.rglob("*.json")) == []
+
+        cache = open_cache(tmp_path)
+        assert isinstance(cache, PackedCache)
+        assert cache.read("2022/2022020001_pbp") == {"id": 1}
+        assert cache.read("schedule/2022-10-01.json") == {"gameWeek": []}
+
+    def test_client_uses_packed_backend(self, tmp_path):
+        session = FakeSession()
+        client = GamecenterClient(session=session, cache=PackedCache(tmp_path), rate_limit_seconds=0.0)
+        game_ids = ["2023020001", "2023020002"]
+
+        assert client.prefetch(game_ids, max_workers=2) == 2
+        assert client.prefetch(game_ids, max_workers=2) == 2
+        assert len(session.urls) == 2
+        assert list(tmp_path.rglob("*.json")) == []
+
+
+class TestFreshness:
+    def _client(self, tmp_path, session, **freshness):
+        return GamecenterClient(session=session, cache=JSONCache(tmp_path), rate_limit_seconds=0.0, freshness=freshness)
+
+    def test_fresh_payload_served_from_cache(self, tmp_path):
+        session = ConditionalSession({"standings": []})
+        client = self._client(tmp_path, session)
+
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert len(session.requests) == 1
+
+    def test_expired_payload_revalidates_with_etag(self, tmp_path):
+        session = ConditionalSession({"standings": []})
+        client = self._client(tmp_path, session, standings=0.0)
+
+        client.get_standings("2024-01-01")
+        # Unchanged upstream: 304 keeps the cached body
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert session.requests[-1] == {"If-None-Match": '"v1"'}
+
+        session.version = 2
+        assert client.get_standings("2024-01-01")["version"] == 2
+        assert read_meta(client.cache, "standings/2024-01-01.json")["etag"] == '"v2"'
+
+    def test_legacy_entries_of_mutable_endpoints_are_refreshed(self, tmp_path):
+        JSONCache(tmp_path).write("standings/2024-01-01.json", {"standings": [], "version": 0})
+        session = ConditionalSession({"standings": []})
+        client = self._client(tmp_path, session)
+
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert session.requests == [{}]
+
+    def test_final_play_by_play_is_immutable(self, tmp_path):
+        session = FakeSession()
+        client = GamecenterClient(session=session, cache=JSONCache(tmp_path), rate_limit_seconds=0.0)
+
+        client.get_play_by_play("2023020001")
+        client.get_play_by_play("2023020001")
+        assert len(session.urls) == 1
+        assert read_meta(client.cache, "2023/2023020001_pbp.json") == {}
+
+    def test_failed_revalidation_serves_stale_copy(self, tmp_path):
+        session = ScriptedSession([
+            FakeResponse({"standings": [], "version": 1}),
+            FakeResponse({}, status_code=503),
+            requests.ConnectionError("offline"),
+        ])
+        client = self._client(tmp_path, session, standings=0.0)
+
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert client.get_standings("2024-01-01")["version"] == 1
+        assert session.calls == 3
+
+    def test_uncached_failures_still_raise(self, tmp_path):
+        client = self._client(tmp_path, ScriptedSession([requests.ConnectionError("offline")]))
+
+        with pytest.raises(requests.ConnectionError):
+            client.get_standings("2024-01-01")
+
+    def test_past_season_standings_and_summaries_are_immutable(self):
+        assert standings_ttl({"standings": [{"seasonId": 20222023}]}) is None
+        assert standings_ttl({"standings": [{"seasonId": 29992030}]}) > 0
+        assert standings_ttl({"standings": []}) > 0
+        assert stats_summary_ttl({"data": [{"seasonId": 20212022}, {"seasonId": 20212022}]}) is None
+        assert stats_summary_ttl({"data": [{"seasonId": 20212022}, {"seasonId": 29992030}]}) > 0
+
+    def test_schedule_week_policy(self):
+        final = {"gameWeek": [{"games": [{"gameState": "OFF"}, {"gameState": "FINAL"}]}]}
+        live = {"gameWeek": [{"games": [{"gameState": "OFF"}, {"gameState": "LIVE"}]}]}
+        assert schedule_week_ttl(final) is None
+        assert schedule_week_ttl(live) > 0
+        assert schedule_week_ttl({"gameWeek": []}) > 0
+
+
+class ScriptedSession:
+    """Returns queued responses (or raises queued exceptions) in order."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.headers = {}
+        self.calls = 0
+
+    def get(self, url, params=None, headers=None, timeout=None, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class TestHttpClient:
+    def _client(self, outcomes, **kwargs):
+        session = ScriptedSession(outcomes)
+        kwargs.setdefault("backoff_seconds", 0.0)
+        kwargs.setdefault("host_intervals", {})
+        return HttpClient(session=session, **kwargs), session
+
+    def test_retries_transient_errors(self):
+        client, session = self._client([
+            FakeResponse({}, status_code=503),
+            requests.ConnectionError("reset"),
+            FakeResponse({"ok": True}),
+        ])
+        response = client.get("https://api-web.nhle.com/v1/standings/now")
+        assert response.json() == {"ok": True}
+        assert session.calls == 3
+
+    def test_returns_last_response_when_retries_exhausted(self):
+        client, session = self._client([FakeResponse({}, status_code=429)] * 3, max_retries=2)
+        assert client.get("https://example.com/x").status_code == 429
+        assert session.calls == 3
+
+    def test_client_errors_are_not_retried(self):
+        client, session = self._client([FakeResponse({}, status_code=404)])
+        assert client.get("https://example.com/x").status_code == 404
+        assert session.calls == 1
+
+    def test_retry_after_header_sets_delay(self):
+        client, _ = self._client([])
+        response = FakeResponse({}, status_code=429, headers={"Retry-After": "7"})
+        assert client._backoff(0, response) == 7.0
+        # Jittered exponential backoff stays within [delay/2, delay]
+        client.backoff_seconds = 1.0
+        assert 2.0 <= client._backoff(2, None) <= 4.0
+
+    def test_per_host_rate_limit(self):
+        client, _ = self._client([FakeResponse({})] * 3, host_intervals={"slow.example.com": 0.05})
+        start = time.monotonic()
+        for _ in range(3):
+            client.get("https://slow.example.com/x")
+        assert time.monotonic() - start >= 0.09
+
+
+class TestRecordReplay:
+    def test_replay_serves_recorded_responses_in_order(self, tmp_path):
+        inner = ScriptedSession([
+            FakeResponse({}, status_code=503),
+            FakeResponse({"standings": [1]}, headers={"ETag": '"a"'}),
+            FakeResponse({"data": []}),
+        ])
+        recorder = RecordingSession(tmp_path, session=inner)
+        url = "https://api-web.nhle.com/v1/standings/now"
+        recorder.get(url)
+        recorder.get(url)
+        recorder.get("https://api.nhle.com/stats/rest/en/team/summary", params={"limit": -1, "cayenneExp": "x"})
+
+        replay = ReplaySession(tmp_path)
+        assert replay.get(url).status_code == 503
+        second = replay.get(url)
+        assert second.json() == {"standings": [1]} and second.headers["etag"] == '"a"'
+        # Exhausted keys keep serving their last response
+        assert replay.get(url).json() == {"standings": [1]}
+        # Query parameters are part of the key, independent of order
+        summary = replay.get("https://api.nhle.com/stats/rest/en/team/summary", params={"cayenneExp": "x", "limit": -1})
+        assert summary.json() == {"data": []}
+        assert replay.get("https://api-web.nhle.com/v1/unknown").status_code == 404
+
+    def test_clients_run_offline_from_a_bundle(self, tmp_path):
+        recorder = RecordingSession(tmp_path / "bundle", session=FakeSession())
+        GamecenterClient(session=recorder, cache=JSONCache(tmp_path / "live"), rate_limit_seconds=0.0).get_play_by_play(
+            "2023020001"
+        )
+
+        http = HttpClient(session=ReplaySession(tmp_path / "bundle"), host_intervals={}, backoff_seconds=0.0)
+        client = GamecenterClient(session=http, cache=JSONCache(tmp_path / "offline"), rate_limit_seconds=0.0)
+        assert client.get_play_by_play("2023020001")["url"].endswith("2023020001/play-by-play")
+
+    def test_injected_errors_are_retried(self, tmp_path):
+        RecordingSession(tmp_path, session=ScriptedSession([FakeResponse({"ok": True})])).get("https://example.com/x")
+
+        replay = ReplaySession(tmp_path, error_rate=0.5, seed=3)
+        statuses = [replay.get("https://example.com/x").status_code for _ in range(20)]
+        assert 503 in statuses and 200 in statuses
+
+        http = HttpClient(
+            session=ReplaySession(tmp_path, error_rate=0.5, seed=3), host_intervals={}, max_retries=10
+        )
+        assert http.get("https://example.com/x").json() == {"ok": True}
+
+    def test_session_from_env(self, tmp_path):
+        assert session_from_env({}) is None
+        env = {"PUCKCAST_HTTP_MODE": "replay", "PUCKCAST_HTTP_FIXTURES": str(tmp_path), "PUCKCAST_HTTP_LATENCY": "0.01"}
+        session = session_from_env(env)
+        assert isinstance(session, ReplaySession) and session.latency_seconds == 0.01
+        env["PUCKCAST_HTTP_MODE"] = "record"
+        assert isinstance(session_from_env(env), RecordingSession)
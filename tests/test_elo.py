@@ -0,0 +1,141 @@
+"""Tests for the array Elo engine and parameter sweeps."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.data_ingest import build_game_dataframe  # noqa: E402
+from nhl_prediction.elo import EloState, elo_ratings, elo_sweep, prior_home_win_rate  # noqa: E402
+from nhl_prediction.features import engineer_team_features  # noqa: E402
+from nhl_prediction.pipeline import _add_elo_features  # noqa: E402
+
+from tests.test_features import synthetic_team_logs  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def games():
+    logs = synthetic_team_logs(seed=11, n_days=60)
+    games = build_game_dataframe(engineer_team_features(logs))
+    return games.sort_values(["gameDate", "gameId"], kind="stable").reset_index(drop=True)
+
+
+def _columns(games):
+    return tuple(
+        games[column].to_numpy()
+        for column in ("seasonId", "teamId_home", "teamId_away", "home_score", "away_score", "home_win")
+    )
+
+
+def _reference_loop(games, base_rating=1500.0, k_factor=10.0, home_advantage=35.0, season_carryover=0.5):
+    """The original row-by-row _add_elo_features loop, kept as the parity oracle."""
+    elo_home, elo_away, expected_probs = [], [], []
+    current_season, ratings, prev_season_ratings, recent_home_wins = None, {}, {}, []
+    for season, home_id, away_id, home_score, away_score, home_win in zip(*_columns(games)):
+        if season != current_season:
+            if current_season is not None:
+                prev_season_ratings = ratings.copy()
+            current_season = season
+            ratings = {
+                team: base_rating + season_carryover * (rating - base_rating)
+                for team, rating in prev_season_ratings.items()
+            } if season_carryover > 0 and prev_season_ratings else {}
+        home_rating = ratings.get(int(home_id), base_rating)
+        away_rating = ratings.get(int(away_id), base_rating)
+        elo_home.append(home_rating)
+        elo_away.append(away_rating)
+        current_home_adv = home_advantage
+        if len(recent_home_wins) >= 25:
+            current_home_adv = max(0.0, min(70.0, (np.mean(recent_home_wins[-100:]) - 0.5) * 700.0))
+        expected = 1.0 / (1.0 + 10 ** ((away_rating - (home_rating + current_home_adv)) / 400))
+        expected_probs.append(expected)
+        recent_home_wins.append(int(home_win))
+        margin = max(abs(home_score - away_score), 1)
+        multiplier = np.log(margin + 1) * (2.2 / ((abs(home_rating - away_rating) * 0.001) + 2.2))
+        delta = k_factor * multiplier * ((1.0 if home_win == 1 else 0.0) - expected)
+        ratings[int(home_id)] = home_rating + delta
+        ratings[int(away_id)] = away_rating - delta
+    return np.array([elo_home, elo_away, expected_probs])
+
+
+def _play_all(games, **params):
+    elo = EloState(**params)
+    return np.array([elo.play(*game) for game in zip(*_columns(games))]).T
+
+
+class TestEloRatings:
+    @pytest.mark.parametrize(
+        "params",
+        [{}, {"season_carryover": 0.0, "k_factor": 20.0}, {"dynamic_home_advantage": False, "home_adv_window": 10}],
+    )
+    def test_matches_game_by_game_state(self, games, params):
+        expected = _play_all(games, **params)
+
+        result = elo_ratings(*_columns(games), **params)
+
+        np.testing.assert_array_equal(np.vstack(result), expected)
+
+    @pytest.mark.parametrize("params", [{}, {"season_carryover": 0.0, "k_factor": 20.0}])
+    def test_matches_original_loop(self, games, params):
+        result = elo_ratings(*_columns(games), **params)
+
+        np.testing.assert_allclose(np.vstack(result), _reference_loop(games, **params), rtol=1e-12)
+
+    def test_batch_matches_individual_runs(self, games):
+        k_factors = [6.0, 10.0, 14.0]
+        scales = [500.0, 700.0, 900.0]
+
+        home, away, expected = elo_ratings(*_columns(games), k_factor=k_factors, home_adv_scale=scales)
+
+        assert home.shape == (3, len(games))
+        for index, (k_factor, scale) in enumerate(zip(k_factors, scales)):
+            single = elo_ratings(*_columns(games), k_factor=k_factor, home_adv_scale=scale)
+            np.testing.assert_allclose(home[index], single[0], rtol=1e-12)
+            np.testing.assert_allclose(away[index], single[1], rtol=1e-12)
+            np.testing.assert_allclose(expected[index], single[2], rtol=1e-12)
+
+    def test_prior_home_win_rate_uses_only_earlier_games(self):
+        rate, played = prior_home_win_rate([1, 0, 1, 1, 0], window=2)
+
+        assert np.isnan(rate[0])
+        np.testing.assert_allclose(rate[1:], [1.0, 0.5, 0.5, 1.0])
+        np.testing.assert_array_equal(played, [0, 1, 2, 3, 4])
+
+    def test_add_elo_features_uses_engine(self, games):
+        home, away, expected = _play_all(games)
+
+        result = _add_elo_features(games)
+
+        np.testing.assert_array_equal(result["elo_home_pre"], home)
+        np.testing.assert_array_equal(result["elo_expectation_home"], expected)
+        np.testing.assert_array_equal(result["elo_diff_pre"], home - away)
+
+
+class TestEloSweep:
+    def test_grid_covers_every_combination(self, games):
+        sweep = elo_sweep(games, {"k_factor": [8.0, 12.0], "season_carryover": [0.3, 0.5, 0.7]})
+
+        assert len(sweep.configs) == 6
+        assert sweep.expected_home.shape == (6, len(games))
+        row = sweep.configs.index[(sweep.configs["k_factor"] == 12.0) & (sweep.configs["season_carryover"] == 0.3)][0]
+        single = elo_ratings(*_columns(games), k_factor=12.0, season_carryover=0.3)
+        np.testing.assert_allclose(sweep.home_pre[row], single[0], rtol=1e-12)
+
+    def test_summary_scores_each_configuration(self, games):
+        sweep = elo_sweep(games, {"k_factor": [8.0, 12.0]}, dynamic_home_advantage=False)
+
+        summary = sweep.summary()
+
+        assert list(summary.columns) == ["k_factor", "accuracy", "log_loss", "brier"]
+        expected = sweep.expected_home[0]
+        outcome = games["home_win"].to_numpy()
+        assert summary.loc[0, "accuracy"] == pytest.approx(((expected >= 0.5) == (outcome == 1)).mean())
+        later = sweep.summary(mask=sweep.games["gameDate"] >= sweep.games["gameDate"].median())
+        assert later["accuracy"].between(0, 1).all()
+
+    def test_rejects_unknown_parameter(self, games):
+        with pytest.raises(ValueError):
+            elo_sweep(games, {"base_rating": [1400.0, 1500.0]})
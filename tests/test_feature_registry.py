@@ -0,0 +1,119 @@
+"""Tests for the feature registry and dependency-aware partial feature computation."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction import pipeline  # noqa: E402
+from nhl_prediction.feature_registry import FeatureRegistry  # noqa: E402
+from nhl_prediction.features import TEAM_FEATURES, engineer_team_features  # noqa: E402
+
+from tests.test_features import synthetic_team_logs  # noqa: E402
+
+
+def _registry() -> FeatureRegistry:
+    registry = FeatureRegistry("test")
+    registry.family("base", outputs=("a", "b"))(lambda frame: frame)
+    registry.family("rolling", outputs=("roll_{window}",), depends=("a",))(lambda frame: frame)
+    registry.family("derived", outputs=("c", "d"), depends={"c": ("roll_5", "upstream")})(lambda frame: frame)
+    return registry
+
+
+class TestFeatureRegistry:
+    def test_resolve_takes_transitive_closure(self):
+        plan = _registry().resolve(["c"])
+
+        assert [family.name for family in plan.families] == ["base", "rolling", "derived"]
+        assert plan.wanted == {"base": {"a"}, "rolling": {"roll_5"}, "derived": {"c"}}
+        assert plan.external == {"upstream"}
+
+    def test_resolve_skips_unneeded_families(self):
+        plan = _registry().resolve(["d", "unknown"])
+
+        assert [family.name for family in plan.families] == ["derived"]
+        assert plan.external == {"unknown"}
+
+    def test_window_placeholder_matches_digits_only(self):
+        registry = _registry()
+
+        assert "roll_10" in registry
+        assert "roll_x" not in registry
+
+    def test_none_plans_every_family(self):
+        plan = _registry().resolve()
+
+        assert len(plan.families) == 3
+        assert plan.outputs(plan.families[0]) is None
+
+    def test_rejects_dependency_on_later_family(self):
+        registry = FeatureRegistry("test")
+        registry.family("early", outputs=("a",), depends=("b",))(lambda frame: frame)
+        registry.family("late", outputs=("b",))(lambda frame: frame)
+
+        with pytest.raises(ValueError):
+            registry.resolve(["a"])
+
+    def test_rejects_duplicate_family(self):
+        registry = _registry()
+
+        with pytest.raises(ValueError):
+            registry.family("base", outputs=("z",))(lambda frame: frame)
+
+
+@pytest.fixture(scope="module")
+def logs():
+    return synthetic_team_logs(seed=3)
+
+
+class TestPartialFeatures:
+    def test_team_subset_matches_full_computation(self, logs):
+        requested = ["rolling_win_pct_10", "momentum_xg", "games_last_6d", "travel_burden", "goalie_trend_score"]
+
+        full = engineer_team_features(logs)
+        partial = engineer_team_features(logs, features=requested)
+
+        pd.testing.assert_frame_equal(partial[requested], full[requested])
+        assert "rolling_corsi_3" not in partial.columns
+        assert "h2h_win_pct" not in partial.columns
+        assert "consecutive_wins_prior" in partial.columns  # streaks run as one pass
+
+    def test_unknown_team_feature_raises(self, logs):
+        assert "rolling_win_pct_10" in TEAM_FEATURES
+        with pytest.raises(ValueError):
+            engineer_team_features(logs, features=["not_a_feature"])
+
+    def test_build_dataset_subset_matches_full(self, logs, monkeypatch):
+        monkeypatch.setattr(pipeline, "fetch_multi_season_logs", lambda seasons, incremental=False: logs)
+        requested = [
+            "elo_diff_pre", "rest_diff", "is_b2b_home", "games_last_3d_home",
+            "rolling_goal_diff_5_diff", "momentum_goal_diff_diff", "season_shot_margin_diff",
+            "post_break_game_diff",  # situational: built later, but its rest inputs are requested
+        ]
+
+        full = pipeline.build_dataset(["20222023"])
+        partial = pipeline.build_dataset(["20222023"], features=requested)
+
+        assert list(partial.features.columns) == requested[:-1]
+        pd.testing.assert_frame_equal(partial.features, full.features[requested[:-1]])
+        assert {"rest_days_home", "rest_days_away"}.issubset(partial.games.columns)
+        assert not any(column.startswith("home_team_") for column in partial.games.columns)
+
+    def test_build_dataset_xg_subset_matches_full(self, logs, monkeypatch):
+        monkeypatch.setattr(pipeline, "fetch_multi_season_logs", lambda seasons, incremental=False: logs)
+        # Differences requested without the for/against columns they come from
+        requested = [
+            "rolling_xg_diff_3_diff", "rolling_xg_diff_5_diff", "rolling_xg_diff_10_diff",
+            "season_xg_diff_avg_diff", "momentum_xg_diff", "rolling_corsi_5_diff",
+        ]
+
+        full = pipeline.build_dataset(["20222023", "20232024"])
+        partial = pipeline.build_dataset(["20222023", "20232024"], features=requested)
+
+        pd.testing.assert_frame_equal(partial.features, full.features[requested])
+        pd.testing.assert_series_equal(
+            partial.games["rolling_xg_diff_5_home"], full.games["rolling_xg_diff_5_home"]
+        )
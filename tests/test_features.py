@@ -0,0 +1,312 @@
+"""Tests for pre-game feature engineering helpers."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.features import (  # noqa: E402
+    MOMENTUM_WEIGHTS,
+    ROLLING_FEATURE_SPECS,
+    _add_h2h_features,
+    _lagged_rolling,
+    _lagged_rolling_block,
+    _lagged_streak,
+    _lagged_streaks,
+    _momentum_features,
+    _momentum_weighted_rolling,
+    engineer_team_features,
+    exponential_momentum_weights,
+)
+
+
+def _reference_momentum(group: pd.Series, weights) -> pd.Series:
+    """The original rolling(...).apply formulation, kept as the parity oracle."""
+    window = len(weights)
+
+    def weighted_avg(values):
+        if len(values) < window:
+            padded = [0.0] * (window - len(values)) + list(values)
+        else:
+            padded = list(values[-window:])
+        return sum(v * w for v, w in zip(reversed(padded), weights))
+
+    return group.shift(1).rolling(window, min_periods=1).apply(weighted_avg, raw=False)
+
+
+def _team_logs(seed: int = 0, n_teams: int = 4, n_games: int = 12) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = []
+    for team in range(n_teams):
+        for season in ("20222023", "20232024"):
+            for game in range(n_games - team):
+                rows.append({
+                    "teamId": team,
+                    "seasonId": season,
+                    "gameNo": game,
+                    "xGoalsFor": rng.gamma(2.0, 1.5),
+                    "win": int(rng.random() < 0.5),
+                })
+    logs = pd.DataFrame(rows)
+    logs.loc[rng.choice(len(logs), 5, replace=False), "xGoalsFor"] = np.nan
+    # Interleave teams so groups are not contiguous in row order
+    return logs.sample(frac=1.0, random_state=seed).sort_values(["gameNo"], kind="stable")
+
+
+def synthetic_team_logs(seed: int = 0, n_teams: int = 6, n_days: int = 60, seasons=("20222023", "20232024")) -> pd.DataFrame:
+    """Two rows per game (one per team) with the columns engineer_team_features reads."""
+    rng = np.random.default_rng(seed)
+    abbrevs = {10: "TOR", 8: "MTL", 21: "COL", 22: "EDM", 6: "BOS", 54: "VGK"}
+    team_ids = list(abbrevs)[:n_teams]
+    rows = []
+    for season in seasons:
+        start = pd.Timestamp(f"{season[:4]}-10-10")
+        game_no = 0
+        for day in range(n_days):
+            teams = rng.permutation(team_ids)[: 2 * int(rng.integers(1, n_teams // 2 + 1))]
+            for home, away in zip(teams[::2], teams[1::2]):
+                game_no += 1
+                game_id = f"{season[:4]}02{game_no:04d}"
+                home_goals, away_goals = rng.poisson(3.0, 2)
+                if home_goals == away_goals:
+                    home_goals += 1
+                for team, opp, road, gf, ga in ((home, away, "H", home_goals, away_goals), (away, home, "A", away_goals, home_goals)):
+                    xgf, xga = rng.gamma(3.0, 1.0, 2)
+                    rows.append({
+                        "gameId": game_id,
+                        "seasonId": season,
+                        "gameDate": start + pd.Timedelta(days=day),
+                        "teamId": int(team),
+                        "teamAbbrev": abbrevs[team],
+                        "opponentTeamAbbrev": abbrevs[opp],
+                        "homeRoad": road,
+                        "goalsFor": int(gf),
+                        "goalsAgainst": int(ga),
+                        "shotsForPerGame": float(rng.integers(20, 40)),
+                        "shotsAgainstPerGame": float(rng.integers(20, 40)),
+                        "faceoffWinPct": float(rng.uniform(40, 60)),
+                        "xGoalsFor": xgf,
+                        "xGoalsAgainst": xga,
+                        "highDangerShotsFor": float(rng.integers(0, 12)),
+                        "highDangerxGoalsFor": float(rng.gamma(1.0, 1.0)),
+                        "corsiPercentage": float(rng.uniform(40, 60)),
+                        "reboundsFor": float(rng.integers(0, 5)),
+                        "penaltyDifferential": float(rng.integers(-3, 4)),
+                        "goalieShotsFaced": float(rng.integers(20, 40)),
+                        "goalieGoalsAllowed": float(ga),
+                        "goalieXgAllowed": xga,
+                        "powerPlayPct": float(rng.uniform(10, 30)),
+                        "penaltyKillPct": float(rng.uniform(70, 90)),
+                    })
+    logs = pd.DataFrame(rows)
+    logs.loc[rng.choice(len(logs), 10, replace=False), "xGoalsFor"] = np.nan
+    return logs.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+class TestLaggedRollingBlock:
+    def test_matches_per_column_transform(self):
+        logs = _team_logs(seed=3)
+        group = logs.groupby(["teamId", "seasonId"], sort=False)
+        windows = [1, 3, 5, 10]
+
+        block = _lagged_rolling_block(logs, group, ["xGoalsFor", "win"], windows)
+
+        assert list(block.columns) == [(col, w) for w in windows for col in ("xGoalsFor", "win")]
+        for column in ("xGoalsFor", "win"):
+            for window in windows:
+                expected = group[column].transform(lambda s, w=window: _lagged_rolling(s.astype(float), w))
+                np.testing.assert_allclose(block[(column, window)], expected, rtol=1e-12, atol=1e-12)
+
+    def test_min_periods(self):
+        logs = _team_logs(seed=4)
+        group = logs.groupby(["teamId", "seasonId"], sort=False)
+
+        block = _lagged_rolling_block(logs, group, ["xGoalsFor"], [5], min_periods=3)
+
+        expected = group["xGoalsFor"].transform(lambda s: _lagged_rolling(s, 5, min_periods=3))
+        np.testing.assert_allclose(block[("xGoalsFor", 5)], expected, rtol=1e-12, atol=1e-12)
+
+    def test_engineer_team_features_rolling_columns(self):
+        logs = synthetic_team_logs()
+
+        features = engineer_team_features(logs)
+
+        group = features.groupby(["teamId", "seasonId"], sort=False)
+        for template, column, divisor in ROLLING_FEATURE_SPECS:
+            if column not in features.columns:
+                continue
+            for window in (3, 5, 10):
+                name = template.format(window=window)
+                expected = group[column].transform(lambda s, w=window: _lagged_rolling(s.astype(float), w)) / divisor
+                np.testing.assert_allclose(
+                    features[name].fillna(0.0), expected.fillna(0.0), rtol=1e-9, atol=1e-9, err_msg=name
+                )
+
+
+class TestMomentumRolling:
+    @pytest.mark.parametrize("weights", [MOMENTUM_WEIGHTS, [1.0], [0.5, 0.5], [0.1, 0.2, 0.3, 0.25, 0.15]])
+    def test_single_series_matches_rolling_apply(self, weights):
+        series = pd.Series([1.0, 3.0, np.nan, 2.0, 5.0, 4.0, 0.0, 2.5, 1.5], index=range(10, 19))
+
+        result = _momentum_weighted_rolling(series, weights)
+
+        pd.testing.assert_series_equal(result, _reference_momentum(series, weights))
+
+    def test_short_series_is_all_nan(self):
+        result = _momentum_weighted_rolling(pd.Series([1.0, 2.0, 3.0]), MOMENTUM_WEIGHTS)
+
+        assert result.isna().all()
+
+    def test_grouped_features_match_per_group_transform(self):
+        logs = _team_logs()
+        group = logs.groupby(["teamId", "seasonId"], sort=False)
+        weight_sets = {"4": MOMENTUM_WEIGHTS, "ewm6": exponential_momentum_weights(6, 0.7)}
+
+        features = _momentum_features(
+            logs, group, {"momentum_xg_for": "xGoalsFor", "momentum_win_rate": "win"}, weight_sets
+        )
+
+        assert set(features) == {
+            "momentum_xg_for_4", "momentum_xg_for_ewm6", "momentum_win_rate_4", "momentum_win_rate_ewm6",
+        }
+        for prefix, column in (("momentum_xg_for", "xGoalsFor"), ("momentum_win_rate", "win")):
+            for suffix, weights in weight_sets.items():
+                expected = group[column].transform(lambda s, w=weights: _reference_momentum(s.astype(float), w))
+                pd.testing.assert_series_equal(
+                    features[f"{prefix}_{suffix}"], expected.astype(float), check_names=False
+                )
+
+    def test_missing_columns_are_skipped(self):
+        logs = _team_logs()
+        group = logs.groupby(["teamId", "seasonId"], sort=False)
+
+        features = _momentum_features(logs, group, {"momentum_hd": "highDangerShotsFor"}, {"4": MOMENTUM_WEIGHTS})
+
+        assert features == {}
+
+    def test_exponential_weights(self):
+        weights = exponential_momentum_weights(5, 0.5)
+
+        assert weights.sum() == pytest.approx(1.0)
+        assert np.all(np.diff(weights) < 0)
+        assert weights[1] / weights[0] == pytest.approx(0.5)
+        with pytest.raises(ValueError):
+            exponential_momentum_weights(0, 0.5)
+
+
+def _reference_streak(series: pd.Series) -> pd.Series:
+    """The original per-row loop."""
+    streaks, current = [], 0
+    for value in series.fillna(False):
+        streaks.append(current)
+        current = current + 1 if value else 0
+    return pd.Series(streaks, index=series.index)
+
+
+class TestLaggedStreaks:
+    def test_single_series_matches_loop(self):
+        series = pd.Series([1.0, 1.0, 0.0, np.nan, 1.0, 1.0, 1.0, 0.0, 1.0], index=range(5, 14))
+
+        pd.testing.assert_series_equal(_lagged_streak(series), _reference_streak(series))
+
+    def test_grouped_streaks_match_per_group_loop(self):
+        logs = _team_logs(seed=7)
+        logs["won"] = logs["win"].astype(bool)
+        group = logs.groupby(["teamId", "seasonId"], sort=False)
+
+        streaks = _lagged_streaks(group, {"wins": logs["won"], "losses": ~logs["won"]})
+
+        for column, flags in (("wins", logs["won"]), ("losses", ~logs["won"])):
+            expected = flags.groupby([logs["teamId"], logs["seasonId"]], sort=False).transform(_reference_streak)
+            pd.testing.assert_series_equal(streaks[column], expected.astype("int64"), check_names=False)
+
+    def test_cap(self):
+        logs = pd.DataFrame({"teamId": [1] * 8 + [2] * 3, "flag": [True] * 11})
+        group = logs.groupby("teamId", sort=False)
+
+        streaks = _lagged_streaks(group, {"flag": logs["flag"]}, cap=3)
+
+        assert streaks["flag"].tolist() == [0, 1, 2, 3, 3, 3, 3, 3, 0, 1, 2]
+
+
+def _reference_h2h(logs: pd.DataFrame, lookback: int = 10) -> pd.DataFrame:
+    """The original row-by-row loop; only valid on one row per game."""
+    logs = logs.sort_values(["gameDate", "gameId"]).reset_index(drop=True)
+    logs["h2h_win_pct"] = 0.5
+    logs["h2h_goal_diff"] = 0.0
+    logs["h2h_games_played"] = 0
+    logs["matchup_key"] = logs.apply(
+        lambda row: "_vs_".join(sorted([row["teamAbbrev"], row["opponentTeamAbbrev"]])), axis=1
+    )
+    for _, group in logs.groupby("matchup_key"):
+        indices = group.index.tolist()
+        for i, idx in enumerate(indices[1:], start=1):
+            prev_games = logs.loc[indices[:i]].tail(lookback)
+            current_team = logs.loc[idx, "teamAbbrev"]
+            wins, diffs = 0, []
+            for prev_idx in prev_games.index:
+                same = logs.loc[prev_idx, "teamAbbrev"] == current_team
+                prev_win = logs.loc[prev_idx, "win"]
+                wins += int(prev_win == 1) if same else int(prev_win == 0)
+                diffs.append(logs.loc[prev_idx, "goal_diff"] * (1 if same else -1))
+            logs.loc[idx, "h2h_win_pct"] = wins / len(prev_games)
+            logs.loc[idx, "h2h_goal_diff"] = sum(diffs) / len(prev_games)
+            logs.loc[idx, "h2h_games_played"] = len(prev_games)
+    return logs.drop(columns=["matchup_key"])
+
+
+class TestHeadToHead:
+    @staticmethod
+    def _logs():
+        logs = synthetic_team_logs(seed=2, n_teams=4, n_days=80)
+        logs["goal_diff"] = logs["goalsFor"] - logs["goalsAgainst"]
+        logs["win"] = (logs["goal_diff"] > 0).astype(int)
+        return logs
+
+    @pytest.mark.parametrize("lookback", [3, 10])
+    def test_matches_reference_on_each_perspective(self, lookback):
+        logs = self._logs()
+
+        result = _add_h2h_features(logs, lookback=lookback)
+
+        # The reference loop sees one row per game; check home and away rows separately
+        for venue in ("H", "A"):
+            rows = result[result["homeRoad"] == venue].sort_values(["gameDate", "gameId"])
+            expected = _reference_h2h(logs[logs["homeRoad"] == venue], lookback)
+            assert (rows["teamAbbrev"].to_numpy() == expected["teamAbbrev"].to_numpy()).all()
+            np.testing.assert_allclose(rows["h2h_win_pct"], expected["h2h_win_pct"])
+            np.testing.assert_allclose(rows["h2h_goal_diff"], expected["h2h_goal_diff"])
+            np.testing.assert_array_equal(rows["h2h_games_played"], expected["h2h_games_played"])
+
+    def test_perspectives_are_mirrored_and_order_preserved(self):
+        logs = self._logs()
+
+        result = _add_h2h_features(logs)
+
+        pd.testing.assert_index_equal(result.index, logs.index)
+        by_game = result.pivot_table(
+            index="gameId", columns="homeRoad", values=["h2h_win_pct", "h2h_goal_diff", "h2h_games_played"]
+        )
+        np.testing.assert_allclose(by_game[("h2h_goal_diff", "H")], -by_game[("h2h_goal_diff", "A")])
+        played = by_game[("h2h_games_played", "H")]
+        np.testing.assert_allclose(
+            by_game[("h2h_win_pct", "H")][played > 0] + by_game[("h2h_win_pct", "A")][played > 0], 1.0
+        )
+        assert (by_game[("h2h_win_pct", "H")][played == 0] == 0.5).all()
+
+
+class TestScheduleCongestion:
+    def test_counts_stay_within_each_team(self):
+        features = engineer_team_features(synthetic_team_logs(seed=2))
+
+        for _, team in features.groupby("teamId", sort=False):
+            rest = team.groupby("seasonId", sort=False)["gameDate"].diff().dt.days.fillna(10)
+            one_day, two_day = rest.le(1).astype(int), rest.le(2).astype(int)
+            expected_3d = (one_day + one_day.shift(1, fill_value=0)).clip(0, 3)
+            expected_6d = sum(two_day.shift(k, fill_value=0) for k in range(4)).clip(0, 4)
+            np.testing.assert_array_equal(team["games_last_3d"], expected_3d)
+            np.testing.assert_array_equal(team["games_last_6d"], expected_6d)
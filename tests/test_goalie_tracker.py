@@ -0,0 +1,204 @@
+"""Tests for the indexed goalie tracker and the goalie features built on it."""
+
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction import native_ingest  # noqa: E402
+from nhl_prediction.goalie_features import enhance_with_goalie_features  # noqa: E402
+from nhl_prediction.goalie_tracker import (  # noqa: E402
+    DEFAULT_GOALIE_STATS,
+    GOALIE_TABLE_FIELDS,
+    GoalieTracker,
+    build_goalie_database,
+)
+
+TEAMS = ["BOS", "TOR", "MTL", "OTT"]
+
+
+def _goalie_games(n_games=300, seed=0):
+    rng = np.random.default_rng(seed)
+    games = []
+    for number in range(n_games):
+        shots = int(rng.integers(15, 45))
+        goals = int(rng.integers(0, 6))
+        hd_shots = int(rng.integers(0, 8))
+        rush_shots = int(rng.integers(0, 4))
+        date = pd.Timestamp("2023-10-10") + pd.Timedelta(days=int(rng.integers(0, 150)))
+        games.append({
+            "goalie_id": int(rng.integers(1, 6)),
+            "game_id": f"202302{number:04d}",
+            "game_date": date.strftime("%Y-%m-%d"),
+            "team": "BOS",
+            "opponent": str(rng.choice(TEAMS)),
+            "saves": shots - goals,
+            "shots_against": shots,
+            "goals_against": goals,
+            "high_danger_saves": int(rng.integers(0, hd_shots + 1)),
+            "high_danger_shots": hd_shots,
+            "rush_saves": int(rng.integers(0, rush_shots + 1)),
+            "rush_shots": rush_shots,
+            "expected_goals_against": float(rng.uniform(1.0, 4.0)),
+        })
+    return games
+
+
+def _tracker(games):
+    tracker = GoalieTracker()
+    for game in games:
+        tracker.add_game(**game)
+    return tracker
+
+
+def _reference_recent_form(games, goalie_id, before_date, last_n):
+    """Scan of the goalie's game list: mean per-game rates over the last N starts before the date."""
+    earlier = [g for g in games if g["goalie_id"] == goalie_id and g["game_date"] < before_date]
+    recent = sorted(earlier, key=lambda g: g["game_date"], reverse=True)[:last_n]
+    if not recent:
+        return dict(DEFAULT_GOALIE_STATS)
+    save_pct = [g["saves"] / g["shots_against"] for g in recent]
+    hd = [g["high_danger_saves"] / g["high_danger_shots"] for g in recent if g["high_danger_shots"] > 0]
+    gsa = [g["expected_goals_against"] - g["goals_against"] for g in recent]
+    return {
+        "games_played": len(recent),
+        "save_pct": np.mean(save_pct),
+        "hd_save_pct": np.mean(hd) if hd else 0.0,
+        "gsa_avg": np.mean(gsa),
+        "gsa_total": np.sum(gsa),
+    }
+
+
+class TestGoalieTracker:
+    def test_recent_form_matches_list_scan(self):
+        games = _goalie_games()
+        tracker = _tracker(games)
+
+        for goalie_id in range(0, 7):
+            for before_date in ("2023-10-01", "2023-11-15", "2024-01-02", "2024-06-01"):
+                expected = _reference_recent_form(games, goalie_id, before_date, last_n=5)
+                result = tracker.get_recent_form(goalie_id, before_date, last_n_games=5)
+                for key, value in expected.items():
+                    assert result[key] == pytest.approx(value), (goalie_id, before_date, key)
+
+    def test_batch_queries_match_single_queries(self):
+        tracker = _tracker(_goalie_games(seed=1))
+        rng = np.random.default_rng(2)
+        goalie_ids = rng.integers(0, 7, 50)
+        opponents = rng.choice(TEAMS, 50)
+        dates = (pd.Timestamp("2023-10-01") + pd.to_timedelta(rng.integers(0, 180, 50), unit="D")).strftime("%Y-%m-%d")
+
+        recent = tracker.batch_recent_form(goalie_ids, dates, last_n_games=10)
+        vs_opponent = tracker.batch_vs_opponent(goalie_ids, opponents, dates, min_games=3)
+
+        for row, (goalie_id, opponent, date) in enumerate(zip(goalie_ids, opponents, dates)):
+            single = tracker.get_recent_form(goalie_id, date, last_n_games=10)
+            assert recent.loc[row, "save_pct"] == pytest.approx(single["save_pct"])
+            assert recent.loc[row, "rush_save_pct"] == pytest.approx(single["rush_save_pct"])
+            single = tracker.get_vs_opponent(goalie_id, opponent, date, min_games=3)
+            assert vs_opponent.loc[row, "games_played"] == single["games_played"]
+            assert vs_opponent.loc[row, "gsa_avg"] == pytest.approx(single["gsa_avg"])
+
+    def test_vs_opponent_and_season_stats(self):
+        games = _goalie_games(seed=3)
+        tracker = _tracker(games)
+        vs_mtl = [g for g in games if g["goalie_id"] == 2 and g["opponent"] == "MTL" and g["game_date"] < "2024-01-01"]
+
+        result = tracker.get_vs_opponent(2, "MTL", "2024-01-01")
+        season = tracker.get_season_stats(2, "20232024", before_date="2024-01-01")
+
+        assert result["games_played"] == len(vs_mtl)
+        assert result["save_pct"] == pytest.approx(np.mean([g["saves"] / g["shots_against"] for g in vs_mtl]))
+        earlier = [g for g in games if g["goalie_id"] == 2 and g["game_date"] < "2024-01-01"]
+        assert season["games_played"] == len(earlier)
+        assert season["save_pct"] == pytest.approx(
+            sum(g["saves"] for g in earlier) / sum(g["shots_against"] for g in earlier)
+        )
+        assert tracker.get_season_stats(2, "20222023") == DEFAULT_GOALIE_STATS
+        assert tracker.get_vs_opponent(2, "MTL", "2023-10-01") == DEFAULT_GOALIE_STATS
+
+    def test_games_added_after_a_query_are_indexed(self):
+        tracker = GoalieTracker()
+        tracker.add_game(1, "2023020001", "2023-10-10", "BOS", "TOR", 28, 30, 2, expected_goals_against=3.0)
+        assert tracker.get_recent_form(1, "2023-10-12")["games_played"] == 1
+
+        tracker.add_game(1, "2023020002", "2023-10-11", "BOS", "MTL", 19, 20, 1, expected_goals_against=1.0)
+        result = tracker.get_recent_form(1, "2023-10-12")
+
+        assert result["games_played"] == 2
+        assert result["gsa_total"] == pytest.approx(1.0)
+
+    def test_pickle_round_trip_and_legacy_state(self):
+        tracker = _tracker(_goalie_games(n_games=20))
+        restored = pickle.loads(pickle.dumps(tracker))
+
+        legacy = GoalieTracker.__new__(GoalieTracker)
+        legacy.__setstate__({"goalie_games": tracker.goalie_games, "goalie_info": {}})
+
+        expected = tracker.get_recent_form(3, "2024-03-01")
+        assert restored.get_recent_form(3, "2024-03-01") == expected
+        assert legacy.get_recent_form(3, "2024-03-01") == expected
+
+
+def _goalie_table(games, season_id="20232024"):
+    """Goalie games in the native ingest goalie-table layout."""
+    table = pd.DataFrame(games).rename(columns={**GOALIE_TABLE_FIELDS, "goalie_id": "goalieId"})
+    table["toiSeconds"] = 3600
+    table["seasonId"] = season_id
+    table["teamId"] = 6
+    table["homeRoad"] = "H"
+    return table[native_ingest.GOALIE_TABLE_COLUMNS]
+
+
+class TestGoalieDatabase:
+    def test_from_frame_matches_add_game(self):
+        games = _goalie_games(n_games=120, seed=5)
+        games[0]["shots_against"] = games[0]["saves"] = games[0]["goals_against"] = 0
+
+        loaded = GoalieTracker.from_frame(_goalie_table(games))
+        added = _tracker(games)
+
+        assert loaded.goalie_games == added.goalie_games
+        assert loaded.get_recent_form(2, "2024-01-20") == added.get_recent_form(2, "2024-01-20")
+
+    def test_build_reads_season_goalie_tables(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(native_ingest, "CACHE_DIR", tmp_path)
+        games = _goalie_games(n_games=60, seed=6)
+        native_ingest._save_goalie_table("20232024", _goalie_table(games))
+
+        tracker = build_goalie_database(["20222023", "20232024"])
+
+        assert len(tracker.goalie_games[3]) == sum(g["goalie_id"] == 3 for g in games)
+        assert tracker.get_recent_form(3, "2024-02-01") == _tracker(games).get_recent_form(3, "2024-02-01")
+        assert build_goalie_database(["20212022"]).get_recent_form(3, "2024-02-01") == DEFAULT_GOALIE_STATS
+
+
+class TestIndividualGoalieFeatures:
+    def test_batch_features_match_tracker_queries(self):
+        tracker = _tracker(_goalie_games(seed=4))
+        games = pd.DataFrame({
+            "gameDate": pd.to_datetime(["2023-12-01", "2023-12-01", "2024-01-15"]),
+            "teamAbbrev_home": ["BOS", "MTL", "TOR"],
+            "teamAbbrev_away": ["TOR", "OTT", "BOS"],
+        })
+        starters = {
+            "2023-12-01": {"BOS": 1, "TOR": 2, "MTL": 3},
+            "2024-01-15": {"TOR": 4, "BOS": 5},
+        }
+
+        result = enhance_with_goalie_features(games, tracker, starters)
+
+        expected = tracker.get_recent_form(3, "2023-12-01")
+        assert result.loc[1, "goalie_gsa_last5_home"] == pytest.approx(expected["gsa_avg"])
+        assert result.loc[1, "goalie_save_pct_last5_away"] == 0.0  # no OTT starter
+        vs_bos = tracker.get_vs_opponent(4, "BOS", "2024-01-15")
+        assert result.loc[2, "goalie_vs_opp_save_pct_home"] == pytest.approx(vs_bos["save_pct"])
+        np.testing.assert_allclose(
+            result["goalie_quality_diff"],
+            result["goalie_save_pct_last5_home"] - result["goalie_save_pct_last5_away"],
+        )
@@ -0,0 +1,99 @@
+"""Tests for the low-memory dataset mode."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction import pipeline  # noqa: E402
+from nhl_prediction.memory import StageMemory, downcast_frame  # noqa: E402
+
+from tests.test_features import synthetic_team_logs  # noqa: E402
+
+
+class TestDowncastFrame:
+    def test_downcasts_counts_rates_and_categoricals(self):
+        frame = pd.DataFrame(
+            {
+                "games": np.arange(5, dtype=np.int64),
+                "big": np.array([0, 1, 2, 3, 100_000], dtype=np.int64),
+                "rate": np.linspace(0, 1, 5),
+                "flag": [True, False, True, False, True],
+                "teamAbbrev": ["TOR", "MTL", "TOR", "BOS", "MTL"],
+                "gameDate": pd.date_range("2024-01-01", periods=5),
+            }
+        )
+
+        result = downcast_frame(frame, categorical_columns=["teamAbbrev"])
+
+        assert result is frame
+        assert result["games"].dtype == np.int16
+        assert result["big"].dtype == np.int32
+        assert result["rate"].dtype == np.float32
+        assert result["flag"].dtype == bool
+        assert isinstance(result["teamAbbrev"].dtype, pd.CategoricalDtype)
+        assert result["gameDate"].dtype == "datetime64[ns]"
+
+
+class TestLowMemoryDataset:
+    @pytest.fixture
+    def logs(self, monkeypatch):
+        logs = synthetic_team_logs(seed=3)
+        monkeypatch.setattr(pipeline, "fetch_multi_season_logs", lambda seasons, incremental=False: logs.copy())
+        return logs
+
+    def test_matches_default_build_within_float32_precision(self, logs):
+        full = pipeline.build_dataset(["20222023"])
+        low = pipeline.build_dataset(["20222023"], low_memory=True)
+
+        assert list(low.features.columns) == list(full.features.columns)
+        assert set(low.features.columns) == set(full.features.columns)
+        np.testing.assert_allclose(
+            low.features.to_numpy(dtype=float), full.features.to_numpy(dtype=float), rtol=1e-5, atol=1e-4
+        )
+        pd.testing.assert_series_equal(low.target, full.target, check_dtype=False)
+        assert low.features.memory_usage().sum() < full.features.memory_usage().sum() / 1.5
+        assert isinstance(low.games["teamAbbrev_home"].dtype, pd.CategoricalDtype)
+
+    def test_unmatched_team_adds_no_dummy_columns(self, logs):
+        # A team whose only log row has no opponent row stays a categorical
+        # level in low-memory mode but plays none of the merged games
+        orphan = logs.iloc[[0]].assign(teamId=53, teamAbbrev="UTA", gameId="2022029999")
+        logs.loc[len(logs)] = orphan.iloc[0]
+
+        full = pipeline.build_dataset(["20222023"])
+        low = pipeline.build_dataset(["20222023"], low_memory=True)
+
+        assert set(low.features.columns) == set(full.features.columns)
+        assert "home_team_53" not in low.features.columns
+        assert "away_team_53" not in low.features.columns
+
+    def test_projects_team_columns_before_merge(self, logs):
+        low = pipeline.build_dataset(["20222023"], features=["rolling_win_pct_5_diff", "rest_diff"], low_memory=True)
+
+        assert "rolling_win_pct_5_home" in low.games.columns
+        assert "xGoalsFor_home" not in low.games.columns
+
+    def test_reports_each_stage(self, logs, monkeypatch):
+        trackers = []
+
+        class RecordingStageMemory(StageMemory):
+            def __init__(self, enabled=True):
+                super().__init__(enabled)
+                trackers.append(self)
+
+        monkeypatch.setattr(pipeline, "StageMemory", RecordingStageMemory)
+        pipeline.build_dataset(["20222023"], low_memory=True)
+
+        assert [stage for stage, _ in trackers[0].stages] == [
+            "fetch",
+            "engineer_team_features",
+            "build_game_dataframe",
+            "game_features",
+            "feature_matrix",
+        ]
+        assert all(peak > 0 for _, peak in trackers[0].stages)
@@ -0,0 +1,455 @@
+"""Tests for native NHL ingest (xG scoring and game aggregation)."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction import native_ingest  # noqa: E402
+from nhl_prediction.data_sources.cache import JSONCache  # noqa: E402
+from nhl_prediction.data_sources.gamecenter import GamecenterClient  # noqa: E402
+from nhl_prediction.native_ingest import (  # noqa: E402
+    ExpectedGoalsModel,
+    ShotFeatures,
+    _append_new_games,
+    _build_xg_training_data,
+    _compute_goaltending_metrics,
+    _process_game_plays,
+    _process_season_games,
+    _train_xg_model,
+    aggregate_shot_xg,
+    build_season_game_index,
+    rescore_team_logs,
+    xg_training_frame,
+)
+
+HOME_ID = 10
+AWAY_ID = 8
+
+
+def _make_play(type_key, owner, time_in_period, period=1, x=60, y=5, shot_type="wrist", situation="1551", **details):
+    return {
+        "typeDescKey": type_key,
+        "timeInPeriod": time_in_period,
+        "periodDescriptor": {"number": period},
+        "homeTeamDefendingSide": "left",
+        "situationCode": situation,
+        "details": {
+            "eventOwnerTeamId": owner,
+            "xCoord": x,
+            "yCoord": y,
+            "shotType": shot_type,
+            **details,
+        },
+    }
+
+
+def make_pbp(game_id="2023020001", home=(HOME_ID, "TOR"), away=(AWAY_ID, "MTL"), game_date="2023-10-12"):
+    """Small synthetic play-by-play payload covering the main event types."""
+    home_id, away_id = home[0], away[0]
+    plays = [
+        _make_play("faceoff-won", home_id, "00:00"),
+        _make_play("takeaway", home_id, "01:10"),
+        _make_play("shot-on-goal", home_id, "01:12", x=80, y=3),
+        _make_play("goal", home_id, "01:14", x=85, y=2, shot_type="tip-in"),
+        _make_play("missed-shot", away_id, "03:00", x=-40, y=20),
+        _make_play("blocked-shot", home_id, "03:30"),
+        _make_play("penalty", away_id, "05:00", duration=2),
+        _make_play("shot-on-goal", home_id, "05:40", x=70, y=-10, shot_type="slap", situation="1451"),
+        _make_play("hit", away_id, "08:00"),
+        _make_play("giveaway", away_id, "09:00"),
+        _make_play("goal", away_id, "04:00", period=2, x=-75, y=8, shot_type="snap"),
+        _make_play("shot-on-goal", away_id, "12:00", period=3, x=-30, y=-30, shot_type="backhand"),
+        _make_play("goal", home_id, "18:00", period=3, x=88, y=1),
+    ]
+    return {
+        "id": int(game_id),
+        "season": 20232024,
+        "gameDate": game_date,
+        "gameState": "OFF",
+        "homeTeam": {"id": home[0], "abbrev": home[1]},
+        "awayTeam": {"id": away[0], "abbrev": away[1]},
+        "plays": plays,
+    }
+
+
+@pytest.fixture(scope="module")
+def xg_model():
+    """Tiny xG model trained on synthetic shots."""
+    rng = np.random.default_rng(0)
+    n = 400
+    shot_types = rng.choice(["wrist", "slap", "snap", "tip-in", "backhand"], size=n)
+    distance = rng.uniform(5, 60, size=n)
+    data = pd.DataFrame(
+        {
+            "distance": distance,
+            "angle": rng.uniform(0, 80, size=n),
+            "shot_type": shot_types,
+            "is_even_strength": rng.integers(0, 2, size=n),
+            "is_power_play": rng.integers(0, 2, size=n),
+            "is_offensive_zone": rng.integers(0, 2, size=n),
+            "is_rebound": rng.integers(0, 2, size=n),
+            "is_rush_shot": rng.integers(0, 2, size=n),
+            "is_third_period": rng.integers(0, 2, size=n),
+            "is_deflection": rng.integers(0, 2, size=n),
+            "is_screened": rng.integers(0, 2, size=n),
+            "is_one_timer": rng.integers(0, 2, size=n),
+            "is_goal": (rng.uniform(size=n) < 1.5 / distance).astype(int),
+        }
+    )
+    return ExpectedGoalsModel(_train_xg_model(data))
+
+
+def _single_row_xg(model, shot):
+    """Reference implementation: one-row DataFrame per shot."""
+    features = shot.to_dict()
+    for col in model.feature_columns:
+        if col.startswith("shot_"):
+            features[col] = 1 if col == f"shot_{shot.shot_type.lower()}" else 0
+    for col in model.feature_columns:
+        features.setdefault(col, 0)
+    X = pd.DataFrame([features])[model.feature_columns]
+    return model.model.predict_proba(X)[0, 1]
+
+
+class TestBatchXg:
+    def test_batch_matches_single_row_scoring(self, xg_model):
+        shots = [
+            ShotFeatures(12.0, 10.0, "wrist", True, False, "O"),
+            ShotFeatures(40.0, 55.0, "slap", False, True, "O", is_rush_shot=True, period=3),
+            ShotFeatures(6.0, 5.0, "tip-in", True, False, "O", is_deflection=True, is_screened=True),
+            ShotFeatures(30.0, 20.0, "unknown-type", True, False, "N"),
+        ]
+        batch = xg_model.predict_xg_batch(shots)
+        expected = [_single_row_xg(xg_model, shot) for shot in shots]
+        np.testing.assert_allclose(batch, expected)
+        assert xg_model.predict_xg(shots[1]) == pytest.approx(expected[1])
+
+    def test_empty_batch(self, xg_model):
+        assert len(xg_model.predict_xg_batch([])) == 0
+
+    def test_process_game_plays_scatters_xg(self, xg_model):
+        stats = _process_game_plays("2023020001", make_pbp(), xg_model)
+        home, away = stats[HOME_ID], stats[AWAY_ID]
+
+        assert home["goalsFor"] == 2 and away["goalsFor"] == 1
+        assert home["shotsForPerGame"] == 4 and away["shotsForPerGame"] == 2
+        assert home["xGoalsFor"] == pytest.approx(away["xGoalsAgainst"])
+        assert home["highDangerxGoalsFor"] <= home["xGoalsFor"]
+        assert 0 < home["xGoalsPercentage"] < 100
+
+    def test_process_game_plays_records_period_score_state(self, xg_model):
+        stats = _process_game_plays("2023020001", make_pbp(), xg_model)
+        home, away = stats[HOME_ID], stats[AWAY_ID]
+
+        # home scores in the 1st, away in the 2nd, home wins it in the 3rd
+        assert (home["goalsForEnteringP2"], home["goalsAgainstEnteringP2"]) == (1, 0)
+        assert (away["leadingEnteringP2"], away["trailingEnteringP2"]) == (0, 1)
+        assert (home["goalsForEnteringP3"], home["goalsAgainstEnteringP3"]) == (1, 1)
+        assert home["trailingEnteringP3"] == home["leadingEnteringP3"] == away["trailingEnteringP3"] == 0
+        assert set(native_ingest.SCORE_STATE_COLUMNS) <= set(home)
+
+    def test_process_game_plays_counts_special_teams(self, xg_model):
+        pbp = make_pbp()
+        pbp["plays"] = [
+            _make_play("penalty", AWAY_ID, "02:00", duration=2),
+            _make_play("faceoff-won", HOME_ID, "02:00", situation="1451"),
+            _make_play("goal", HOME_ID, "03:00", situation="1451"),  # home power-play goal
+            _make_play("faceoff-won", HOME_ID, "03:00"),
+            _make_play("penalty", HOME_ID, "06:00", duration=2),
+            _make_play("shot-on-goal", AWAY_ID, "06:30", x=-60, situation="1541"),
+            _make_play("goal", HOME_ID, "07:00", situation="1541"),  # shorthanded goal
+            _make_play("goal", AWAY_ID, "19:00", situation="0651"),  # extra attacker, not a power play
+        ]
+
+        stats = _process_game_plays("2023020001", pbp, xg_model)
+        home, away = stats[HOME_ID], stats[AWAY_ID]
+
+        assert (home["powerPlayGoalsFor"], away["powerPlayGoalsAgainst"]) == (1, 1)
+        assert (home["shortHandedGoalsFor"], away["shortHandedGoalsAgainst"]) == (1, 1)
+        assert away["powerPlayGoalsFor"] == away["shortHandedGoalsFor"] == 0
+        assert (home["powerPlayOpportunities"], away["powerPlayOpportunities"]) == (1, 1)
+        assert (home["penaltyKillOpportunities"], home["penaltiesTaken"], home["penaltiesDrawn"]) == (1, 1, 1)
+
+    def test_pulled_goalie_keeps_one_power_play(self, xg_model):
+        pbp = make_pbp()
+        pbp["plays"] = [
+            _make_play("penalty", HOME_ID, "17:00", period=3, duration=2),
+            _make_play("faceoff-won", AWAY_ID, "17:00", period=3, situation="1541"),
+            _make_play("shot-on-goal", AWAY_ID, "17:40", period=3, x=-60, situation="0641"),  # goalie pulled
+            _make_play("faceoff-won", AWAY_ID, "17:45", period=3, situation="1541"),  # back in for the draw
+            _make_play("goal", AWAY_ID, "18:30", period=3, x=-80, situation="0641"),  # 6-on-4
+            _make_play("faceoff-won", HOME_ID, "18:30", period=3, situation="1551"),
+        ]
+
+        stats = _process_game_plays("2023020001", pbp, xg_model)
+        home, away = stats[HOME_ID], stats[AWAY_ID]
+
+        assert (away["powerPlayOpportunities"], home["penaltyKillOpportunities"]) == (1, 1)
+        assert (away["powerPlayGoalsFor"], home["powerPlayGoalsAgainst"]) == (1, 1)
+
+    def test_process_game_plays_charges_goalie_in_net(self, xg_model):
+        pbp = make_pbp()
+        pbp["plays"] = [
+            _make_play("faceoff-won", HOME_ID, "00:00"),
+            _make_play("shot-on-goal", HOME_ID, "05:00", x=80, goalieInNetId=40),
+            _make_play("shot-on-goal", AWAY_ID, "10:00", x=-60, goalieInNetId=30),
+            _make_play("goal", HOME_ID, "15:00", x=85, goalieInNetId=40),
+            _make_play("shot-on-goal", HOME_ID, "05:00", period=2, x=70, goalieInNetId=41),  # relief goalie
+            _make_play("faceoff-won", HOME_ID, "18:00", period=3, situation="1560"),  # home net empty
+            _make_play("goal", AWAY_ID, "19:00", period=3, x=-20, situation="1560"),
+            _make_play("shot-on-goal", AWAY_ID, "00:00", period=5, x=-80, goalieInNetId=30),  # shootout
+            _make_play("shot-on-goal", AWAY_ID, "00:00", period=5, x=-85, goalieInNetId=30),
+            _make_play("game-end", None, "20:00", period=3),
+        ]
+        for play in pbp["plays"][-3:-1]:
+            play["periodDescriptor"]["periodType"] = "SO"
+        goalie_rows = []
+
+        stats = _process_game_plays("2023020001", pbp, xg_model, goalie_rows=goalie_rows)
+        goalies = pd.DataFrame(goalie_rows, columns=native_ingest.GOALIE_TABLE_COLUMNS).set_index("goalieId")
+
+        assert sorted(goalies.index) == [30, 40, 41]
+        assert goalies.loc[40, ["shotsAgainst", "saves", "goalsAgainst"]].tolist() == [2, 1, 1]
+        assert goalies.loc[41, ["teamId", "homeRoad", "saves"]].tolist() == [AWAY_ID, "A", 1]
+        # The empty-net goal counts against the team but no goalie
+        assert stats[HOME_ID]["goalsAgainst"] == 1 and goalies.loc[30, "goalsAgainst"] == 0
+        # Shootout attempts are not charged to the goalie
+        assert goalies.loc[30, ["shotsAgainst", "saves"]].tolist() == [1, 1]
+        assert goalies.loc[[40, 41], "xGoalsAgainst"].sum() == pytest.approx(stats[HOME_ID]["xGoalsFor"])
+        # Starter credited from puck drop; no time while the net was empty
+        assert goalies["toiSeconds"].to_dict() == {40: 25 * 60, 30: 58 * 60, 41: 35 * 60}
+
+
+class FakeScheduleClient:
+    """Serves weekly schedule payloads keyed by start date."""
+
+    def __init__(self, weeks):
+        self.weeks = weeks
+        self.requests = []
+
+    def get_schedule(self, date_str, *, use_cache=True):
+        self.requests.append((date_str, use_cache))
+        return self.weeks.get(date_str, {"gameWeek": []})
+
+
+def _schedule_game(game_id, state, game_type=2, season=20232024):
+    return {
+        "id": game_id,
+        "season": season,
+        "gameType": game_type,
+        "gameState": state,
+        "homeTeam": {"id": HOME_ID},
+        "awayTeam": {"id": AWAY_ID},
+    }
+
+
+class TestSeasonGameIndex:
+    def test_index_follows_schedule_weeks(self):
+        weeks = {
+            "2023-09-15": {
+                "gameWeek": [{"date": "2023-09-20", "games": [_schedule_game(2023010001, "OFF", game_type=1)]}],
+                "nextStartDate": "2023-10-10",
+                "regularSeasonEndDate": "2023-10-20",
+            },
+            "2023-10-10": {
+                "gameWeek": [
+                    {"date": "2023-10-10", "games": [_schedule_game(2023020002, "OFF")]},
+                    {"date": "2023-10-11", "games": [_schedule_game(2023020001, "FINAL")]},
+                ],
+                "nextStartDate": "2023-10-17",
+                "regularSeasonEndDate": "2023-10-20",
+            },
+            "2023-10-17": {
+                "gameWeek": [{"date": "2023-10-18", "games": [_schedule_game(2023020004, "FUT")]}],
+                "nextStartDate": "2023-10-24",
+                "regularSeasonEndDate": "2023-10-20",
+            },
+        }
+        client = FakeScheduleClient(weeks)
+
+        index = build_season_game_index("20232024", client)
+
+        assert index["gameId"].tolist() == ["2023020001", "2023020002", "2023020004"]
+        assert index.set_index("gameId").loc["2023020004", "gameState"] == "FUT"
+        # Walk stops at the regular-season end date; each week is requested once
+        # and refetching unfinished weeks is left to the cache freshness policy
+        assert client.requests == [("2023-09-15", True), ("2023-10-10", True), ("2023-10-17", True)]
+
+    def test_ignores_previous_season_end_date_before_season_starts(self):
+        # September 2020 was still the 2019-20 bubble playoffs
+        weeks = {
+            "2020-09-15": {
+                "gameWeek": [{"date": "2020-09-19", "games": [_schedule_game(2019030411, "OFF", 3, 20192020)]}],
+                "nextStartDate": "2021-01-13",
+                "regularSeasonEndDate": "2020-03-11",
+            },
+            "2021-01-13": {
+                "gameWeek": [{"date": "2021-01-13", "games": [_schedule_game(2020020001, "OFF", season=20202021)]}],
+                "nextStartDate": "2021-01-20",
+                "regularSeasonEndDate": "2021-05-19",
+            },
+        }
+        client = FakeScheduleClient(weeks)
+
+        index = build_season_game_index("20202021", client)
+
+        assert index["gameId"].tolist() == ["2020020001"]
+        assert "2021-01-13" in [date for date, _ in client.requests]
+        assert max(date for date, _ in client.requests) <= "2021-05-19"
+
+
+class FakePbpClient:
+    """Serves synthetic play-by-play and records which games were requested."""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.requested = []
+
+    def iter_play_by_play(self, game_ids):
+        for game_id in game_ids:
+            self.requested.append(game_id)
+            yield game_id, self.payloads.get(game_id)
+
+    def get_play_by_play(self, game_id, *, use_cache=True):
+        return self.payloads[game_id]
+
+
+class TestIncrementalSeason:
+    def test_append_matches_full_rebuild(self, xg_model, tmp_path, monkeypatch):
+        payloads = {
+            "2023020001": make_pbp("2023020001", game_date="2023-10-12"),
+            "2023020002": make_pbp("2023020002", home=(6, "BOS"), away=(7, "BUF"), game_date="2023-10-12"),
+            "2023020003": make_pbp("2023020003", home=(AWAY_ID, "MTL"), away=(6, "BOS"), game_date="2023-10-14"),
+        }
+        game_ids = list(payloads)
+        monkeypatch.setattr(native_ingest, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(native_ingest, "_fetch_games_for_season", lambda season_id, client: game_ids)
+
+        full = _compute_goaltending_metrics(
+            _process_season_games("20232024", game_ids, FakePbpClient(payloads), xg_model)[0]
+        )
+        cached = _compute_goaltending_metrics(
+            _process_season_games("20232024", game_ids[:2], FakePbpClient(payloads), xg_model)[0]
+        )
+
+        client = FakePbpClient(payloads)
+        updated = _append_new_games("20232024", cached, client, lambda: xg_model)
+
+        assert client.requested == ["2023020003"]
+        key = ["teamId", "gameId"]
+        expected = full.sort_values(key).reset_index(drop=True)
+        actual = updated.sort_values(key).reset_index(drop=True)[expected.columns]
+        pd.testing.assert_frame_equal(actual, expected)
+        # Buffalo did not play the new game - its rows are carried over untouched
+        pd.testing.assert_frame_equal(
+            updated[updated["teamId"] == 7].reset_index(drop=True),
+            cached[cached["teamId"] == 7].reset_index(drop=True),
+        )
+        assert (tmp_path / "native_logs_20232024.parquet").exists()
+
+    def test_refuses_to_append_to_old_schema_cache(self, xg_model, monkeypatch):
+        payloads = {"2023020001": make_pbp("2023020001"), "2023020002": make_pbp("2023020002")}
+        monkeypatch.setattr(native_ingest, "_fetch_games_for_season", lambda season_id, client: list(payloads))
+        cached = _compute_goaltending_metrics(
+            _process_season_games("20232024", ["2023020001"], FakePbpClient(payloads), xg_model)[0]
+        ).drop(columns=native_ingest.SPECIAL_TEAMS_COLUMNS)
+
+        client = FakePbpClient(payloads)
+        with pytest.raises(ValueError, match="rebuild"):
+            _append_new_games("20232024", cached, client, lambda: xg_model)
+        assert client.requested == []
+
+    def test_incremental_load_rebuilds_old_schema_cache(self, xg_model, tmp_path, monkeypatch):
+        payloads = {"2023020001": make_pbp("2023020001"), "2023020002": make_pbp("2023020002")}
+        monkeypatch.setattr(native_ingest, "CACHE_DIR", tmp_path)
+        monkeypatch.setattr(native_ingest, "GamecenterClient", lambda **kwargs: FakePbpClient(payloads))
+        monkeypatch.setattr(native_ingest, "_get_xg_model", lambda client: xg_model)
+        monkeypatch.setattr(native_ingest, "_fetch_games_for_season", lambda season_id, client: list(payloads))
+        cached = _compute_goaltending_metrics(
+            _process_season_games("20232024", ["2023020001"], FakePbpClient(payloads), xg_model)[0]
+        )
+        cached[native_ingest.SCORE_STATE_COLUMNS] = np.nan
+        native_ingest._save_season_cache("20232024", cached)
+
+        logs = native_ingest.load_native_game_logs(["20232024"], incremental=True)
+
+        assert sorted(logs["gameId"].unique()) == ["2023020001", "2023020002"]
+        assert not logs[native_ingest.SCORE_STATE_COLUMNS].isna().any(axis=None)
+
+    def test_no_new_games_skips_processing(self, xg_model, monkeypatch):
+        payloads = {"2023020001": make_pbp("2023020001")}
+        monkeypatch.setattr(native_ingest, "_fetch_games_for_season", lambda season_id, client: list(payloads))
+        cached = _compute_goaltending_metrics(
+            _process_season_games("20232024", list(payloads), FakePbpClient(payloads), xg_model)[0]
+        )
+
+        client = FakePbpClient(payloads)
+        assert _append_new_games("20232024", cached, client, lambda: xg_model) is cached
+        assert client.requested == []
+
+
+class TestShotTable:
+    def _season(self, xg_model):
+        payloads = {
+            "2023020001": make_pbp("2023020001"),
+            "2023020002": make_pbp("2023020002", home=(6, "BOS"), away=(AWAY_ID, "MTL")),
+        }
+        team_games, shots, _ = _process_season_games("20232024", list(payloads), FakePbpClient(payloads), xg_model)
+        return payloads, _compute_goaltending_metrics(team_games), shots
+
+    def test_one_row_per_attempt(self, xg_model):
+        _, _, shots = self._season(xg_model)
+        per_game = shots.groupby("gameId").size()
+        # 3 saved shots, 3 goals, 1 missed, 1 blocked per synthetic game
+        assert per_game.tolist() == [8, 8]
+        assert shots["is_goal"].sum() == 6
+        assert set(shots["seasonId"]) == {"20232024"}
+
+    def test_training_frame_matches_pbp_parse(self, xg_model):
+        payloads, _, shots = self._season(xg_model)
+        parsed = _build_xg_training_data(list(payloads), FakePbpClient(payloads))
+        from_table = xg_training_frame(shots)
+        pd.testing.assert_frame_equal(from_table, parsed[from_table.columns], check_dtype=False)
+
+    def test_rescore_reproduces_ingest_xg(self, xg_model):
+        _, team_logs, shots = self._season(xg_model)
+
+        aggregates = aggregate_shot_xg(shots, xg_model)
+        merged = team_logs.merge(aggregates, on=["gameId", "teamId"], suffixes=("", "_table"))
+        for col in ["xGoalsFor", "xGoalsAgainst", "highDangerxGoalsFor", "highDangerxGoalsAgainst"]:
+            np.testing.assert_allclose(merged[col], merged[f"{col}_table"])
+
+        rescored = rescore_team_logs(team_logs, shots, xg_model)
+        key = ["teamId", "gameId"]
+        pd.testing.assert_frame_equal(
+            rescored.sort_values(key).reset_index(drop=True)[team_logs.columns],
+            team_logs.sort_values(key).reset_index(drop=True),
+        )
+
+
+class TestParallelSeason:
+    def test_workers_match_serial_output(self, xg_model, tmp_path):
+        cache = JSONCache(tmp_path)
+        teams = [(HOME_ID, "TOR"), (AWAY_ID, "MTL"), (6, "BOS"), (7, "BUF")]
+        game_ids = []
+        for n in range(1, 10):
+            game_id = f"202302{n:04d}"
+            home, away = teams[n % 4], teams[(n + 1) % 4]
+            cache.write(f"2023/{game_id}_pbp.json", make_pbp(game_id, home=home, away=away))
+            game_ids.append(game_id)
+        client = GamecenterClient(session=object(), cache=cache, rate_limit_seconds=0.0)
+
+        serial_games, serial_shots, serial_goalies = _process_season_games("20232024", game_ids, client, xg_model)
+        parallel_games, parallel_shots, parallel_goalies = _process_season_games(
+            "20232024", game_ids, client, xg_model, workers=3
+        )
+
+        assert parallel_games["gameId"].tolist() == serial_games["gameId"].tolist()
+        pd.testing.assert_frame_equal(parallel_games, serial_games)
+        pd.testing.assert_frame_equal(parallel_shots, serial_shots)
+        pd.testing.assert_frame_equal(parallel_goalies, serial_goalies)
@@ -0,0 +1,74 @@
+"""Scoring upcoming games from the per-team feature state."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).parents[1] / "prediction"))
+
+import predict_full  # noqa: E402
+from nhl_prediction import pipeline  # noqa: E402
+
+from tests.test_features import synthetic_team_logs  # noqa: E402
+
+# Row-local inputs the state does not keep
+NOT_FROM_STATE = {"league_hw_100", "goalie_trend_score_diff"}
+
+
+@pytest.fixture
+def logs(monkeypatch):
+    logs = synthetic_team_logs(seed=11, n_days=40)
+    fetch = lambda seasons, incremental=False: logs[logs["seasonId"].isin(list(seasons))].copy()  # noqa: E731
+    monkeypatch.setattr(pipeline, "fetch_multi_season_logs", fetch)
+    monkeypatch.setattr(predict_full, "fetch_multi_season_logs", fetch)
+    return logs
+
+
+def test_state_features_match_training_rows(logs, tmp_path):
+    seasons = sorted(logs["seasonId"].unique())
+    dataset = pipeline.build_dataset(seasons, features=predict_full.V70_FEATURES)
+    game_dates = pd.to_datetime(dataset.games["gameDate"])
+    cutoff = game_dates.max()
+    eligible = dataset.games[game_dates < cutoff].copy()
+    eligible["seasonId_str"] = eligible["seasonId"].astype(str)
+    columns = [name for name in dataset.features.columns if name not in NOT_FROM_STATE]
+
+    store = predict_full.load_team_state(seasons, cutoff, path=tmp_path / "team_state.pkl")
+    assert (tmp_path / "team_state.pkl").exists()
+
+    upcoming = dataset.games[game_dates == cutoff]
+    assert len(upcoming)
+    for index, game in upcoming.iterrows():
+        features = predict_full.build_state_matchup_features(
+            store,
+            home_team_id=game["teamId_home"],
+            away_team_id=game["teamId_away"],
+            season_id=str(game["seasonId"]),
+            game_date=cutoff,
+            eligible_games=eligible,
+            feature_columns=columns,
+        )
+        np.testing.assert_allclose(
+            features.to_numpy(dtype=float),
+            dataset.features.loc[index, columns].to_numpy(dtype=float),
+            rtol=1e-9,
+            atol=1e-9,
+        )
+
+
+def test_backfill_rebuilds_without_overwriting_saved_state(logs, tmp_path):
+    seasons = sorted(logs["seasonId"].unique())
+    path = tmp_path / "team_state.pkl"
+    last_date = pd.to_datetime(logs["gameDate"]).max()
+    predict_full.load_team_state(seasons, last_date, path=path)
+    saved = path.read_bytes()
+
+    earlier = last_date - pd.Timedelta(days=10)
+    store = predict_full.load_team_state(seasons, earlier, path=path)
+
+    assert store.last_game_date < earlier
+    assert path.read_bytes() == saved
@@ -0,0 +1,182 @@
+"""Tests for the V7.3 situational context features."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.arena_geo import ARENA_CODES, DISTANCE_MILES  # noqa: E402
+from nhl_prediction.situational_features import (  # noqa: E402
+    FATIGUE_WEIGHTS,
+    _add_fatigue_index,
+    _add_third_period_trailing_perf,
+    _add_travel_distance,
+)
+
+
+def _schedule(n_games=400, n_days=120, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = ["BOS", "TOR", "MTL", "OTT", "DET", "BUF"]
+    return pd.DataFrame(
+        {
+            "gameDate": pd.Timestamp("2023-10-10") + pd.to_timedelta(rng.integers(0, n_days, n_games), unit="D"),
+            "teamAbbrev_home": rng.choice(teams, n_games),
+            "teamAbbrev_away": rng.choice(teams, n_games),
+        }
+    )
+
+
+def _reference_fatigue(games, side, weights=FATIGUE_WEIGHTS):
+    """Direct per-game look-back over the team's earlier games on the same side."""
+    result = pd.Series(0.0, index=games.index)
+    for _, team_games in games.groupby(f"teamAbbrev_{side}"):
+        for idx, game_date in team_games["gameDate"].items():
+            days_ago = (game_date - team_games["gameDate"]).dt.days
+            result[idx] = sum(weights[d - 1] for d in days_ago if 1 <= d <= len(weights))
+    return result
+
+
+class TestFatigueIndex:
+    def test_matches_direct_look_back(self):
+        games = _schedule()
+
+        result = _add_fatigue_index(games.copy())
+
+        for side in ("home", "away"):
+            expected = _reference_fatigue(games, side).loc[result.index]
+            np.testing.assert_allclose(result[f"fatigue_index_{side}"], expected, rtol=1e-12)
+        np.testing.assert_allclose(
+            result["fatigue_index_diff"], result["fatigue_index_home"] - result["fatigue_index_away"]
+        )
+        assert result["gameDate"].is_monotonic_increasing
+
+    def test_custom_weight_profile_sets_window(self):
+        games = pd.DataFrame(
+            {
+                "gameDate": pd.to_datetime(["2023-10-01", "2023-10-02", "2023-10-04", "2023-10-04", "2023-10-09"]),
+                "teamAbbrev_home": ["BOS", "BOS", "BOS", "TOR", "BOS"],
+                "teamAbbrev_away": ["TOR", "MTL", "OTT", "MTL", "OTT"],
+            }
+        )
+
+        result = _add_fatigue_index(games, weights=(1.0, 0.5, 0.25)).sort_index()
+
+        assert result["fatigue_index_home"].tolist() == pytest.approx([0.0, 1.0, 0.5 + 0.25, 0.0, 0.0])
+        # MTL's road game two days earlier counts; OTT's is outside the 3-day window
+        assert result["fatigue_index_away"].tolist() == pytest.approx([0.0, 0.0, 0.0, 0.5, 0.0])
+
+    def test_empty_games(self):
+        result = _add_fatigue_index(_schedule(n_games=0))
+
+        assert result["fatigue_index_diff"].empty
+
+
+class TestTravelDistance:
+    def test_uses_previous_venue_on_the_same_side(self):
+        games = pd.DataFrame(
+            {
+                "gameDate": pd.to_datetime(["2023-10-01", "2023-10-03", "2023-10-05", "2023-10-07"]),
+                "teamAbbrev_home": ["BOS", "TOR", "LAK", "XXX"],
+                "teamAbbrev_away": ["MTL", "MTL", "MTL", "MTL"],
+            }
+        )
+
+        result = _add_travel_distance(games).sort_index()
+
+        mtl_legs = [
+            0.0,
+            DISTANCE_MILES[ARENA_CODES.index("BOS"), ARENA_CODES.index("TOR")],
+            DISTANCE_MILES[ARENA_CODES.index("TOR"), ARENA_CODES.index("LAK")],
+            # unknown home arena: the away team's own arena stands in
+            DISTANCE_MILES[ARENA_CODES.index("LAK"), ARENA_CODES.index("MTL")],
+        ]
+        np.testing.assert_allclose(result["travel_distance_away"], mtl_legs)
+        assert (result["travel_distance_home"] == 0.0).all()
+
+
+def _scored_schedule(n_days=90, seed=1):
+    """Each team plays at most once a day, with final scores and trailing-entering-3rd flags."""
+    rng = np.random.default_rng(seed)
+    teams = ["BOS", "TOR", "MTL", "OTT", "DET", "BUF"]
+    rows = []
+    for day in range(n_days):
+        matchup = rng.permutation(teams)[: 2 * int(rng.integers(1, 4))]
+        for home, away in zip(matchup[::2], matchup[1::2]):
+            home_goals, away_goals = rng.poisson(3.0, 2)
+            home_goals += int(home_goals == away_goals)
+            home_trailing = int(rng.integers(0, 2))
+            rows.append({
+                "gameDate": pd.Timestamp("2023-10-10") + pd.Timedelta(days=day),
+                "teamAbbrev_home": home, "teamAbbrev_away": away,
+                "goalsFor_home": home_goals, "goalsAgainst_home": away_goals,
+                "goalsFor_away": away_goals, "goalsAgainst_away": home_goals,
+                "trailingEnteringP3_home": home_trailing,
+                "trailingEnteringP3_away": 0 if home_trailing else int(rng.integers(0, 2)),
+            })
+    return pd.DataFrame(rows)
+
+
+def _reference_trailing_perf(games):
+    """Per game: win% over the team's last 20 earlier games trailing entering the 3rd (either side)."""
+    rows = []
+    for side in ("home", "away"):
+        rows.append(pd.DataFrame({
+            "team": games[f"teamAbbrev_{side}"], "date": games["gameDate"],
+            "trailing": games[f"trailingEnteringP3_{side}"] == 1,
+            "won": games[f"goalsFor_{side}"] > games[f"goalsAgainst_{side}"],
+        }))
+    history = pd.concat(rows)
+    result = {}
+    for side in ("home", "away"):
+        values = []
+        for team, date in zip(games[f"teamAbbrev_{side}"], games["gameDate"]):
+            earlier = history[(history["team"] == team) & (history["date"] < date) & history["trailing"]]
+            earlier = earlier.sort_values("date").tail(20)
+            values.append(earlier["won"].mean() if len(earlier) >= 5 else 0.5)
+        result[side] = pd.Series(values, index=games.index)
+    return result
+
+
+class TestThirdPeriodTrailingPerf:
+    def test_matches_direct_look_back(self):
+        games = _scored_schedule()
+
+        result = _add_third_period_trailing_perf(games.copy())
+
+        expected = _reference_trailing_perf(games)
+        for side in ("home", "away"):
+            np.testing.assert_allclose(
+                result[f"third_period_trailing_perf_{side}"], expected[side].loc[result.index], rtol=1e-12
+            )
+        assert (result["third_period_trailing_perf_home"] != 0.5).any()
+
+    def test_defaults_without_period_score_state(self):
+        games = _scored_schedule().drop(columns=["trailingEnteringP3_home", "trailingEnteringP3_away"])
+
+        result = _add_third_period_trailing_perf(games)
+
+        assert (result["third_period_trailing_perf_home"] == 0.5).all()
+        assert (result["third_period_trailing_perf_diff"] == 0.0).all()
+
+    def test_defaults_seasons_cached_without_period_score_state(self, caplog):
+        old = _scored_schedule(n_days=60, seed=2).assign(seasonId="20222023")
+        old["gameDate"] -= pd.DateOffset(years=1)
+        old = old.drop(columns=["trailingEnteringP3_home", "trailingEnteringP3_away"])
+        new = _scored_schedule().assign(seasonId="20232024")
+        games = pd.concat([old, new], ignore_index=True)
+
+        result = _add_third_period_trailing_perf(games)
+
+        is_old = result["seasonId"] == "20222023"
+        assert (result.loc[is_old, "third_period_trailing_perf_home"] == 0.5).all()
+        expected = _reference_trailing_perf(new)
+        np.testing.assert_allclose(
+            result.loc[~is_old, "third_period_trailing_perf_away"].sort_index(),
+            expected["away"].set_axis(new.index + len(old)).sort_index(),
+            rtol=1e-12,
+        )
+        assert "20222023" in caplog.text
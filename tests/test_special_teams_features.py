@@ -0,0 +1,156 @@
+"""Tests for the V7.4 special teams features."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.special_teams_features import (  # noqa: E402
+    SPECIAL_TEAMS_SOURCES,
+    _add_home_away_variance,
+    _add_special_teams_rolling,
+    add_special_teams_features,
+    extract_special_teams_goals,
+)
+
+
+def special_teams_games(n_days=80, seed=0, seasons=("20222023", "20232024")):
+    """Game frame with the per-side special teams counts native ingest records."""
+    rng = np.random.default_rng(seed)
+    team_ids = [6, 8, 10, 21, 22, 54]
+    rows = []
+    for season, day in ((season, day) for season in seasons for day in range(n_days)):
+        matchup = rng.permutation(team_ids)[: 2 * int(rng.integers(1, 4))]
+        for home, away in zip(matchup[::2], matchup[1::2]):
+            row = {
+                "gameId": f"2023{len(rows):06d}",
+                "seasonId": season,
+                "gameDate": pd.Timestamp(f"{season[:4]}-10-10") + pd.Timedelta(days=day),
+                "teamId_home": int(home),
+                "teamId_away": int(away),
+            }
+            for side in ("home", "away"):
+                row[f"powerPlayOpportunities_{side}"] = int(rng.integers(0, 6))
+                row[f"penaltiesDrawn_{side}"] = row[f"powerPlayOpportunities_{side}"] + int(rng.integers(0, 2))
+                row[f"powerPlayGoalsFor_{side}"] = int(rng.integers(0, row[f"powerPlayOpportunities_{side}"] + 1))
+                row[f"shortHandedGoalsFor_{side}"] = int(rng.integers(0, 2))
+            for side, other in (("home", "away"), ("away", "home")):
+                row[f"penaltyKillOpportunities_{side}"] = row[f"powerPlayOpportunities_{other}"]
+                row[f"penaltiesTaken_{side}"] = row[f"penaltiesDrawn_{other}"]
+                row[f"powerPlayGoalsAgainst_{side}"] = row[f"powerPlayGoalsFor_{other}"]
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+class TestExtractSpecialTeamsGoals:
+    def test_maps_ingest_counts(self):
+        games = special_teams_games()
+
+        result = extract_special_teams_goals(games)
+
+        for column, source in SPECIAL_TEAMS_SOURCES.items():
+            for side in ("home", "away"):
+                np.testing.assert_array_equal(result[f"{column}_{side}"], games[f"{source}_{side}"])
+        np.testing.assert_array_equal(result["sh_goals_allowed_home"], result["pp_goals_away"])
+        assert "pp_goals_home" not in games.columns
+
+    def test_requires_ingest_counts(self):
+        games = special_teams_games().drop(columns=["powerPlayGoalsFor_home"])
+
+        with pytest.raises(ValueError, match="powerPlayGoalsFor_home"):
+            extract_special_teams_goals(games)
+
+    def test_rejects_seasons_cached_without_counts(self):
+        # An old-schema season concatenated with a newer one: columns exist, counts are NaN
+        games = special_teams_games()
+        old = games["seasonId"] == "20222023"
+        sources = [f"{source}_{side}" for source in SPECIAL_TEAMS_SOURCES.values() for side in ("home", "away")]
+        games.loc[old, sources] = np.nan
+
+        with pytest.raises(ValueError, match="20222023"):
+            extract_special_teams_goals(games)
+
+
+@pytest.fixture(scope="module")
+def games():
+    return extract_special_teams_goals(special_teams_games())
+
+
+def _team_history(games):
+    """Each team's games in date order per season, with that team's counts."""
+    rows = []
+    for side in ("home", "away"):
+        for idx, game in games.iterrows():
+            rows.append({
+                "idx": idx, "side": side, "teamId": game[f"teamId_{side}"], "seasonId": game["seasonId"],
+                "gameDate": game["gameDate"], "is_home": side == "home",
+                **{name: game[f"{name}_{side}"] for name in
+                   ("pp_goals", "sh_goals_allowed", "pp_opportunities", "pk_opportunities")},
+            })
+    return pd.DataFrame(rows).sort_values("gameDate", kind="stable")
+
+
+def _reference(games, compute):
+    """compute(previous team-season games) per team-game, keyed by (game index, side)."""
+    history = _team_history(games)
+    result = {}
+    for _, team_games in history.groupby(["teamId", "seasonId"]):
+        for position in range(len(team_games)):
+            current = team_games.iloc[position]
+            result[(current["idx"], current["side"])] = compute(team_games.iloc[:position])
+    return result
+
+
+class TestSpecialTeamsRolling:
+    @pytest.mark.parametrize("window", [10, 4])
+    def test_matches_direct_look_back(self, games, window):
+        result = _add_special_teams_rolling(games, window=window)
+
+        expected = _reference(games, lambda prev: (
+            (prev["pp_goals"] - prev["sh_goals_allowed"]).tail(window).sum(),
+            prev["pp_opportunities"].tail(window).sum(),
+        ))
+        for (idx, side), (goal_diff, pp_opps) in expected.items():
+            assert result.at[idx, f"special_teams_goal_diff_rolling_{side}"] == goal_diff
+            assert result.at[idx, f"pp_opportunities_rolling_{side}"] == pp_opps
+        np.testing.assert_array_equal(
+            result["pk_opportunities_rolling_diff"],
+            result["pk_opportunities_rolling_home"] - result["pk_opportunities_rolling_away"],
+        )
+
+
+class TestHomeAwayVariance:
+    def test_matches_direct_look_back(self, games):
+        def variance(prev):
+            prev = prev.tail(20)
+            home, road = prev[prev["is_home"]], prev[~prev["is_home"]]
+            if len(prev) < 10 or len(home) < 3 or len(road) < 3:
+                return 0.0, 0.0
+            pp = home["pp_goals"].sum() / max(home["pp_opportunities"].sum(), 1) - road["pp_goals"].sum() / max(
+                road["pp_opportunities"].sum(), 1
+            )
+            pk = home["sh_goals_allowed"].sum() / max(home["pk_opportunities"].sum(), 1) - road[
+                "sh_goals_allowed"
+            ].sum() / max(road["pk_opportunities"].sum(), 1)
+            return pp, pk
+
+        result = _add_home_away_variance(games)
+
+        expected = _reference(games, variance)
+        for (idx, side), (pp, pk) in expected.items():
+            assert result.at[idx, f"pp_home_away_variance_{side}"] == pytest.approx(pp, abs=1e-12)
+            assert result.at[idx, f"pk_home_away_variance_{side}"] == pytest.approx(pk, abs=1e-12)
+        assert (result["pp_home_away_variance_home"] != 0).any()
+
+    def test_full_feature_set(self):
+        result = add_special_teams_features(special_teams_games(), rolling_window=5, variance_window=15)
+
+        for name in (
+            "special_teams_goal_diff_rolling_diff", "pp_opportunities_rolling_diff", "pk_opportunities_rolling_diff",
+            "special_teams_efficiency_diff", "pp_home_away_variance_diff", "pk_home_away_variance_diff",
+        ):
+            assert result[name].notna().all()
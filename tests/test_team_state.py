@@ -0,0 +1,108 @@
+"""Parity tests for the incremental per-team feature state."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from nhl_prediction.data_ingest import build_game_dataframe  # noqa: E402
+from nhl_prediction.features import engineer_team_features  # noqa: E402
+from nhl_prediction.pipeline import _add_elo_features  # noqa: E402
+from nhl_prediction.team_state import TeamStateStore  # noqa: E402
+
+from tests.test_features import synthetic_team_logs  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def logs():
+    return synthetic_team_logs(seed=5, n_days=45)
+
+
+@pytest.fixture(scope="module")
+def engineered(logs):
+    return engineer_team_features(logs).set_index(["teamId", "gameId"])
+
+
+@pytest.fixture(scope="module")
+def elo_games(engineered):
+    games = _add_elo_features(build_game_dataframe(engineered.reset_index()))
+    home = games.set_index(["teamId_home", "gameId"])["elo_home_pre"]
+    away = games.set_index(["teamId_away", "gameId"])["elo_away_pre"]
+    return pd.concat([home, away])
+
+
+def _assert_matches(features, row, elo, context):
+    for name, value in features.items():
+        expected = elo if name == "elo_pre" else row[name]
+        assert np.isclose(value, expected, rtol=1e-9, atol=1e-9, equal_nan=True), (context, name, value, expected)
+
+
+class TestTeamStateParity:
+    def test_walk_forward_matches_engineer_team_features(self, logs, engineered, elo_games):
+        days = list(logs.groupby("gameDate", sort=True))
+        store = TeamStateStore.from_logs(days[0][1])
+        checked = 0
+
+        for game_date, day in days[1:]:
+            for team_id, game_id, season_id in zip(day["teamId"], day["gameId"], day["seasonId"]):
+                features = store.features_for(team_id, game_date, season_id=season_id)
+                row = engineered.loc[(team_id, game_id)]
+                _assert_matches(features, row, elo_games.loc[(team_id, game_id)], (team_id, game_id))
+                checked += 1
+            store.update(day)
+
+        assert checked == len(logs) - len(days[0][1])
+
+    def test_covers_history_features(self, logs, engineered):
+        store = TeamStateStore.from_logs(logs[logs["gameDate"] < logs["gameDate"].max()])
+        team_id = int(logs["teamId"].iloc[0])
+
+        features = store.features_for(team_id, logs["gameDate"].max() + pd.Timedelta(days=1))
+
+        for name in (
+            "season_win_pct", "season_xg_diff_avg", "rest_days", "games_last_6d", "consecutive_wins_prior",
+            "travel_burden", "rolling_xg_for_10", "rolling_faceoff_5", "momentum_xg_for_4",
+            "season_shot_margin", "momentum_xg", "elo_pre",
+        ):
+            assert name in features
+
+    def test_overlapping_update_and_round_trip(self, logs, tmp_path):
+        cutoff = logs["gameDate"].sort_values().iloc[len(logs) // 2]
+        store = TeamStateStore.from_logs(logs[logs["gameDate"] < cutoff])
+        path = store.save(tmp_path / "team_state.pkl")
+
+        reloaded = TeamStateStore.load(path)
+        added = reloaded.update(logs)  # full logs: only the newer games are recorded
+
+        full = TeamStateStore.from_logs(logs)
+        assert added == int((logs["gameDate"] >= cutoff).sum())
+        next_day = logs["gameDate"].max() + pd.Timedelta(days=1)
+        for team_id in logs["teamId"].unique():
+            assert reloaded.features_for(team_id, next_day) == pytest.approx(
+                full.features_for(team_id, next_day), nan_ok=True
+            )
+        assert reloaded.update(logs) == 0
+
+    def test_new_season_starts_fresh(self, logs):
+        store = TeamStateStore.from_logs(logs[logs["seasonId"] == "20222023"])
+        team_id = int(logs["teamId"].iloc[0])
+
+        features = store.features_for(team_id, "2023-10-10", season_id="20232024")
+
+        assert features["games_played_prior"] == 0
+        assert features["season_win_pct"] == 0.0
+        assert np.isnan(features["momentum_xg_for_4"])
+        assert features["elo_pre"] == pytest.approx(
+            1500.0 + 0.5 * (store.elo.ratings[team_id] - 1500.0)
+        )
+
+    def test_rejects_dates_already_recorded(self, logs):
+        store = TeamStateStore.from_logs(logs)
+        team_id = int(logs["teamId"].iloc[0])
+
+        with pytest.raises(ValueError):
+            store.features_for(team_id, logs["gameDate"].min())
@@ -9,12 +9,17 @@ This eliminates the need to recompute features during model testing,
 reducing test time from hours to seconds.
 
 Usage:
-    python training/build_feature_store.py
+    python training/build_feature_store.py [--low-memory]
+
+    --low-memory builds with float32/int16 features and logs peak RSS per
+    pipeline stage (for small containers).
 
 Output:
     data/feature_store.parquet - All games with all features pre-computed
 """
 
+import argparse
+import logging
 import sys
 import warnings
 warnings.filterwarnings('ignore')
@@ -85,7 +90,7 @@ def create_v79_engineered_features(features_df, games_df):
     return eng
 
 
-def main():
+def main(low_memory: bool = False):
     start_time = datetime.now()
     print("=" * 70)
     print("BUILDING FEATURE STORE")
@@ -96,7 +101,7 @@ def main():
     # Step 1: Load base dataset with all seasons
     print("Step 1/4: Loading base dataset...")
     print(f"  Seasons: {', '.join(ALL_SEASONS)}")
-    dataset = build_dataset(ALL_SEASONS)
+    dataset = build_dataset(ALL_SEASONS, low_memory=low_memory)
     games = dataset.games.copy()
     features = dataset.features.copy()
     target = dataset.target.copy()
@@ -175,4 +180,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Pre-compute all features into data/feature_store.parquet")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Downcast features and log peak RSS per pipeline stage")
+    args = parser.parse_args()
+    if args.low_memory:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main(low_memory=args.low_memory)
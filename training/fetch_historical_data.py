@@ -74,7 +74,7 @@ def check_cached_seasons():
     return cached, missing
 
 
-def fetch_season(season_id: str, force: bool = False):
+def fetch_season(season_id: str, force: bool = False, workers: int = 1):
     """Fetch a single season's data."""
     info = HISTORICAL_SEASONS[season_id]
     cache_path = _get_season_cache_path(season_id)
@@ -91,7 +91,11 @@ def fetch_season(season_id: str, force: bool = False):
     print(f"Expected games: ~{info['expected_games']}")
     print(f"{'='*60}")
 
-    df = load_native_game_logs([season_id])
+    # Drop the stale cache so the season is rebuilt rather than reloaded
+    if force and cache_path.exists():
+        cache_path.unlink()
+
+    df = load_native_game_logs([season_id], workers=workers)
 
     print(f"\n{'='*60}")
     print(f"{info['name']} FETCH COMPLETE!")
@@ -107,7 +111,7 @@ def fetch_season(season_id: str, force: bool = False):
     return df
 
 
-def fetch_all_historical(force: bool = False):
+def fetch_all_historical(force: bool = False, workers: int = 1):
     """Fetch all historical seasons."""
     cached, missing = check_cached_seasons()
 
@@ -147,7 +151,7 @@ def fetch_all_historical(force: bool = False):
 
     results = {}
     for season_id in seasons_to_fetch:
-        df = fetch_season(season_id, force=force)
+        df = fetch_season(season_id, force=force, workers=workers)
         if df is not None:
             results[season_id] = len(df)
 
@@ -179,6 +183,12 @@ def main():
         action="store_true",
         help="Re-fetch even if data is already cached"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to parse and score each season (default: 1)"
+    )
     parser.add_argument(
         "--check",
         action="store_true",
@@ -201,9 +211,9 @@ def main():
         return
 
     if args.season:
-        fetch_season(args.season, force=args.force)
+        fetch_season(args.season, force=args.force, workers=args.workers)
     else:
-        fetch_all_historical(force=args.force)
+        fetch_all_historical(force=args.force, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,10 @@ The current xG model was trained on ~200 games from 2021-22.
 This script retrains it on data from all available seasons
 for potentially better shot quality predictions.
 
+Shots come from the per-season shot tables written by native ingest
+(data/cache/shots_<season>.parquet) when they exist; otherwise the
+play-by-play is re-parsed.
+
 Usage:
     python training/retrain_xg_model.py
 """
@@ -26,6 +30,7 @@ from sklearn.metrics import accuracy_score, roc_auc_score, log_loss
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from nhl_prediction.data_sources.gamecenter import GamecenterClient
+from nhl_prediction.native_ingest import load_shot_table, xg_training_frame
 
 PROJECT_ROOT = Path(__file__).parent.parent
 XG_MODEL_PATH = PROJECT_ROOT / "data" / "xg_model.pkl"
@@ -149,13 +154,12 @@ def collect_training_data(seasons: list, games_per_season: int = 300) -> pd.Data
             game_ids = list(set(game_ids))[:games_per_season]
             print(f"    Found {len(game_ids)} games")
 
-            # Process games
-            for i, game_id in enumerate(game_ids):
+            # Process games (downloads run ahead concurrently while we parse)
+            for i, (game_id, pbp) in enumerate(client.iter_play_by_play(game_ids)):
                 if i % 50 == 0:
                     print(f"    Processing game {i+1}/{len(game_ids)}")
 
                 try:
-                    pbp = client.get_play_by_play(game_id)
                     if not pbp or pbp.get("gameState") not in ["OFF", "FINAL"]:
                         continue
 
@@ -262,7 +266,12 @@ def main():
         '20232024',  # Recent
     ]
 
-    training_data = collect_training_data(training_seasons, games_per_season=250)
+    shots = load_shot_table(training_seasons)
+    if not shots.empty:
+        print(f"  Using cached shot tables ({shots['seasonId'].nunique()} seasons)")
+        training_data = xg_training_frame(shots)
+    else:
+        training_data = collect_training_data(training_seasons, games_per_season=250)
 
     print(f"\nTotal shots collected: {len(training_data):,}")
     print(f"Goal rate: {training_data['is_goal'].mean()*100:.2f}%")